@@ -0,0 +1,116 @@
+from .commons import BatchItemResult, CustomerData, PaymentData, PaymentResponse
+from .loggers import TransactionLogger
+from .notifiers import AsyncNotifierProtocol
+from .processors import AsyncPaymentProcessorProtocol, AsyncRefundPaymentProtocol, AsyncRecurringPaymentProtocol
+from .validators import CustomerValidator, PaymentDataValidator
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+
+@dataclass
+class AsyncPaymentService:
+    """
+    Versión asíncrona de PaymentService pensada para correr miles de pagos concurrentes en un único event loop.
+    El procesador y el notificador son corrutinas; el logger síncrono se ejecuta en un hilo auxiliar
+    serializado por un candado para que las entradas de distintos pagos no se mezclen en el archivo.
+    """
+    payment_processor: AsyncPaymentProcessorProtocol
+    notifier: AsyncNotifierProtocol
+    customer_validator: CustomerValidator
+    payment_validator: PaymentDataValidator
+    logger: TransactionLogger
+    recurring_processor: Optional[AsyncRecurringPaymentProtocol] = None
+    refund_processor: Optional[AsyncRefundPaymentProtocol] = None
+    _log_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+
+
+    async def process_transaction(self, customer_data: CustomerData, payment_data: PaymentData) -> PaymentResponse:
+        """
+        Procesa una transacción de pago esperando al procesador, al notificador y al logger.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: Un objeto PaymentResponse que contiene el estado de la transacción, el monto, el ID de la transacción y un mensaje.
+        :rtype: PaymentResponse
+        """
+        self.customer_validator.validate(customer_data)
+        self.payment_validator.validate(payment_data)
+        payment_response = await self.payment_processor.process_transaction(
+            customer_data, payment_data
+        )
+        await self.notifier.send_confirmation(customer_data)
+        async with self._log_lock:
+            await asyncio.to_thread(
+                self.logger.log_transaction, customer_data, payment_data, payment_response
+            )
+        return payment_response
+
+    async def process_many(
+        self,
+        items: Iterable[tuple[CustomerData, PaymentData]],
+        max_concurrency: int = 1000,
+    ) -> list[BatchItemResult]:
+        """
+        Procesa muchas transacciones concurrentemente en el event loop actual.
+        :param items: Pares (CustomerData, PaymentData) a procesar.
+        :type items: Iterable[tuple[CustomerData, PaymentData]]
+        :param max_concurrency: Número máximo de pagos en curso al mismo tiempo.
+        :type max_concurrency: int
+        :return: Un BatchItemResult por elemento, en el mismo orden de entrada, con la respuesta o el error.
+        :rtype: list[BatchItemResult]
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(index: int, customer_data: CustomerData, payment_data: PaymentData) -> BatchItemResult:
+            async with semaphore:
+                try:
+                    response = await self.process_transaction(customer_data, payment_data)
+                except Exception as e:
+                    return BatchItemResult(index=index, error=str(e))
+                return BatchItemResult(index=index, response=response)
+
+        return list(await asyncio.gather(
+            *(run(index, customer_data, payment_data)
+              for index, (customer_data, payment_data) in enumerate(items))
+        ))
+
+    async def process_refund(self, transaction_id: str) -> PaymentResponse:
+        """
+        Procesa un reembolso utilizando el procesador de reembolsos asíncrono.
+        :param transaction_id: ID de la transacción a reembolsar.
+        :type transaction_id: str
+        :return: Un objeto PaymentResponse que contiene el estado del reembolso, el monto, el ID de la transacción y un mensaje.
+        :rtype: PaymentResponse
+        """
+        if not self.refund_processor:
+            raise Exception("Este procesador no soporta reembolsos.")
+        refund_response = await self.refund_processor.refund_payment(transaction_id)
+        async with self._log_lock:
+            await asyncio.to_thread(self.logger.log_refund, transaction_id, refund_response)
+        return refund_response
+
+    async def setup_recurring(self, customer_data: CustomerData, payment_data: PaymentData) -> PaymentResponse:
+        """
+        Configura un pago recurrente utilizando el procesador de pagos recurrentes asíncrono.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: Un objeto PaymentResponse que contiene el estado del pago recurrente, el monto, el ID de la transacción y un mensaje.
+        :rtype: PaymentResponse
+        """
+        if not self.recurring_processor:
+            raise Exception("Este procesador no soporta pagos recurrentes.")
+        recurring_response = await self.recurring_processor.setup_recurring_payment(
+            customer_data, payment_data
+        )
+        async with self._log_lock:
+            await asyncio.to_thread(
+                self.logger.log_transaction, customer_data, payment_data, recurring_response
+            )
+        return recurring_response
@@ -0,0 +1,60 @@
+"""
+Microbenchmark de construcción de modelos de commons: validación de pydantic frente a los constructores
+de confianza (commons.trusted). Informa objetos por segundo y bytes por objeto.
+
+Uso (desde la carpeta src):
+    python -m solid_principles.payment_service.benchmarks.commons_construction --objects 200000
+"""
+from ..commons import (
+    ContactInfo,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+    trusted_contact_info,
+    trusted_customer_data,
+    trusted_payment_data,
+    trusted_payment_response,
+)
+
+import argparse
+import time
+import tracemalloc
+
+_CASES = {
+    "PaymentResponse validado": lambda index: PaymentResponse(
+        status="succeeded", amount=index, transaction_id="ch_123", message="Transacción exitosa"
+    ),
+    "PaymentResponse confianza": lambda index: trusted_payment_response(
+        status="succeeded", amount=index, transaction_id="ch_123", message="Transacción exitosa"
+    ),
+    "PaymentData validado": lambda index: PaymentData(amount=index, source="tok_visa", currency="EUR"),
+    "PaymentData confianza": lambda index: trusted_payment_data(amount=index, source="tok_visa", currency="EUR"),
+    "CustomerData validado": lambda index: CustomerData(
+        name="Cliente", contact_info=ContactInfo(email="c@example.com")
+    ),
+    "CustomerData confianza": lambda index: trusted_customer_data(
+        name="Cliente", contact_info=trusted_contact_info(email="c@example.com")
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=200_000)
+    args = parser.parse_args()
+    for name, build in _CASES.items():
+        start = time.perf_counter()
+        for index in range(args.objects):
+            build(index)
+        objects_per_second = args.objects / (time.perf_counter() - start)
+
+        tracemalloc.start()
+        objects = [build(index) for index in range(10_000)]
+        bytes_per_object = tracemalloc.get_traced_memory()[0] / len(objects)
+        tracemalloc.stop()
+        del objects
+        print(f"{name:>26}: {objects_per_second:12.0f} obj/s {bytes_per_object:8.1f} bytes/obj")
+
+
+if __name__ == "__main__":
+    main()
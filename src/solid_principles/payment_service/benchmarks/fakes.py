@@ -0,0 +1,122 @@
+"""
+Procesadores y notificadores de prueba para los benchmarks: simulan la latencia y los errores de un servicio
+remoto. Cada falso usa su propio generador aleatorio con semilla, así que dos ejecuciones con la misma
+configuración producen la misma secuencia de latencias y errores.
+"""
+from ..commons import CustomerData, PaymentData, PaymentResponse, trusted_payment_response
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """
+    Distribución de latencias en segundos.
+    :param kind: "fixed" (siempre a), "uniform" (entre a y b) o "lognormal" (mediana a, sigma b).
+    :type kind: str
+    """
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """
+        :param spec: Texto como "fixed:0.002", "uniform:0.001,0.005" o "lognormal:0.002,0.5".
+        :type spec: str
+        :return: La distribución descrita.
+        :rtype: LatencyDistribution
+        """
+        kind, _, params = spec.partition(":")
+        values = [float(value) for value in params.split(",") if value]
+        if kind not in ("fixed", "uniform", "lognormal") or len(values) != (1 if kind == "fixed" else 2):
+            raise ValueError(f"Invalid latency distribution: {spec}")
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        :param rng: Generador aleatorio a usar.
+        :type rng: random.Random
+        :return: Una latencia en segundos.
+        :rtype: float
+        """
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return self.a * rng.lognormvariate(0.0, self.b)
+        return self.a
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.a}" if self.kind == "fixed" else f"{self.kind}:{self.a},{self.b}"
+
+
+class FakeProcessor:
+    """
+    Procesador que responde tras una latencia aleatoria y falla con las probabilidades indicadas.
+    """
+    def __init__(
+        self,
+        latency: LatencyDistribution = LatencyDistribution(),
+        error_rate: float = 0.0,
+        exception_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        :param latency: Distribución de la latencia de cada cobro.
+        :type latency: LatencyDistribution
+        :param error_rate: Probabilidad de devolver una respuesta con estado "failed".
+        :type error_rate: float
+        :param exception_rate: Probabilidad de lanzar ConnectionError.
+        :type exception_rate: float
+        :param seed: Semilla del generador aleatorio.
+        :type seed: int
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.exception_rate = exception_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def process_transaction(self, customer_data: CustomerData, payment_data: PaymentData) -> PaymentResponse:
+        with self._lock:
+            delay = self.latency.sample(self._rng)
+            draw = self._rng.random()
+            self._counter += 1
+            transaction_id = f"fake_{self._counter}"
+        if delay > 0:
+            time.sleep(delay)
+        if draw < self.exception_rate:
+            raise ConnectionError("fake processor unavailable")
+        if draw < self.exception_rate + self.error_rate:
+            return trusted_payment_response(
+                status="failed", amount=payment_data.amount, transaction_id=None, message="card declined"
+            )
+        return trusted_payment_response(
+            status="success", amount=payment_data.amount, transaction_id=transaction_id, message="ok"
+        )
+
+
+class FakeNotifier:
+    """
+    Notificador que tarda una latencia aleatoria en enviar cada confirmación.
+    """
+    def __init__(self, latency: LatencyDistribution = LatencyDistribution(), seed: int = 0):
+        """
+        :param latency: Distribución de la latencia de cada envío.
+        :type latency: LatencyDistribution
+        :param seed: Semilla del generador aleatorio.
+        :type seed: int
+        """
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def send_confirmation(self, customer_data: CustomerData):
+        with self._lock:
+            delay = self.latency.sample(self._rng)
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,56 @@
+"""
+Generador determinista de pagos sintéticos para los benchmarks: la misma semilla produce siempre los mismos datos.
+"""
+from ..commons import ContactInfo, CustomerData, PaymentBatch, PaymentData
+
+import random
+from typing import Iterator
+
+
+def generate_rows(count: int, seed: int = 0) -> Iterator[tuple[str, str, str, int]]:
+    """
+    :param count: Número de pagos a generar.
+    :type count: int
+    :param seed: Semilla del generador aleatorio.
+    :type seed: int
+    :return: Tuplas (nombre, email, fuente, monto en centavos).
+    :rtype: Iterator[tuple[str, str, str, int]]
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        customer = rng.randrange(max(1, count // 4))
+        amount = int(rng.lognormvariate(8.0, 1.0)) + 50
+        yield f"Cliente {customer}", f"cliente{customer}@example.com", f"tok_{rng.getrandbits(48):012x}", amount
+
+
+def generate_payments(count: int, seed: int = 0) -> list[tuple[CustomerData, PaymentData]]:
+    """
+    :param count: Número de pagos a generar.
+    :type count: int
+    :param seed: Semilla del generador aleatorio.
+    :type seed: int
+    :return: Pares (CustomerData, PaymentData) listos para PaymentService.
+    :rtype: list[tuple[CustomerData, PaymentData]]
+    """
+    return [
+        (
+            CustomerData(name=name, contact_info=ContactInfo(email=email)),
+            PaymentData(amount=amount, source=source),
+        )
+        for name, email, source, amount in generate_rows(count, seed)
+    ]
+
+
+def generate_batch(count: int, seed: int = 0) -> PaymentBatch:
+    """
+    :param count: Número de pagos a generar.
+    :type count: int
+    :param seed: Semilla del generador aleatorio.
+    :type seed: int
+    :return: Los mismos pagos que generate_payments en formato columnar.
+    :rtype: PaymentBatch
+    """
+    names, emails, sources, amounts = zip(*generate_rows(count, seed)) if count else ((), (), (), ())
+    batch = PaymentBatch()
+    batch.extend(names=names, amounts=amounts, sources=sources, emails=emails)
+    return batch
@@ -0,0 +1,74 @@
+"""
+Benchmark de memoria y tiempo de construcción: pares de modelos pydantic frente a PaymentBatch columnar.
+El tiempo se mide sin tracemalloc y a partir de columnas ya generadas, para no contar el coste de crear las
+cadenas de entrada (común a ambos formatos); la memoria sí incluye las cadenas que cada formato retiene.
+
+Uso (desde la carpeta src):
+    python -m solid_principles.payment_service.benchmarks.payment_batch_memory --records 100000
+"""
+from ..commons import ContactInfo, CustomerData, PaymentBatch, PaymentData
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+
+def _columns(records: int) -> tuple[list, range, list, list]:
+    return (
+        [f"Cliente {index}" for index in range(records)],
+        range(1000, 1000 + records),
+        [f"tok_{index}" for index in range(records)],
+        [f"c{index}@example.com" for index in range(records)],
+    )
+
+
+def _build_models(columns: tuple[list, range, list, list]) -> list:
+    names, amounts, sources, emails = columns
+    return [
+        (
+            CustomerData(name=name, contact_info=ContactInfo(email=email)),
+            PaymentData(amount=amount, source=source),
+        )
+        for name, amount, source, email in zip(names, amounts, sources, emails)
+    ]
+
+
+def _build_batch(columns: tuple[list, range, list, list]) -> PaymentBatch:
+    names, amounts, sources, emails = columns
+    batch = PaymentBatch()
+    batch.extend(names=names, amounts=amounts, sources=sources, emails=emails)
+    return batch
+
+
+def _measure(build, records: int, repeat: int) -> tuple[float, float]:
+    columns = _columns(records)
+    elapsed = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = build(columns)
+        elapsed = min(elapsed, time.perf_counter() - start)
+        del result
+    del columns
+    gc.collect()
+    tracemalloc.start()
+    result = build(_columns(records))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, current / records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for name, build in (("modelos pydantic", _build_models), ("PaymentBatch", _build_batch)):
+        elapsed, bytes_per_record = _measure(build, args.records, args.repeat)
+        print(f"{name:>16}: {elapsed * 1e6 / args.records:8.2f} µs/registro {bytes_per_record:8.1f} bytes/registro")
+
+
+if __name__ == "__main__":
+    main()
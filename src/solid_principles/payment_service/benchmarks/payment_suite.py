@@ -0,0 +1,240 @@
+"""
+Suite de benchmarks de PaymentService con carga sintética determinista y procesadores simulados.
+Mide los caminos de una llamada (process_transaction en bucle), lote (process_batch) y concurrente
+(process_transaction desde varios hilos): pagos por segundo, latencias p50/p95/p99 y memoria asignada por pago.
+En el escenario de lote la latencia es la de cada llamada a process_batch, no la de cada pago. Cada escenario se
+repite --repeat veces y se informa la mediana de cada métrica; los resultados pueden guardarse como línea base
+JSON y compararse con una ejecución posterior.
+
+Uso (desde la carpeta src):
+    python -m solid_principles.payment_service.benchmarks.payment_suite --transactions 2000 --save baseline.json
+    python -m solid_principles.payment_service.benchmarks.payment_suite --transactions 2000 --compare baseline.json
+"""
+from ..commons import CustomerData, PaymentData
+from ..loggers import TransactionLogger
+from ..metrics import LatencyHistogram
+from ..services import PaymentService
+from ..validators import CustomerValidator, PaymentDataValidator
+from .fakes import FakeNotifier, FakeProcessor, LatencyDistribution
+from .load_generator import generate_batch, generate_payments
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+
+def _service(args: argparse.Namespace, log_path: str) -> PaymentService:
+    return PaymentService(
+        payment_processor=FakeProcessor(
+            LatencyDistribution.parse(args.processor_latency),
+            error_rate=args.error_rate,
+            exception_rate=args.exception_rate,
+            seed=args.seed,
+        ),
+        notifier=FakeNotifier(LatencyDistribution.parse(args.notifier_latency), seed=args.seed),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(log_path),
+    )
+
+
+def _payments(args: argparse.Namespace) -> list[tuple[CustomerData, PaymentData]]:
+    return list(generate_payments(args.transactions, args.seed))
+
+
+def _chunks(args: argparse.Namespace) -> list[list[tuple[CustomerData, PaymentData]]]:
+    batch = generate_batch(args.transactions, args.seed)
+    return [
+        [batch.row(index) for index in range(offset, min(offset + args.batch_size, len(batch)))]
+        for offset in range(0, len(batch), args.batch_size)
+    ]
+
+
+def _single(service: PaymentService, payments: list, args: argparse.Namespace, histogram: LatencyHistogram) -> int:
+    errors = 0
+    for customer_data, payment_data in payments:
+        start = time.perf_counter()
+        try:
+            if service.process_transaction(customer_data, payment_data).status == "failed":
+                errors += 1
+        except Exception:
+            errors += 1
+        histogram.record(time.perf_counter() - start)
+    return errors
+
+
+def _batch(service: PaymentService, chunks: list, args: argparse.Namespace, histogram: LatencyHistogram) -> int:
+    errors = 0
+    for chunk in chunks:
+        start = time.perf_counter()
+        results = service.process_batch(chunk, max_workers=args.workers)
+        histogram.record(time.perf_counter() - start)
+        for result in results:
+            if not result.ok or result.response.status == "failed":
+                errors += 1
+    return errors
+
+
+def _concurrent(service: PaymentService, payments: list, args: argparse.Namespace, histogram: LatencyHistogram) -> int:
+    def call(pair: tuple[CustomerData, PaymentData]) -> bool:
+        start = time.perf_counter()
+        try:
+            failed = service.process_transaction(*pair).status == "failed"
+        except Exception:
+            failed = True
+        histogram.record(time.perf_counter() - start)
+        return failed
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        return sum(executor.map(call, payments))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    prepare: Callable[[argparse.Namespace], list]
+    run: Callable[[PaymentService, list, argparse.Namespace, LatencyHistogram], int]
+    latency_unit: str = "pago"
+    """
+    Escenario de la suite.
+    :param prepare: Construye las entradas del escenario; no forma parte de lo medido.
+    :type prepare: Callable[[argparse.Namespace], list]
+    :param run: Procesa las entradas, registra las latencias y devuelve el número de errores.
+    :type run: Callable[[PaymentService, list, argparse.Namespace, LatencyHistogram], int]
+    :param latency_unit: Qué mide cada latencia registrada ("pago" o "lote").
+    :type latency_unit: str
+    """
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "single": Scenario(_payments, _single),
+    "batch": Scenario(_chunks, _batch, latency_unit="lote"),
+    "concurrent": Scenario(_payments, _concurrent),
+}
+
+
+def run_scenario(name: str, args: argparse.Namespace, directory: str) -> dict[str, float]:
+    """
+    Ejecuta un escenario args.repeat veces para medir tiempo y latencias, y una vez más, más corta y con
+    tracemalloc activo, para medir la memoria asignada por pago sin que el trazado distorsione los tiempos.
+    Las entradas se construyen antes de medir, así que ni el tiempo ni la memoria las incluyen.
+    :param name: Nombre del escenario (single, batch o concurrent).
+    :type name: str
+    :param args: Configuración de la ejecución.
+    :type args: argparse.Namespace
+    :param directory: Carpeta donde se escriben los logs de transacciones.
+    :type directory: str
+    :return: Medianas de pagos por segundo, latencias en milisegundos y tasa de error, y bytes asignados por pago.
+    :rtype: dict[str, float]
+    """
+    scenario = SCENARIOS[name]
+    inputs = scenario.prepare(args)
+    runs = []
+    for _ in range(args.repeat):
+        histogram = LatencyHistogram()
+        service = _service(args, os.path.join(directory, f"{name}.log"))
+        start = time.perf_counter()
+        errors = scenario.run(service, inputs, args, histogram)
+        elapsed = time.perf_counter() - start
+        runs.append({
+            "throughput": args.transactions / elapsed,
+            "p50_ms": histogram.percentile(50) * 1e3,
+            "p95_ms": histogram.percentile(95) * 1e3,
+            "p99_ms": histogram.percentile(99) * 1e3,
+            "error_rate": errors / args.transactions,
+        })
+    metrics = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+    alloc_args = argparse.Namespace(**{**vars(args), "transactions": args.alloc_transactions})
+    alloc_inputs = scenario.prepare(alloc_args)
+    service = _service(alloc_args, os.path.join(directory, f"{name}-alloc.log"))
+    tracemalloc.start()
+    scenario.run(service, alloc_inputs, alloc_args, LatencyHistogram())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    metrics["peak_bytes_per_transaction"] = peak / args.alloc_transactions
+    return metrics
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """
+    :param baseline: Resultados guardados de una ejecución anterior.
+    :type baseline: dict
+    :param current: Resultados de esta ejecución.
+    :type current: dict
+    :param tolerance: Empeoramiento relativo permitido (0.1 = 10%).
+    :type tolerance: float
+    :return: Una línea por métrica que empeora más de lo permitido.
+    :rtype: list[str]
+    """
+    regressions = []
+    for name, metrics in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        if metrics["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {metrics['throughput']:.1f} < {previous['throughput']:.1f} pagos/s"
+            )
+        for key in ("p50_ms", "p95_ms", "p99_ms", "peak_bytes_per_transaction"):
+            if metrics[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {metrics[key]:.3f} > {previous[key]:.3f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=2000)
+    parser.add_argument("--alloc-transactions", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--processor-latency", default="lognormal:0.002,0.5")
+    parser.add_argument("--notifier-latency", default="fixed:0.0005")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--exception-rate", type=float, default=0.005)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--save", help="Ruta donde guardar los resultados como línea base JSON.")
+    parser.add_argument("--compare", help="Línea base JSON con la que comparar los resultados.")
+    parser.add_argument("--repeat", type=int, default=3, help="Ejecuciones por escenario; se informa la mediana.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    config = {key: value for key, value in vars(args).items() if key not in ("save", "compare", "tolerance")}
+    report = {"config": config, "python": platform.python_version(), "results": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.scenarios:
+            metrics = run_scenario(name, args, directory)
+            report["results"][name] = metrics
+            print(
+                f"{name:>10}: {metrics['throughput']:9.1f} pagos/s"
+                f"  p50 {metrics['p50_ms']:7.2f} ms  p95 {metrics['p95_ms']:7.2f} ms  p99 {metrics['p99_ms']:7.2f} ms"
+                f" por {SCENARIOS[name].latency_unit}"
+                f"  errores {metrics['error_rate']:6.2%}  {metrics['peak_bytes_per_transaction']:9.1f} bytes/pago"
+            )
+
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("config") != config:
+            print("Aviso: la línea base se generó con otra configuración.")
+        regressions = compare(baseline, report, args.tolerance)
+        for regression in regressions:
+            print("Regresión:", regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
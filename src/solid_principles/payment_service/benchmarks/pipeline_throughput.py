@@ -0,0 +1,85 @@
+"""
+Benchmark de PipelinedPaymentService frente a PaymentService secuencial con procesador y notificador simulados.
+Muestra los pagos por segundo al aumentar los hilos de la etapa de cobro y comprueba que el log queda en el
+orden de envío.
+
+Uso (desde la carpeta src):
+    python -m solid_principles.payment_service.benchmarks.pipeline_throughput --payments 2000 --charge-latency 0.005
+"""
+from ..commons import ContactInfo, CustomerData, PaymentData
+from ..loggers import TransactionLogger
+from ..pipelined_services import PipelinedPaymentService
+from ..services import PaymentService
+from ..validators import CustomerValidator, PaymentDataValidator
+from .fakes import FakeNotifier, FakeProcessor, LatencyDistribution
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def _payments(count: int) -> list[tuple[CustomerData, PaymentData]]:
+    return [
+        (
+            CustomerData(name=f"Cliente {index}", contact_info=ContactInfo(email=f"c{index}@example.com")),
+            PaymentData(amount=1000 + index, source=f"tok_{index}"),
+        )
+        for index in range(count)
+    ]
+
+
+def _service(log_path: str, charge_latency: float, notify_latency: float) -> PaymentService:
+    return PaymentService(
+        payment_processor=FakeProcessor(LatencyDistribution("fixed", charge_latency)),
+        notifier=FakeNotifier(LatencyDistribution("fixed", notify_latency)),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(log_path),
+    )
+
+
+def _logged_in_order(log_path: str, count: int) -> bool:
+    with open(log_path) as log_file:
+        names = [line.split(" paid ")[0] for line in log_file if " paid " in line]
+    return names == [f"Cliente {index}" for index in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payments", type=int, default=2000)
+    parser.add_argument("--charge-latency", type=float, default=0.005)
+    parser.add_argument("--notify-latency", type=float, default=0.002)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+    payments = _payments(args.payments)
+
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "sequential.log")
+        service = _service(log_path, args.charge_latency, args.notify_latency)
+        start = time.perf_counter()
+        for customer_data, payment_data in payments:
+            service.process_transaction(customer_data, payment_data)
+        elapsed = time.perf_counter() - start
+        print(f"{'secuencial':>14}: {args.payments / elapsed:9.1f} pagos/s")
+
+        for workers in args.workers:
+            log_path = os.path.join(directory, f"pipeline-{workers}.log")
+            service = _service(log_path, args.charge_latency, args.notify_latency)
+            start = time.perf_counter()
+            with PipelinedPaymentService(
+                service, charge_workers=workers, notify_workers=max(1, workers // 2)
+            ) as pipeline:
+                pipeline.process_many(payments)
+                stats = pipeline.stats()
+            elapsed = time.perf_counter() - start
+            ordered = "sí" if _logged_in_order(log_path, args.payments) else "NO"
+            print(
+                f"{f'pipeline x{workers}':>14}: {args.payments / elapsed:9.1f} pagos/s"
+                f"  cobro p99 {stats['charge']['p99'] * 1e3:6.2f} ms"
+                f"  log p99 {stats['log']['p99'] * 1e3:6.2f} ms  log en orden: {ordered}"
+            )
+
+
+if __name__ == "__main__":
+    main()
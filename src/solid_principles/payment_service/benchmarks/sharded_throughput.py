@@ -0,0 +1,72 @@
+"""
+Benchmark de ShardedPaymentRunner frente a process_batch en un único proceso, con un procesador simulado sin
+latencia para que domine el coste de CPU (validación y construcción de modelos). También muestra el tamaño
+serializado de un lote columnar frente a la lista de modelos equivalente.
+
+Uso (desde la carpeta src):
+    python -m solid_principles.payment_service.benchmarks.sharded_throughput --payments 100000 --shards 1 2 4
+"""
+from ..loggers import TransactionLogger
+from ..services import PaymentService
+from ..sharded_runner import ShardedPaymentRunner
+from ..validators import CustomerValidator, PaymentDataValidator
+from .fakes import FakeNotifier, FakeProcessor
+from .load_generator import generate_batch
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+
+def build_service() -> PaymentService:
+    """
+    :return: Un PaymentService con procesador y notificador simulados y un log descartable.
+    :rtype: PaymentService
+    """
+    return PaymentService(
+        payment_processor=FakeProcessor(),
+        notifier=FakeNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(os.devnull),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payments", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    batch = generate_batch(args.payments)
+
+    sample = generate_batch(args.chunk_size)
+    print(
+        f"ventana de {args.chunk_size}: PaymentBatch {len(pickle.dumps(sample)) / 1024:8.1f} KiB,"
+        f" modelos {len(pickle.dumps(sample.to_models())) / 1024:8.1f} KiB"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = build_service()
+        service.logger = TransactionLogger(os.path.join(directory, "single.log"))
+        start = time.perf_counter()
+        for offset in range(0, args.payments, args.chunk_size):
+            service.process_batch(
+                [batch.row(index) for index in range(offset, min(offset + args.chunk_size, args.payments))]
+            )
+        elapsed = time.perf_counter() - start
+        print(f"{'1 proceso':>12}: {args.payments / elapsed:10.1f} pagos/s")
+
+        for shards in args.shards:
+            logger = TransactionLogger(os.path.join(directory, f"sharded-{shards}.log"))
+            with ShardedPaymentRunner(build_service, logger, shards=shards, chunk_size=args.chunk_size) as runner:
+                start = time.perf_counter()
+                failures = sum(not result.ok for result in runner.run(batch))
+                elapsed = time.perf_counter() - start
+            print(f"{f'{shards} shards':>12}: {args.payments / elapsed:10.1f} pagos/s  fallos {failures}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark de EmailNotifier contra un servidor SMTP local mínimo que acepta y descarta los mensajes.
+Compara emails por minuto abriendo una sesión SMTP por email frente a un lote sobre una sesión persistente.
+
+Uso (desde la carpeta src):
+    python -m solid_principles.payment_service.benchmarks.smtp_throughput --emails 2000
+"""
+from ..commons import ContactInfo, CustomerData
+from ..notifiers import EmailNotifier, SMTPTransport
+
+import argparse
+import contextlib
+import io
+import socketserver
+import threading
+import time
+
+
+class _SinkSMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Servidor SMTP de prueba: responde lo justo para que smtplib entregue mensajes y los descarta.
+    """
+    def handle(self):
+        self._reply("220 sink ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b"EHLO", b"HELO"):
+                self._reply("250 sink")
+            elif command == b"DATA":
+                self._reply("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self._reply("250 queued")
+            elif command == b"QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+    def _reply(self, text: str):
+        self.wfile.write(text.encode() + b"\r\n")
+
+
+class _SinkSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = _SinkSMTPServer(("127.0.0.1", 0), _SinkSMTPHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    customers = [
+        CustomerData(name=f"Cliente {index}", contact_info=ContactInfo(email=f"c{index}@example.com"))
+        for index in range(args.emails)
+    ]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for customer in customers:
+                with SMTPTransport("127.0.0.1", port) as transport:
+                    EmailNotifier(transport=transport).send_confirmation(customer)
+            per_email = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with SMTPTransport("127.0.0.1", port) as transport:
+                errors = EmailNotifier(transport=transport).send_batch(customers)
+            batched = time.perf_counter() - start
+    finally:
+        server.shutdown()
+    assert not any(errors)
+    print(f"sesión por email : {args.emails / per_email * 60:12.0f} emails/min")
+    print(f"sesión persistente: {args.emails / batched * 60:12.0f} emails/min")
+
+
+if __name__ == "__main__":
+    main()
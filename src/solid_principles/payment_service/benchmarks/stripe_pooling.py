@@ -0,0 +1,91 @@
+"""
+Benchmark de StripePaymentProcessor contra un servidor HTTP local que imita la API de Stripe.
+Compara peticiones por segundo usando el pool de conexiones keep-alive del procesador frente a abrir
+una conexión nueva en cada llamada.
+
+Uso (desde la carpeta src):
+    python -m solid_principles.payment_service.benchmarks.stripe_pooling --requests 2000 --threads 16
+"""
+from ..commons import ContactInfo, CustomerData, PaymentData
+from ..processors import StripePaymentProcessor
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+import stripe
+
+
+class _StubStripeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Sin esto, Nagle y el ACK retardado añaden ~40 ms a cada respuesta en conexiones reutilizadas y el pool
+    # parece más lento que abrir una conexión por petición.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({
+            "id": "ch_stub", "object": "charge", "status": "succeeded", "amount": 1000,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _SessionPerRequest:
+    """
+    Sustituto de requests.Session que abre (y cierra) una conexión nueva en cada petición.
+    """
+    def request(self, *args, **kwargs):
+        with requests.Session() as session:
+            return session.request(*args, **kwargs)
+
+
+def _run(processor: StripePaymentProcessor, total: int, threads: int) -> float:
+    customer = CustomerData(name="Bench", contact_info=ContactInfo(email="bench@example.com"))
+    payment = PaymentData(amount=1000, source="tok_visa")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: processor.process_transaction(customer, payment), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubStripeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        pooled = StripePaymentProcessor(
+            api_key="sk_test_bench", api_base=api_base, max_connections=args.threads
+        )
+        unpooled = StripePaymentProcessor(
+            api_key="sk_test_bench",
+            api_base=api_base,
+            http_client=stripe.RequestsClient(session=_SessionPerRequest()),
+        )
+        results = {
+            "sin pool": _run(unpooled, args.requests, args.threads),
+            "con pool": _run(pooled, args.requests, args.threads),
+        }
+    finally:
+        server.shutdown()
+    for name, requests_per_second in results.items():
+        print(f"{name:>10}: {requests_per_second:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
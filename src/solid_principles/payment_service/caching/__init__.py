@@ -0,0 +1,9 @@
+from .idempotency import IdempotencyCache, IdempotencyKeyMismatchError, SqliteIdempotencyStore
+from .ttl_cache import TTLCache
+
+__all__ = [
+    "IdempotencyCache",
+    "IdempotencyKeyMismatchError",
+    "SqliteIdempotencyStore",
+    "TTLCache",
+]
\ No newline at end of file
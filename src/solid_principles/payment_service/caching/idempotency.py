@@ -0,0 +1,231 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from .ttl_cache import TTLCache
+
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+class IdempotencyKeyMismatchError(ValueError):
+    """
+    Se reutilizó una clave de idempotencia con datos de cliente o de pago distintos a los del cargo original.
+    """
+
+
+class SqliteIdempotencyStore:
+    """
+    Almacén en disco (SQLite) de respuestas idempotentes, para que sobrevivan a reinicios del proceso.
+    """
+    def __init__(self, path: str = "idempotency.sqlite3", ttl: float = 24 * 3600):
+        """
+        :param path: Ruta de la base de datos SQLite.
+        :type path: str
+        :param ttl: Segundos que se conserva cada respuesta.
+        :type ttl: float
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[tuple[str, PaymentResponse]]:
+        """
+        Recupera la respuesta guardada para una clave si no ha caducado.
+        :param key: Clave de idempotencia.
+        :type key: str
+        :return: La huella de los datos del cargo original y su respuesta, o None.
+        :rtype: Optional[tuple[str, PaymentResponse]]
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, response FROM idempotency WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return (row[0], PaymentResponse.model_validate_json(row[1])) if row else None
+
+    def put(self, key: str, response: PaymentResponse, fingerprint: str = "", ttl: Optional[float] = None):
+        """
+        Guarda la respuesta de una clave.
+        :param key: Clave de idempotencia.
+        :type key: str
+        :param response: Respuesta a guardar.
+        :type response: PaymentResponse
+        :param fingerprint: Huella de los datos del cargo, para detectar reutilizaciones de la clave.
+        :type fingerprint: str
+        :param ttl: TTL específico para esta entrada; por defecto el del almacén.
+        :type ttl: Optional[float]
+        """
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO idempotency (key, response, expires_at, fingerprint) VALUES (?, ?, ?, ?)",
+                (key, response.model_dump_json(), expires_at, fingerprint),
+            )
+
+    def purge_expired(self) -> int:
+        """
+        Elimina las respuestas caducadas.
+        :return: Número de filas eliminadas.
+        :rtype: int
+        """
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM idempotency WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+
+    def close(self):
+        """
+        Cierra la conexión con la base de datos.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class IdempotencyCache:
+    """
+    Caché de idempotencia para deduplicar cargos reintentados.
+    Combina una caché LRU con TTL en memoria y, opcionalmente, un almacén en disco. Mientras una clave se está
+    procesando, los reintentos concurrentes con la misma clave esperan su resultado en lugar de cobrar de nuevo.
+    Cada respuesta se guarda junto a la huella de los datos del cargo: reutilizar una clave con otros datos
+    lanza IdempotencyKeyMismatchError en lugar de devolver una respuesta ajena.
+    """
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 24 * 3600,
+        store: Optional[SqliteIdempotencyStore] = None,
+        derive_keys: bool = False,
+        derived_ttl: float = 60.0,
+    ):
+        """
+        :param max_size: Número máximo de respuestas en memoria.
+        :type max_size: int
+        :param ttl: Segundos que se conserva cada respuesta en memoria.
+        :type ttl: float
+        :param store: Almacén en disco opcional, consultado cuando la clave no está en memoria.
+        :type store: Optional[SqliteIdempotencyStore]
+        :param derive_keys: Si es True, los cargos sin clave usan una derivada de sus datos; por defecto no se deduplican,
+            porque dos compras idénticas y reales no deben confundirse con un reintento.
+        :type derive_keys: bool
+        :param derived_ttl: Segundos que se conserva una respuesta guardada con clave derivada.
+        :type derived_ttl: float
+        """
+        self._memory: TTLCache[str, tuple[str, PaymentResponse]] = TTLCache(max_size=max_size, ttl=ttl)
+        self.store = store
+        self.derive_keys = derive_keys
+        self.derived_ttl = derived_ttl
+        self._key_locks: dict[str, list] = {}
+        self._key_locks_guard = threading.Lock()
+
+    @staticmethod
+    def make_key(customer_data: CustomerData, payment_data: PaymentData) -> str:
+        """
+        Genera una huella determinista de los datos del cliente y del pago; sirve como clave derivada y como
+        huella para comprobar que una clave se reutiliza con los mismos datos.
+        :param customer_data: Datos del cliente.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago.
+        :type payment_data: PaymentData
+        :return: Un hash SHA-256 en hexadecimal.
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        digest.update(customer_data.model_dump_json().encode())
+        digest.update(b"\x00")
+        digest.update(payment_data.model_dump_json().encode())
+        return digest.hexdigest()
+
+    def get(self, key: str, fingerprint: Optional[str] = None) -> Optional[PaymentResponse]:
+        """
+        Busca la respuesta de una clave en memoria y, si no está, en el almacén en disco.
+        :param key: Clave de idempotencia.
+        :type key: str
+        :param fingerprint: Huella de los datos del cargo actual; si se indica, debe coincidir con la guardada.
+        :type fingerprint: Optional[str]
+        :return: La respuesta guardada o None.
+        :rtype: Optional[PaymentResponse]
+        :raises IdempotencyKeyMismatchError: Si la clave se guardó con datos distintos.
+        """
+        entry = self._memory.get(key)
+        if entry is None and self.store is not None:
+            entry = self.store.get(key)
+            if entry is not None:
+                self._memory.put(key, entry)
+        if entry is None:
+            return None
+        stored_fingerprint, response = entry
+        if fingerprint is not None and stored_fingerprint and stored_fingerprint != fingerprint:
+            raise IdempotencyKeyMismatchError(f"Idempotency key {key} was already used with a different payload")
+        return response
+
+    def put(self, key: str, response: PaymentResponse, fingerprint: str = "", ttl: Optional[float] = None):
+        """
+        Guarda la respuesta de una clave en memoria y en el almacén en disco.
+        :param key: Clave de idempotencia.
+        :type key: str
+        :param response: Respuesta a guardar.
+        :type response: PaymentResponse
+        :param fingerprint: Huella de los datos del cargo (ver make_key).
+        :type fingerprint: str
+        :param ttl: TTL específico para esta entrada; por defecto el de la caché.
+        :type ttl: Optional[float]
+        """
+        self._memory.put(key, (fingerprint, response), ttl=ttl)
+        if self.store is not None:
+            self.store.put(key, response, fingerprint=fingerprint, ttl=ttl)
+
+    def get_or_process(
+        self,
+        key: str,
+        process: Callable[[], PaymentResponse],
+        fingerprint: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> PaymentResponse:
+        """
+        Devuelve la respuesta guardada para la clave o ejecuta 'process' y guarda su resultado.
+        Solo se guardan las respuestas cuyo estado no es "failed", para que un fallo transitorio pueda reintentarse.
+        :param key: Clave de idempotencia.
+        :type key: str
+        :param process: Función que realiza el cargo cuando la clave no está en caché.
+        :type process: Callable[[], PaymentResponse]
+        :param fingerprint: Huella de los datos del cargo; una respuesta guardada con otra huella no se devuelve.
+        :type fingerprint: Optional[str]
+        :param ttl: TTL específico para la respuesta guardada.
+        :type ttl: Optional[float]
+        :return: La respuesta guardada o la recién obtenida.
+        :rtype: PaymentResponse
+        :raises IdempotencyKeyMismatchError: Si la clave se guardó con datos distintos.
+        """
+        cached = self.get(key, fingerprint)
+        if cached is not None:
+            return cached
+        with self._key_lock(key):
+            cached = self.get(key, fingerprint)
+            if cached is not None:
+                return cached
+            response = process()
+            if response.status != "failed":
+                self.put(key, response, fingerprint=fingerprint or "", ttl=ttl)
+            return response
+
+    @contextmanager
+    def _key_lock(self, key: str) -> Iterator[None]:
+        with self._key_locks_guard:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._key_locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._key_locks[key]
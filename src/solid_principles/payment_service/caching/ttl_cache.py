@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Caché en memoria acotada con expulsión LRU y caducidad por tiempo (TTL). Es segura entre hilos.
+    """
+    def __init__(self, max_size: int = 10_000, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        :param max_size: Número máximo de entradas; al superarlo se expulsa la menos usada recientemente.
+        :type max_size: int
+        :param ttl: Segundos que una entrada permanece válida desde que se guardó.
+        :type ttl: float
+        :param clock: Reloj monotónico usado para calcular la caducidad.
+        :type clock: Callable[[], float]
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Devuelve el valor guardado para la clave o None si no existe o ya caducó.
+        :param key: Clave a buscar.
+        :type key: K
+        :return: El valor o None.
+        :rtype: Optional[V]
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V, ttl: Optional[float] = None):
+        """
+        Guarda un valor, expulsando la entrada menos usada si la caché está llena.
+        :param key: Clave del valor.
+        :type key: K
+        :param value: Valor a guardar.
+        :type value: V
+        :param ttl: TTL específico para esta entrada; por defecto el de la caché.
+        :type ttl: Optional[float]
+        """
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: K):
+        """
+        Elimina una entrada si existe.
+        :param key: Clave a eliminar.
+        :type key: K
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Elimina todas las entradas.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
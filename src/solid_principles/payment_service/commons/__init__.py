@@ -1,11 +1,30 @@
+from .batch_result import BatchItemResult
 from .contact import ContactInfo
 from .customer import CustomerData
+from .payment_batch import PaymentBatch, StringColumn
 from .payment_data import PaymentData
 from .payment_response import PaymentResponse
+from .refund_result import RefundResult
+from .trusted import (
+    trusted_batch_item_result,
+    trusted_contact_info,
+    trusted_customer_data,
+    trusted_payment_data,
+    trusted_payment_response,
+)
 
 __all__ = [
+    "BatchItemResult",
     "ContactInfo",
     "CustomerData",
+    "PaymentBatch",
     "PaymentData",
     "PaymentResponse",
+    "RefundResult",
+    "StringColumn",
+    "trusted_batch_item_result",
+    "trusted_contact_info",
+    "trusted_customer_data",
+    "trusted_payment_data",
+    "trusted_payment_response",
 ]
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import Optional #Para definir interfaces y tipos de datos opcionales.
+from pydantic import BaseModel #Para validaciones de datos y creación de modelos de datos.
+
+from .payment_response import PaymentResponse
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    response: Optional[PaymentResponse] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        Indica si el elemento del lote se procesó sin errores.
+        :return: True si hay respuesta y no se registró ningún error.
+        :rtype: bool
+        """
+        return self.response is not None and self.error is None
@@ -0,0 +1,343 @@
+from array import array
+from itertools import accumulate
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+from .customer import CustomerData
+from .payment_data import PaymentData
+from .trusted import trusted_contact_info, trusted_customer_data, trusted_payment_data
+
+
+class StringColumn:
+    """
+    Columna de cadenas codificadas por offsets: todos los valores en UTF-8 dentro de un único buffer,
+    un vector de offsets (n + 1 enteros) y una máscara de nulos de un byte por fila.
+    """
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array("Q", [0])
+        self._nulls = bytearray()
+
+    def append(self, value: Optional[str]):
+        """
+        Añade un valor al final de la columna.
+        :param value: Cadena a añadir o None.
+        :type value: Optional[str]
+        """
+        if value is None:
+            self._nulls.append(1)
+        else:
+            self._nulls.append(0)
+            self._data += value.encode()
+        self._offsets.append(len(self._data))
+
+    def extend(self, values: Iterable[Optional[str]]):
+        """
+        Añade varios valores de una vez: un único join para el buffer y los offsets acumulados en bloque.
+        :param values: Cadenas a añadir (None para los nulos).
+        :type values: Iterable[Optional[str]]
+        """
+        values = values if isinstance(values, list) else list(values)
+        if None in values:
+            self._nulls += bytes(value is None for value in values)
+            values = ["" if value is None else value for value in values]
+        else:
+            self._nulls += bytes(len(values))
+        text = "".join(values)
+        if text.isascii():
+            self._data += text.encode()
+            lengths = map(len, values)
+        else:
+            encoded = [value.encode() for value in values]
+            self._data += b"".join(encoded)
+            lengths = map(len, encoded)
+        offsets = accumulate(lengths, initial=self._offsets[-1])
+        next(offsets)
+        self._offsets.extend(offsets)
+
+    def extend_nulls(self, count: int):
+        """
+        Añade 'count' valores nulos.
+        :param count: Número de nulos a añadir.
+        :type count: int
+        """
+        self._nulls += b"\x01" * count
+        self._offsets.extend(array("Q", [len(self._data)]) * count)
+
+    def slice(self, start: int, stop: int) -> "StringColumn":
+        """
+        Copia un tramo de filas contiguas: un corte del buffer, de la máscara y de los offsets (rebasados a cero).
+        :param start: Primera fila del tramo.
+        :type start: int
+        :param stop: Fila siguiente a la última del tramo.
+        :type stop: int
+        :return: Una columna nueva con las filas [start, stop).
+        :rtype: StringColumn
+        """
+        offsets = self._offsets
+        base = offsets[start]
+        column = StringColumn()
+        column._data = self._data[base:offsets[stop]]
+        column._offsets = array("Q", [offset - base for offset in offsets[start:stop + 1]])
+        column._nulls = self._nulls[start:stop]
+        return column
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if self._nulls[index]:
+            return None
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode()
+
+    def __len__(self) -> int:
+        return len(self._nulls)
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        data, offsets, nulls = self._data, self._offsets, self._nulls
+        for index in range(len(nulls)):
+            yield None if nulls[index] else data[offsets[index]:offsets[index + 1]].decode()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        :return: Bytes ocupados por el buffer, los offsets y la máscara de nulos.
+        :rtype: int
+        """
+        return len(self._data) + self._offsets.itemsize * len(self._offsets) + len(self._nulls)
+
+
+class PaymentBatch:
+    """
+    Lote de pagos en formato columnar para los caminos masivos.
+    En lugar de un par de modelos pydantic por pago, guarda los montos en un array de enteros, las monedas
+    como códigos internados y los textos (nombre, email, teléfono, ID de cliente y fuente) en columnas
+    codificadas por offsets. Los modelos solo se materializan cuando se necesitan, fila a fila.
+    """
+    def __init__(self):
+        self.names = StringColumn()
+        self.emails = StringColumn()
+        self.phones = StringColumn()
+        self.customer_ids = StringColumn()
+        self.sources = StringColumn()
+        self.amounts = array("q")
+        self.currency_codes = array("H")
+        self.currencies: list[str] = []
+        self._currency_index: dict[str, int] = {}
+
+    def append(
+        self,
+        name: str,
+        amount: int,
+        source: str,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        customer_id: Optional[str] = None,
+        currency: str = "USD",
+    ):
+        """
+        Añade un pago al lote.
+        :param name: Nombre del cliente.
+        :type name: str
+        :param amount: Monto del pago.
+        :type amount: int
+        :param source: Fuente de pago.
+        :type source: str
+        :param email: Email del cliente.
+        :type email: Optional[str]
+        :param phone: Teléfono del cliente.
+        :type phone: Optional[str]
+        :param customer_id: ID del cliente en el proveedor de pagos.
+        :type customer_id: Optional[str]
+        :param currency: Código de moneda.
+        :type currency: str
+        """
+        code = self._currency_code(currency)
+        self.names.append(name)
+        self.emails.append(email)
+        self.phones.append(phone)
+        self.customer_ids.append(customer_id)
+        self.sources.append(source)
+        self.amounts.append(amount)
+        self.currency_codes.append(code)
+
+    def extend(
+        self,
+        names: Sequence[str],
+        amounts: Sequence[int],
+        sources: Sequence[str],
+        emails: Optional[Sequence[Optional[str]]] = None,
+        phones: Optional[Sequence[Optional[str]]] = None,
+        customer_ids: Optional[Sequence[Optional[str]]] = None,
+        currency: Union[str, Sequence[str]] = "USD",
+    ):
+        """
+        Añade muchos pagos de una vez, columna a columna, sin recorrer las filas en Python.
+        Es el camino de construcción masiva: append() sirve para ir añadiendo pagos sueltos.
+        :param names: Nombres de los clientes.
+        :type names: Sequence[str]
+        :param amounts: Montos de los pagos.
+        :type amounts: Sequence[int]
+        :param sources: Fuentes de pago.
+        :type sources: Sequence[str]
+        :param emails: Emails de los clientes; None si ningún pago lo tiene.
+        :type emails: Optional[Sequence[Optional[str]]]
+        :param phones: Teléfonos de los clientes; None si ningún pago lo tiene.
+        :type phones: Optional[Sequence[Optional[str]]]
+        :param customer_ids: IDs de los clientes en el proveedor; None si ningún pago lo tiene.
+        :type customer_ids: Optional[Sequence[Optional[str]]]
+        :param currency: Código de moneda común a todos los pagos, o uno por pago.
+        :type currency: Union[str, Sequence[str]]
+        :raises ValueError: Si las columnas no tienen la misma longitud.
+        """
+        count = len(amounts)
+        optional = (emails, phones, customer_ids)
+        per_row = () if isinstance(currency, str) else (currency,)
+        if any(len(column) != count for column in (names, sources, *per_row, *(c for c in optional if c is not None))):
+            raise ValueError("all columns must have the same length")
+        if per_row:
+            codes = {value: self._currency_code(value) for value in dict.fromkeys(currency)}
+            self.currency_codes.extend(array("H", [codes[value] for value in currency]))
+        else:
+            self.currency_codes.extend(array("H", [self._currency_code(currency)]) * count)
+        self.names.extend(names)
+        self.sources.extend(sources)
+        for column, values in zip((self.emails, self.phones, self.customer_ids), optional):
+            if values is None:
+                column.extend_nulls(count)
+            else:
+                column.extend(values)
+        self.amounts.extend(amounts)
+
+    @classmethod
+    def from_models(cls, items: Iterable[tuple[CustomerData, PaymentData]]) -> "PaymentBatch":
+        """
+        Construye un lote a partir de pares de modelos.
+        :param items: Pares (CustomerData, PaymentData).
+        :type items: Iterable[tuple[CustomerData, PaymentData]]
+        :return: El lote columnar equivalente.
+        :rtype: PaymentBatch
+        """
+        items = items if isinstance(items, list) else list(items)
+        customers = [customer_data for customer_data, _ in items]
+        payments = [payment_data for _, payment_data in items]
+        contacts = [customer_data.contact_info for customer_data in customers]
+        batch = cls()
+        batch.extend(
+            names=[customer_data.name for customer_data in customers],
+            amounts=[payment_data.amount for payment_data in payments],
+            sources=[payment_data.source for payment_data in payments],
+            emails=[contact_info.email for contact_info in contacts],
+            phones=[contact_info.phone for contact_info in contacts],
+            customer_ids=[customer_data.customer_id for customer_data in customers],
+            currency=[payment_data.currency for payment_data in payments],
+        )
+        return batch
+
+    def slice(self, start: int, stop: int) -> "PaymentBatch":
+        """
+        Copia un tramo de filas contiguas cortando cada columna, sin decodificar ni recorrer las filas una a una.
+        :param start: Primera fila del tramo.
+        :type start: int
+        :param stop: Fila siguiente a la última del tramo.
+        :type stop: int
+        :return: Un lote nuevo con las filas [start, stop).
+        :rtype: PaymentBatch
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        batch = PaymentBatch()
+        for attribute in ("names", "emails", "phones", "customer_ids", "sources"):
+            setattr(batch, attribute, getattr(self, attribute).slice(start, stop))
+        batch.amounts = self.amounts[start:stop]
+        batch.currency_codes = self.currency_codes[start:stop]
+        batch.currencies = list(self.currencies)
+        batch._currency_index = dict(self._currency_index)
+        return batch
+
+    def take(self, positions: Sequence[int]) -> "PaymentBatch":
+        """
+        :param positions: Filas a copiar, en el orden en que deben quedar.
+        :type positions: Sequence[int]
+        :return: Un lote nuevo con las filas indicadas.
+        :rtype: PaymentBatch
+        """
+        names, emails, phones, customer_ids, sources = (
+            [column[position] for position in positions]
+            for column in (self.names, self.emails, self.phones, self.customer_ids, self.sources)
+        )
+        batch = PaymentBatch()
+        batch.extend(
+            names=names,
+            amounts=[self.amounts[position] for position in positions],
+            sources=sources,
+            emails=emails,
+            phones=phones,
+            customer_ids=customer_ids,
+            currency=[self.currencies[self.currency_codes[position]] for position in positions],
+        )
+        return batch
+
+    def row(self, index: int) -> tuple[CustomerData, PaymentData]:
+        """
+        Materializa los modelos de una fila con los constructores de confianza, ya que los valores salen
+        de columnas tipadas del propio lote.
+        :param index: Posición de la fila.
+        :type index: int
+        :return: El par (CustomerData, PaymentData) de la fila.
+        :rtype: tuple[CustomerData, PaymentData]
+        """
+        customer_data = trusted_customer_data(
+            name=self.names[index],
+            contact_info=trusted_contact_info(email=self.emails[index], phone=self.phones[index]),
+            customer_id=self.customer_ids[index],
+        )
+        payment_data = trusted_payment_data(
+            amount=self.amounts[index],
+            source=self.sources[index],
+            currency=self.currencies[self.currency_codes[index]],
+        )
+        return customer_data, payment_data
+
+    def to_models(self) -> list[tuple[CustomerData, PaymentData]]:
+        """
+        :return: Todas las filas como pares de modelos.
+        :rtype: list[tuple[CustomerData, PaymentData]]
+        """
+        return list(self)
+
+    def columns(self) -> dict:
+        """
+        Expone las columnas con los nombres de campo que usan los validadores (validate_columns).
+        :return: Diccionario de nombre de campo a columna.
+        :rtype: dict
+        """
+        return {
+            "name": self.names,
+            "contact_info.email": self.emails,
+            "contact_info.phone": self.phones,
+            "source": self.sources,
+            "amount": self.amounts,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """
+        :return: Bytes ocupados por los datos de todas las columnas.
+        :rtype: int
+        """
+        return (
+            sum(column.nbytes for column in (self.names, self.emails, self.phones, self.customer_ids, self.sources))
+            + self.amounts.itemsize * len(self.amounts)
+            + self.currency_codes.itemsize * len(self.currency_codes)
+        )
+
+    def _currency_code(self, currency: str) -> int:
+        code = self._currency_index.get(currency)
+        if code is None:
+            code = self._currency_index[currency] = len(self.currencies)
+            self.currencies.append(currency)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def __iter__(self) -> Iterator[tuple[CustomerData, PaymentData]]:
+        for index in range(len(self)):
+            yield self.row(index)
@@ -0,0 +1,135 @@
+"""
+Constructores sin validación para los modelos de commons, para usar solo con datos de confianza
+(valores que el propio código ya construyó o validó). Crean la instancia directamente, sin pasar por
+pydantic-core: no convierten tipos ni comprueban nulos, así que no sirven para datos de APIs externas, que deben
+pasar por el constructor del modelo o por model_validate. Como en un modelo validado, __pydantic_fields_set__
+contiene solo los campos indicados por quien llama, por lo que model_dump(exclude_unset=True) coincide.
+Cada constructor escribe directamente en los slots de BaseModel para no pagar ni una llamada genérica por campo.
+"""
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from .batch_result import BatchItemResult
+from .contact import ContactInfo
+from .customer import CustomerData
+from .payment_data import PaymentData
+from .payment_response import PaymentResponse
+
+_new = object.__new__
+_set_dict = BaseModel.__dict__["__dict__"].__set__
+_set_fields_set = BaseModel.__dict__["__pydantic_fields_set__"].__set__
+_set_extra = BaseModel.__dict__["__pydantic_extra__"].__set__
+_set_private = BaseModel.__dict__["__pydantic_private__"].__set__
+_UNSET: Any = object()
+
+
+def trusted_contact_info(email: Optional[str] = _UNSET, phone: Optional[str] = _UNSET) -> ContactInfo:
+    """
+    Crea un ContactInfo sin validar.
+    :rtype: ContactInfo
+    """
+    fields_set = set()
+    if email is _UNSET:
+        email = None
+    else:
+        fields_set.add("email")
+    if phone is _UNSET:
+        phone = None
+    else:
+        fields_set.add("phone")
+    instance = _new(ContactInfo)
+    _set_dict(instance, {"email": email, "phone": phone})
+    _set_fields_set(instance, fields_set)
+    _set_extra(instance, None)
+    _set_private(instance, None)
+    return instance
+
+
+def trusted_customer_data(name: str, contact_info: ContactInfo, customer_id: Optional[str] = _UNSET) -> CustomerData:
+    """
+    Crea un CustomerData sin validar.
+    :rtype: CustomerData
+    """
+    if customer_id is _UNSET:
+        customer_id = None
+        fields_set = {"name", "contact_info"}
+    else:
+        fields_set = {"name", "contact_info", "customer_id"}
+    instance = _new(CustomerData)
+    _set_dict(instance, {"name": name, "contact_info": contact_info, "customer_id": customer_id})
+    _set_fields_set(instance, fields_set)
+    _set_extra(instance, None)
+    _set_private(instance, None)
+    return instance
+
+
+def trusted_payment_data(amount: int, source: str, currency: str = _UNSET) -> PaymentData:
+    """
+    Crea un PaymentData sin validar.
+    :rtype: PaymentData
+    """
+    if currency is _UNSET:
+        currency = "USD"
+        fields_set = {"amount", "source"}
+    else:
+        fields_set = {"amount", "source", "currency"}
+    instance = _new(PaymentData)
+    _set_dict(instance, {"amount": amount, "source": source, "currency": currency})
+    _set_fields_set(instance, fields_set)
+    _set_extra(instance, None)
+    _set_private(instance, None)
+    return instance
+
+
+def trusted_payment_response(
+    status: str,
+    amount: int,
+    transaction_id: Optional[str] = _UNSET,
+    message: Optional[str] = _UNSET,
+) -> PaymentResponse:
+    """
+    Crea un PaymentResponse sin validar.
+    :rtype: PaymentResponse
+    """
+    fields_set = {"status", "amount"}
+    if transaction_id is _UNSET:
+        transaction_id = None
+    else:
+        fields_set.add("transaction_id")
+    if message is _UNSET:
+        message = None
+    else:
+        fields_set.add("message")
+    instance = _new(PaymentResponse)
+    _set_dict(instance, {"status": status, "amount": amount, "transaction_id": transaction_id, "message": message})
+    _set_fields_set(instance, fields_set)
+    _set_extra(instance, None)
+    _set_private(instance, None)
+    return instance
+
+
+def trusted_batch_item_result(
+    index: int,
+    response: Optional[PaymentResponse] = _UNSET,
+    error: Optional[str] = _UNSET,
+) -> BatchItemResult:
+    """
+    Crea un BatchItemResult sin validar.
+    :rtype: BatchItemResult
+    """
+    fields_set = {"index"}
+    if response is _UNSET:
+        response = None
+    else:
+        fields_set.add("response")
+    if error is _UNSET:
+        error = None
+    else:
+        fields_set.add("error")
+    instance = _new(BatchItemResult)
+    _set_dict(instance, {"index": index, "response": response, "error": error})
+    _set_fields_set(instance, fields_set)
+    _set_extra(instance, None)
+    _set_private(instance, None)
+    return instance
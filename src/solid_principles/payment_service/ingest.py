@@ -0,0 +1,250 @@
+from .commons import BatchItemResult, PaymentBatch
+from .services import PaymentService
+
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import IO, Callable, Iterator, Optional
+
+_FIELDS = ("name", "amount", "source", "email", "phone", "customer_id", "currency")
+
+
+@dataclass
+class IngestProgress:
+    """
+    Avance de una ingesta: filas leídas y fallidas y bytes consumidos del archivo de entrada.
+    """
+    rows: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    bytes_read: int = 0
+    total_bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def fraction(self) -> float:
+        """
+        :return: Fracción del archivo ya procesada, entre 0 y 1.
+        :rtype: float
+        """
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+
+class PaymentFileIngestor:
+    """
+    Ingesta en streaming de archivos de pagos CSV o JSONL a través de PaymentService.
+    El archivo se lee fila a fila y se agrupa en PaymentBatch de chunk_size filas, que se procesan con
+    process_batch; la memoria usada depende del tamaño del bloque, no del tamaño del archivo. Los resultados
+    se escriben en un archivo JSONL (una línea por fila de entrada) a medida que termina cada bloque.
+    Con resume=True una ingesta interrumpida se retoma: las filas que ya tienen resultado no se vuelven a cobrar.
+    Columnas reconocidas: name, amount, source, email, phone, customer_id y currency.
+    """
+    def __init__(
+        self,
+        service: PaymentService,
+        chunk_size: int = 1000,
+        max_workers: int = 8,
+        progress: Optional[Callable[[IngestProgress], None]] = None,
+    ):
+        """
+        :param service: Servicio que procesa los pagos.
+        :type service: PaymentService
+        :param chunk_size: Filas por bloque enviado a process_batch.
+        :type chunk_size: int
+        :param max_workers: Llamadas simultáneas al procesador dentro de cada bloque.
+        :type max_workers: int
+        :param progress: Función llamada con el avance tras cada bloque.
+        :type progress: Optional[Callable[[IngestProgress], None]]
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.service = service
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.progress = progress
+
+    def ingest(
+        self,
+        input_path: str,
+        results_path: str,
+        file_format: Optional[str] = None,
+        resume: bool = False,
+    ) -> IngestProgress:
+        """
+        Procesa un archivo de pagos completo. El archivo se lee como UTF-8, con o sin BOM.
+        :param input_path: Archivo de entrada.
+        :type input_path: str
+        :param results_path: Archivo JSONL donde se escribe el resultado de cada fila.
+        :type results_path: str
+        :param file_format: "csv" o "jsonl"; por defecto se deduce de la extensión.
+        :type file_format: Optional[str]
+        :param resume: Si es True y results_path existe, se conservan sus resultados, se omiten (y cuentan en
+            skipped) las filas que ya tienen uno y los nuevos se añaden al final. Una última línea a medio escribir
+            se descarta y su fila se procesa de nuevo. Las filas de un bloque que se cobraron pero cuyo resultado no
+            llegó a escribirse no se pueden distinguir y se vuelven a cobrar.
+        :type resume: bool
+        :return: El avance final con los totales.
+        :rtype: IngestProgress
+        :raises ValueError: Si el formato no se reconoce.
+        """
+        file_format = file_format or self._detect_format(input_path)
+        state = IngestProgress(total_bytes=os.path.getsize(input_path))
+        done = _completed_lines(results_path) if resume and os.path.exists(results_path) else set()
+        start = time.perf_counter()
+        mode = "a" if done else "w"
+        with open(input_path, newline="", encoding="utf-8-sig") as input_file, open(results_path, mode) as results_file:
+            records = self._read_csv(input_file) if file_format == "csv" else self._read_jsonl(input_file)
+            batch, lines, output = PaymentBatch(), [], []
+            for line, record in records:
+                if line in done:
+                    state.skipped += 1
+                    continue
+                error = self._append(batch, record)
+                if error is None:
+                    lines.append(line)
+                else:
+                    output.append((line, None, error))
+                if len(lines) + len(output) >= self.chunk_size:
+                    self._flush(batch, lines, output, results_file, state)
+                    state.bytes_read = input_file.buffer.tell()
+                    state.elapsed = time.perf_counter() - start
+                    if self.progress is not None:
+                        self.progress(state)
+                    batch, lines, output = PaymentBatch(), [], []
+            self._flush(batch, lines, output, results_file, state)
+        state.bytes_read = state.total_bytes
+        state.elapsed = time.perf_counter() - start
+        if self.progress is not None:
+            self.progress(state)
+        return state
+
+    @staticmethod
+    def _detect_format(path: str) -> str:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise ValueError(f"Unknown payment file format: {path}")
+
+    @staticmethod
+    def _read_csv(input_file: IO[str]) -> Iterator[tuple[int, dict]]:
+        reader = csv.DictReader(input_file)
+        for row in reader:
+            yield reader.line_num, row
+
+    @staticmethod
+    def _read_jsonl(input_file: IO[str]) -> Iterator[tuple[int, dict]]:
+        for line, text in enumerate(input_file, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as e:
+                record = {"_error": f"Invalid JSON: {e.msg}"}
+            yield line, record if isinstance(record, dict) else {"_error": "Row is not a JSON object"}
+
+    @staticmethod
+    def _append(batch: PaymentBatch, record: dict) -> Optional[str]:
+        """
+        Añade una fila al bloque si tiene los campos mínimos con el tipo correcto.
+        :return: El error de formato de la fila, o None si se añadió.
+        :rtype: Optional[str]
+        """
+        if "_error" in record:
+            return record["_error"]
+        values = {field: None if record.get(field) in ("", None) else record.get(field) for field in _FIELDS}
+        if values["name"] is None or values["source"] is None or values["amount"] is None:
+            return "Missing name, source or amount"
+        amount = _parse_amount(values["amount"])
+        if amount is None:
+            return f"Invalid amount: {values['amount']}"
+        for field in _FIELDS:
+            if field != "amount" and values[field] is not None:
+                if isinstance(values[field], (bool, dict, list)):
+                    return f"Invalid {field}: {values[field]}"
+                values[field] = str(values[field])
+        batch.append(
+            name=values["name"],
+            amount=amount,
+            source=values["source"],
+            email=values["email"],
+            phone=values["phone"],
+            customer_id=values["customer_id"],
+            currency=values["currency"] or "USD",
+        )
+        return None
+
+    def _flush(
+        self,
+        batch: PaymentBatch,
+        lines: list[int],
+        output: list[tuple[int, Optional[BatchItemResult], Optional[str]]],
+        results_file: IO[str],
+        state: IngestProgress,
+    ):
+        if len(batch):
+            results = self.service.process_batch(batch, max_workers=self.max_workers)
+            output.extend((line, result, result.error) for line, result in zip(lines, results))
+            output.sort(key=lambda entry: entry[0])
+        chunk = []
+        for line, result, error in output:
+            response = result.response if result is not None else None
+            ok = response is not None and error is None and response.status != "failed"
+            chunk.append(json.dumps({
+                "line": line,
+                "status": response.status if response is not None else "error",
+                "transaction_id": response.transaction_id if response is not None else None,
+                "message": response.message if response is not None else None,
+                "error": error,
+            }) + "\n")
+            state.rows += 1
+            if ok:
+                state.succeeded += 1
+            else:
+                state.failed += 1
+        results_file.write("".join(chunk))
+        results_file.flush()
+
+
+def _completed_lines(results_path: str) -> set[int]:
+    """
+    Lee las filas ya procesadas de un archivo de resultados y recorta una última línea incompleta.
+    :return: Los números de línea de entrada que ya tienen resultado.
+    :rtype: set[int]
+    """
+    with open(results_path, "rb+") as results_file:
+        data = results_file.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            results_file.truncate(complete)
+    done = set()
+    for text in data[:complete].splitlines():
+        try:
+            done.add(json.loads(text)["line"])
+        except (ValueError, KeyError, TypeError):
+            continue
+    return done
+
+
+def _parse_amount(value) -> Optional[int]:
+    """
+    Convierte el monto de una fila a centavos enteros sin redondear nunca.
+    :return: El monto, o None si no es un entero (por ejemplo 12.99, "12.5", true o un objeto).
+    :rtype: Optional[int]
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
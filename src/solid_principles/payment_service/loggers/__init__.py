@@ -1,5 +1,18 @@
+from .buffered_transaction_logger import BufferedTransactionLogger
+from .journal_transaction_logger import JournalTransactionLogger
+from .rotating_transaction_logger import RotatingTransactionLogger, SegmentInfo
+from .transaction_journal import JournalRecord, TransactionJournal
+from .transaction_log_reader import LogRecord, TransactionLogReader
 from .transaction_logger import TransactionLogger
 
 __all__ = [
+    "BufferedTransactionLogger",
+    "JournalRecord",
+    "JournalTransactionLogger",
+    "LogRecord",
+    "RotatingTransactionLogger",
+    "SegmentInfo",
+    "TransactionJournal",
+    "TransactionLogReader",
     "TransactionLogger",
 ]
\ No newline at end of file
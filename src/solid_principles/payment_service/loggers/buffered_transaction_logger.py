@@ -0,0 +1,118 @@
+from .transaction_logger import TransactionLogger
+
+import atexit
+import os
+import threading
+from collections import deque
+
+
+class BufferedTransactionLogger(TransactionLogger):
+    """
+    Registro de transacciones con buffer en memoria y volcado en segundo plano.
+    Cada llamada a log_transaction/log_refund solo añade el bloque formateado a un buffer circular;
+    un hilo de fondo lo vuelca al archivo, que permanece abierto, en una única escritura cuando se alcanza
+    el tamaño de lote, cuando vence el intervalo de volcado o al cerrar el logger. Si el buffer llega a
+    max_buffered, los productores esperan a que el hilo de fondo lo vacíe.
+    """
+    def __init__(
+        self,
+        log_path: str = "transactions.log",
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        max_buffered: int = 65536,
+        fsync: bool = False,
+    ):
+        """
+        :param log_path: Ruta del archivo de registro.
+        :type log_path: str
+        :param batch_size: Número de registros acumulados que dispara un volcado inmediato.
+        :type batch_size: int
+        :param flush_interval: Segundos máximos que un registro puede esperar en el buffer.
+        :type flush_interval: float
+        :param max_buffered: Capacidad máxima del buffer; al llenarse, el productor espera a que el hilo de fondo
+            lo vacíe (contrapresión en vez de pérdida), así que nunca hay más registros pendientes en memoria.
+        :type max_buffered: int
+        :param fsync: Si es True se llama a os.fsync tras cada lote para garantizar durabilidad en disco.
+        :type fsync: bool
+        """
+        super().__init__(log_path)
+        if batch_size < 1 or max_buffered < batch_size:
+            raise ValueError("batch_size must be >= 1 and max_buffered >= batch_size")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.fsync = fsync
+        self._buffer: deque[str] = deque()
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._file = open(log_path, "a")
+        self._thread = threading.Thread(
+            target=self._run, name="transaction-logger-flush", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def flush(self):
+        """
+        Vuelca inmediatamente todo lo que haya en el buffer al archivo.
+        """
+        with self._write_lock:
+            with self._condition:
+                records = self._drain()
+            self._write_batch(records)
+
+    def close(self):
+        """
+        Detiene el hilo de fondo, vuelca los registros pendientes y cierra el archivo. Es idempotente.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.flush()
+        self._file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "BufferedTransactionLogger":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, text: str):
+        with self._condition:
+            while not self._closed and len(self._buffer) >= self.max_buffered:
+                self._condition.notify_all()
+                self._condition.wait()
+            if self._closed:
+                raise ValueError("Cannot log to a closed BufferedTransactionLogger")
+            self._buffer.append(text)
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._closed and len(self._buffer) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def _drain(self) -> list[str]:
+        records = list(self._buffer)
+        self._buffer.clear()
+        self._condition.notify_all()
+        return records
+
+    def _write_batch(self, records: list[str]):
+        if not records:
+            return
+        self._file.write("".join(records))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
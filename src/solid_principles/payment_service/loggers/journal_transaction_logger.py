@@ -0,0 +1,107 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from .transaction_journal import CHARGE, REFUND, JournalRecord, TransactionJournal
+from .transaction_logger import TransactionLogger
+
+import time
+from typing import Iterable, Optional
+
+
+class JournalTransactionLogger(TransactionLogger):
+    """
+    Registro de transacciones que escribe en un TransactionJournal binario en lugar de un archivo de texto.
+    Además de registrar, permite recuperar en O(1) el cargo original de una transacción por su ID.
+    """
+    supports_lookup = True
+
+    def __init__(self, journal: TransactionJournal):
+        """
+        :param journal: Diario binario donde se guardan los registros.
+        :type journal: TransactionJournal
+        """
+        super().__init__(journal.path)
+        self.journal = journal
+
+    def log_transaction(self, customer_data: CustomerData, payment_data: PaymentData, payment_response: PaymentResponse):
+        """
+        Registra una transacción como registro de cargo en el diario.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :param payment_response: Respuesta del procesamiento del pago que incluye estado, monto, ID de transacción y mensaje.
+        :type payment_response: PaymentResponse
+        """
+        self.journal.append(self._charge_record(
+            customer_data.name, payment_data.amount, payment_data.source, payment_data.currency, payment_response
+        ))
+
+    def log_charges(self, charges: Iterable[tuple[str, int, str, str, PaymentResponse]]):
+        """
+        Registra varios cargos en el diario con una única escritura.
+        :param charges: Tuplas (nombre del cliente, monto, fuente de pago, moneda, respuesta del pago).
+        :type charges: Iterable[tuple[str, int, str, str, PaymentResponse]]
+        """
+        records = [self._charge_record(*charge) for charge in charges]
+        if records:
+            self.journal.append_many(records)
+
+    def log_refund(self, transaction_id: str, refund_response: PaymentResponse):
+        """
+        Registra un reembolso en el diario, enlazado a la transacción original.
+        :param transaction_id: ID de la transacción a la que se le realiza el reembolso.
+        :type transaction_id: str
+        :param refund_response: Respuesta del procesamiento del reembolso que incluye estado, monto y mensaje.
+        :type refund_response: PaymentResponse
+        """
+        self.journal.append(self._refund_record(transaction_id, refund_response))
+
+    def log_refunds(self, refunds: Iterable[tuple[str, PaymentResponse]]):
+        """
+        Registra varios reembolsos en el diario con una única escritura.
+        :param refunds: Pares (ID de la transacción, respuesta del reembolso).
+        :type refunds: Iterable[tuple[str, PaymentResponse]]
+        """
+        records = [
+            self._refund_record(transaction_id, refund_response)
+            for transaction_id, refund_response in refunds
+        ]
+        if records:
+            self.journal.append_many(records)
+
+    @staticmethod
+    def _charge_record(
+        name: str, amount: int, source: str, currency: str, payment_response: PaymentResponse
+    ) -> JournalRecord:
+        return JournalRecord(
+            kind=CHARGE,
+            timestamp=time.time(),
+            amount=amount,
+            transaction_id=payment_response.transaction_id,
+            status=payment_response.status,
+            message=payment_response.message,
+            customer_name=name,
+            source=source,
+            currency=currency,
+        )
+
+    @staticmethod
+    def _refund_record(transaction_id: str, refund_response: PaymentResponse) -> JournalRecord:
+        return JournalRecord(
+            kind=REFUND,
+            timestamp=time.time(),
+            amount=refund_response.amount,
+            transaction_id=transaction_id,
+            status=refund_response.status,
+            message=refund_response.message,
+            reference=refund_response.transaction_id,
+        )
+
+    def find_transaction(self, transaction_id: str) -> Optional[JournalRecord]:
+        """
+        Recupera el cargo original de una transacción.
+        :param transaction_id: ID de la transacción.
+        :type transaction_id: str
+        :return: El registro del cargo o None si no está en el diario.
+        :rtype: Optional[JournalRecord]
+        """
+        return self.journal.get_transaction(transaction_id)
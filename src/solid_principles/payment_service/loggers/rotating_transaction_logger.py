@@ -0,0 +1,350 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from .transaction_log_reader import LogRecord, scan_records
+from .transaction_logger import TransactionLogger
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable, Iterator, Optional
+
+
+@dataclass
+class SegmentInfo:
+    """
+    Entrada del manifiesto que describe un segmento cerrado del registro.
+    """
+    path: str
+    first_timestamp: float
+    last_timestamp: float
+    min_transaction_id: Optional[str] = None
+    max_transaction_id: Optional[str] = None
+    records: int = 0
+    compressed: bool = False
+
+    def may_contain(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        transaction_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Indica si el segmento puede contener registros en el intervalo de tiempo o con el ID indicados.
+        :return: False solo cuando es seguro que el segmento no contiene coincidencias.
+        :rtype: bool
+        """
+        if start is not None and self.last_timestamp < start:
+            return False
+        if end is not None and self.first_timestamp > end:
+            return False
+        if transaction_id is not None:
+            if self.min_transaction_id is None or not (
+                self.min_transaction_id <= transaction_id <= self.max_transaction_id
+            ):
+                return False
+        return True
+
+
+class RotatingTransactionLogger(TransactionLogger):
+    """
+    Registro de transacciones segmentado.
+    Escribe en un archivo activo que se rota al superar un tamaño o una antigüedad (comprobada al escribir, en
+    un temporizador de fondo y al cerrar, para que un registro sin tráfico también rote); los segmentos cerrados se
+    comprimen con gzip en un hilo de fondo y se describen en un manifiesto JSON con su rango de tiempo y de
+    IDs de transacción, de modo que las consultas históricas pueden saltarse los segmentos que no coinciden.
+    """
+    def __init__(
+        self,
+        directory: str = "transaction_logs",
+        base_name: str = "transactions",
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: Optional[float] = None,
+        compress: bool = True,
+    ):
+        """
+        :param directory: Carpeta donde se guardan el archivo activo, los segmentos y el manifiesto.
+        :type directory: str
+        :param base_name: Prefijo de los nombres de archivo.
+        :type base_name: str
+        :param max_bytes: Tamaño a partir del cual se rota el archivo activo.
+        :type max_bytes: int
+        :param max_age: Segundos tras los que se rota el archivo activo aunque no esté lleno; None para desactivarlo.
+        :type max_age: Optional[float]
+        :param compress: Si es True los segmentos cerrados se comprimen con gzip en segundo plano.
+        :type compress: bool
+        """
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(os.path.join(directory, f"{base_name}.log"))
+        self.directory = directory
+        self.base_name = base_name
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self._lock = threading.RLock()
+        self.segments = self._load_manifest()
+        self._compress_queue: "queue.Queue[Optional[SegmentInfo]]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._compress_worker, name="transaction-logger-compress", daemon=True
+        )
+        self._worker.start()
+        self._stopped = threading.Event()
+        self._age_timer: Optional[threading.Thread] = None
+        for segment in self.segments:
+            if self.compress and not segment.compressed:
+                self._compress_queue.put(segment)
+        if os.path.exists(self.log_path) and os.path.getsize(self.log_path):
+            self._seal(self._describe_existing(self.log_path))
+        self._open_active()
+        if max_age is not None:
+            self._age_timer = threading.Thread(
+                target=self._rotate_when_old, name="transaction-logger-rotate", daemon=True
+            )
+            self._age_timer.start()
+
+    def log_transaction(self, customer_data: CustomerData, payment_data: PaymentData, payment_response: PaymentResponse):
+        """
+        Registra una transacción en el segmento activo, rotándolo antes si es necesario.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :param payment_response: Respuesta del procesamiento del pago que incluye estado, monto, ID de transacción y mensaje.
+        :type payment_response: PaymentResponse
+        """
+        with self._lock:
+            super().log_transaction(customer_data, payment_data, payment_response)
+            self._observe(payment_response.transaction_id)
+
+    def log_refund(self, transaction_id: str, refund_response: PaymentResponse):
+        """
+        Registra un reembolso en el segmento activo, rotándolo antes si es necesario.
+        :param transaction_id: ID de la transacción a la que se le realiza el reembolso.
+        :type transaction_id: str
+        :param refund_response: Respuesta del procesamiento del reembolso que incluye estado, monto y mensaje.
+        :type refund_response: PaymentResponse
+        """
+        with self._lock:
+            super().log_refund(transaction_id, refund_response)
+            self._observe(transaction_id)
+
+    def log_refunds(self, refunds: Iterable[tuple[str, PaymentResponse]]):
+        """
+        Registra varios reembolsos con una única escritura en el segmento activo.
+        :param refunds: Pares (ID de la transacción, respuesta del reembolso).
+        :type refunds: Iterable[tuple[str, PaymentResponse]]
+        """
+        refunds = list(refunds)
+        with self._lock:
+            super().log_refunds(refunds)
+            for transaction_id, _ in refunds:
+                self._observe(transaction_id)
+
+    def log_charges(self, charges: Iterable[tuple[str, int, str, str, PaymentResponse]]):
+        """
+        Registra varios cargos con una única escritura en el segmento activo.
+        :param charges: Tuplas (nombre del cliente, monto, fuente de pago, moneda, respuesta del pago).
+        :type charges: Iterable[tuple[str, int, str, str, PaymentResponse]]
+        """
+        charges = list(charges)
+        with self._lock:
+            super().log_charges(charges)
+            for *_, payment_response in charges:
+                self._observe(payment_response.transaction_id)
+
+    def rotate(self):
+        """
+        Cierra el segmento activo (si tiene registros) y abre uno nuevo.
+        """
+        with self._lock:
+            if self._active.records == 0:
+                return
+            self._file.close()
+            self._seal(self._active)
+            self._open_active()
+
+    def segments_for(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        transaction_id: Optional[str] = None,
+    ) -> list[SegmentInfo]:
+        """
+        Devuelve los segmentos, incluido el activo, que pueden contener registros que coincidan.
+        :param start: Marca de tiempo mínima (epoch en segundos).
+        :type start: Optional[float]
+        :param end: Marca de tiempo máxima (epoch en segundos).
+        :type end: Optional[float]
+        :param transaction_id: ID de transacción buscado.
+        :type transaction_id: Optional[str]
+        :return: Los segmentos candidatos en orden cronológico.
+        :rtype: list[SegmentInfo]
+        """
+        with self._lock:
+            candidates = list(self.segments)
+            if self._active.records:
+                candidates.append(self._active)
+        return [
+            segment for segment in candidates
+            if segment.may_contain(start, end, transaction_id)
+        ]
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        **filters: Any,
+    ) -> Iterator[LogRecord]:
+        """
+        Busca registros recorriendo solo los segmentos que pueden contenerlos.
+        El rango de tiempo poda segmentos completos; los demás filtros son los de TransactionLogReader.query.
+        :param start: Marca de tiempo mínima (epoch en segundos).
+        :type start: Optional[float]
+        :param end: Marca de tiempo máxima (epoch en segundos).
+        :type end: Optional[float]
+        :return: Un generador de LogRecord.
+        :rtype: Iterator[LogRecord]
+        """
+        with self._lock:
+            self._file.flush()
+        for segment in self.segments_for(start, end, filters.get("transaction_id")):
+            yield from scan_records(self._read_segment(segment), **filters)
+
+    def close(self):
+        """
+        Detiene el temporizador de rotación, cierra el archivo activo (sellándolo si ya tocaba rotarlo) y espera
+        a que termine la compresión pendiente.
+        """
+        self._stopped.set()
+        if self._age_timer is not None:
+            self._age_timer.join()
+        with self._lock:
+            self._file.close()
+            if self._should_rotate():
+                self._seal(self._active)
+        self._compress_queue.put(None)
+        self._worker.join()
+
+    def _write(self, text: str):
+        if self._should_rotate():
+            self._file.close()
+            self._seal(self._active)
+            self._open_active()
+        self._file.write(text)
+        self._file.flush()
+        self._size += len(text.encode())
+
+    def _should_rotate(self) -> bool:
+        if self._active.records == 0:
+            return False
+        if self._size >= self.max_bytes:
+            return True
+        return self.max_age is not None and time.time() - self._opened_at >= self.max_age
+
+    def _rotate_when_old(self):
+        while True:
+            with self._lock:
+                if time.time() - self._opened_at >= self.max_age:
+                    if self._active.records:
+                        self.rotate()
+                    else:
+                        self._opened_at = time.time()
+                remaining = self._opened_at + self.max_age - time.time()
+            if self._stopped.wait(max(remaining, 0.0)):
+                return
+
+    def _observe(self, transaction_id: Optional[str]):
+        active = self._active
+        now = time.time()
+        if active.records == 0:
+            active.first_timestamp = now
+        active.last_timestamp = now
+        active.records += 1
+        if transaction_id:
+            if active.min_transaction_id is None or transaction_id < active.min_transaction_id:
+                active.min_transaction_id = transaction_id
+            if active.max_transaction_id is None or transaction_id > active.max_transaction_id:
+                active.max_transaction_id = transaction_id
+
+    def _open_active(self):
+        self._file = open(self.log_path, "a")
+        self._size = 0
+        self._opened_at = time.time()
+        self._active = SegmentInfo(self.log_path, self._opened_at, self._opened_at)
+
+    def _seal(self, segment: SegmentInfo):
+        """
+        Renombra el archivo activo como segmento numerado, lo añade al manifiesto y lo encola para comprimir.
+        """
+        sealed_path = os.path.join(
+            self.directory, f"{self.base_name}-{len(self.segments) + 1:06d}.log"
+        )
+        os.replace(self.log_path, sealed_path)
+        segment.path = sealed_path
+        self.segments.append(segment)
+        self._save_manifest()
+        if self.compress:
+            self._compress_queue.put(segment)
+
+    def _describe_existing(self, path: str) -> SegmentInfo:
+        """
+        Reconstruye la descripción de un archivo activo que quedó de una ejecución anterior.
+        Como el texto no guarda horas, se usa la fecha de modificación del archivo como rango de tiempo.
+        """
+        modified = os.path.getmtime(path)
+        segment = SegmentInfo(path, modified, modified)
+        with open(path, "rb") as log_file:
+            records = list(scan_records(log_file.read()))
+        transaction_ids = [record.transaction_id for record in records if record.transaction_id]
+        segment.records = len(records)
+        if transaction_ids:
+            segment.min_transaction_id = min(transaction_ids)
+            segment.max_transaction_id = max(transaction_ids)
+        return segment
+
+    def _read_segment(self, segment: SegmentInfo) -> bytes:
+        while True:
+            with self._lock:
+                path, compressed = segment.path, segment.compressed
+            try:
+                if compressed:
+                    with gzip.open(path, "rb") as segment_file:
+                        return segment_file.read()
+                with open(path, "rb") as segment_file:
+                    return segment_file.read()
+            except FileNotFoundError:
+                # El compresor terminó mientras tanto y borró la versión sin comprimir.
+                if compressed:
+                    raise
+
+    def _compress_worker(self):
+        while True:
+            segment = self._compress_queue.get()
+            if segment is None:
+                return
+            compressed_path = segment.path + ".gz"
+            with open(segment.path, "rb") as source, gzip.open(compressed_path + ".tmp", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.replace(compressed_path + ".tmp", compressed_path)
+            with self._lock:
+                original_path = segment.path
+                segment.path = compressed_path
+                segment.compressed = True
+                self._save_manifest()
+            os.remove(original_path)
+
+    def _load_manifest(self) -> list[SegmentInfo]:
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path) as manifest_file:
+            return [SegmentInfo(**entry) for entry in json.load(manifest_file)]
+
+    def _save_manifest(self):
+        temporary_path = self.manifest_path + ".tmp"
+        with open(temporary_path, "w") as manifest_file:
+            json.dump([asdict(segment) for segment in self.segments], manifest_file, indent=2)
+        os.replace(temporary_path, self.manifest_path)
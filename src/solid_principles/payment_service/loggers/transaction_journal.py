@@ -0,0 +1,265 @@
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+CHARGE = 1
+REFUND = 2
+
+# Cabecera de cada registro: longitud del cuerpo, CRC32 del cuerpo y tipo de registro.
+_HEADER = struct.Struct("<IIB")
+# Campos de tamaño fijo del cuerpo: marca de tiempo y monto.
+_FIXED = struct.Struct("<dq")
+# Longitud de cada cadena del cuerpo; _NULL representa None.
+_STR_LEN = struct.Struct("<I")
+_NULL = 0xFFFFFFFF
+# Entrada del índice: offset del registro, offset final, tipo y longitud de la clave.
+_INDEX_ENTRY = struct.Struct("<QQBH")
+
+
+@dataclass(frozen=True)
+class JournalRecord:
+    """
+    Registro decodificado del diario de transacciones.
+    Para los reembolsos, transaction_id es la transacción original y reference el ID del reembolso.
+    """
+    kind: int
+    timestamp: float
+    amount: int
+    transaction_id: Optional[str]
+    status: str
+    message: Optional[str] = None
+    customer_name: Optional[str] = None
+    source: Optional[str] = None
+    currency: Optional[str] = None
+    reference: Optional[str] = None
+
+
+class TransactionJournal:
+    """
+    Diario binario de solo-anexado con un índice lateral de transaction_id a offset.
+    Cada registro lleva longitud y CRC32, por lo que un registro final incompleto (por ejemplo tras una
+    caída) se detecta y se descarta. El índice se guarda en '<path>.idx'; al reabrir solo se escanea la
+    parte del diario posterior a la última entrada indexada.
+    """
+    def __init__(self, path: str = "transactions.journal"):
+        """
+        :param path: Ruta del archivo del diario. El índice se guarda junto a él con sufijo '.idx'.
+        :type path: str
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self._charges: dict[str, int] = {}
+        self._refunds: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._journal = open(path, "a+b")
+        self._index = open(self.index_path, "a+b")
+        self._end = self._recover()
+
+    def append(self, record: JournalRecord) -> int:
+        """
+        Añade un registro al final del diario y actualiza el índice.
+        :param record: Registro a añadir.
+        :type record: JournalRecord
+        :return: Offset en el que quedó escrito el registro.
+        :rtype: int
+        """
+        data = self._encode(record)
+        with self._lock:
+            offset = self._end
+            self._journal.write(data)
+            self._journal.flush()
+            self._end = offset + len(data)
+            self._add_to_index(record.kind, record.transaction_id, offset, self._end)
+            self._index.flush()
+        return offset
+
+    def append_many(self, records: list[JournalRecord]) -> list[int]:
+        """
+        Añade varios registros con una única escritura y actualiza el índice.
+        :param records: Registros a añadir, en orden.
+        :type records: list[JournalRecord]
+        :return: Offset en el que quedó escrito cada registro.
+        :rtype: list[int]
+        """
+        encoded = [self._encode(record) for record in records]
+        offsets = []
+        with self._lock:
+            offset = self._end
+            self._journal.write(b"".join(encoded))
+            self._journal.flush()
+            for record, data in zip(records, encoded):
+                end = offset + len(data)
+                self._add_to_index(record.kind, record.transaction_id, offset, end)
+                offsets.append(offset)
+                offset = end
+            self._end = offset
+            self._index.flush()
+        return offsets
+
+    def get_transaction(self, transaction_id: str) -> Optional[JournalRecord]:
+        """
+        Busca en O(1) el cargo original de una transacción.
+        :param transaction_id: ID de la transacción.
+        :type transaction_id: str
+        :return: El registro del cargo o None si no existe.
+        :rtype: Optional[JournalRecord]
+        """
+        return self._read_indexed(self._charges, transaction_id)
+
+    def get_refund(self, transaction_id: str) -> Optional[JournalRecord]:
+        """
+        Busca en O(1) el último reembolso registrado para una transacción.
+        :param transaction_id: ID de la transacción original.
+        :type transaction_id: str
+        :return: El registro del reembolso o None si no existe.
+        :rtype: Optional[JournalRecord]
+        """
+        return self._read_indexed(self._refunds, transaction_id)
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        offset = 0
+        while True:
+            with self._lock:
+                if offset >= self._end:
+                    return
+                record, offset = self._read_at(offset)
+            yield record
+
+    def __len__(self) -> int:
+        return len(self._charges)
+
+    def close(self):
+        """
+        Cierra el diario y su índice.
+        """
+        with self._lock:
+            self._journal.close()
+            self._index.close()
+
+    def __enter__(self) -> "TransactionJournal":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read_indexed(self, index: dict[str, int], transaction_id: str) -> Optional[JournalRecord]:
+        with self._lock:
+            offset = index.get(transaction_id)
+            if offset is None:
+                return None
+            return self._read_at(offset)[0]
+
+    def _read_at(self, offset: int) -> tuple[JournalRecord, int]:
+        self._journal.seek(offset)
+        header = self._journal.read(_HEADER.size)
+        length, checksum, kind = _HEADER.unpack(header)
+        body = self._journal.read(length)
+        if len(body) != length or zlib.crc32(body) != checksum:
+            raise ValueError(f"Corrupted journal record at offset {offset}")
+        return self._decode(kind, body), offset + _HEADER.size + length
+
+    def _add_to_index(self, kind: int, transaction_id: Optional[str], offset: int, end: int):
+        key = (transaction_id or "").encode()
+        self._index.write(_INDEX_ENTRY.pack(offset, end, kind, len(key)) + key)
+        if transaction_id:
+            (self._refunds if kind == REFUND else self._charges)[transaction_id] = offset
+
+    def _recover(self) -> int:
+        """
+        Carga el índice, comprueba que sea coherente con el diario y escanea solo la cola no indexada.
+        Si el índice no encaja con el diario se reconstruye desde cero.
+        :return: Offset del final válido del diario.
+        :rtype: int
+        """
+        journal_size = os.fstat(self._journal.fileno()).st_size
+        indexed_end, last_offset = self._load_index()
+        if indexed_end > journal_size or not self._is_valid_record(last_offset, indexed_end):
+            self._charges.clear()
+            self._refunds.clear()
+            self._index.truncate(0)
+            indexed_end = 0
+
+        end = indexed_end
+        while end < journal_size:
+            try:
+                record, next_end = self._read_at(end)
+            except (struct.error, ValueError):
+                break
+            self._add_to_index(record.kind, record.transaction_id, end, next_end)
+            end = next_end
+        self._index.flush()
+        if end < journal_size:
+            self._journal.truncate(end)
+        return end
+
+    def _load_index(self) -> tuple[int, Optional[int]]:
+        self._index.seek(0)
+        data = self._index.read()
+        position = 0
+        indexed_end = 0
+        last_offset = None
+        while position + _INDEX_ENTRY.size <= len(data):
+            offset, end, kind, key_length = _INDEX_ENTRY.unpack_from(data, position)
+            key_start = position + _INDEX_ENTRY.size
+            if key_start + key_length > len(data):
+                break
+            key = data[key_start:key_start + key_length].decode()
+            if key:
+                (self._refunds if kind == REFUND else self._charges)[key] = offset
+            indexed_end, last_offset = end, offset
+            position = key_start + key_length
+        if position != len(data):
+            self._index.truncate(position)
+        return indexed_end, last_offset
+
+    def _is_valid_record(self, offset: Optional[int], end: int) -> bool:
+        if offset is None:
+            return True
+        try:
+            return self._read_at(offset)[1] == end
+        except (struct.error, ValueError):
+            return False
+
+    @staticmethod
+    def _encode(record: JournalRecord) -> bytes:
+        parts = [_FIXED.pack(record.timestamp, record.amount)]
+        for value in (record.transaction_id, record.status, record.message,
+                      record.customer_name, record.source, record.currency, record.reference):
+            if value is None:
+                parts.append(_STR_LEN.pack(_NULL))
+            else:
+                encoded = value.encode()
+                parts.append(_STR_LEN.pack(len(encoded)))
+                parts.append(encoded)
+        body = b"".join(parts)
+        return _HEADER.pack(len(body), zlib.crc32(body), record.kind) + body
+
+    @staticmethod
+    def _decode(kind: int, body: bytes) -> JournalRecord:
+        timestamp, amount = _FIXED.unpack_from(body, 0)
+        position = _FIXED.size
+        values = []
+        for _ in range(7):
+            (length,) = _STR_LEN.unpack_from(body, position)
+            position += _STR_LEN.size
+            if length == _NULL:
+                values.append(None)
+            else:
+                values.append(body[position:position + length].decode())
+                position += length
+        transaction_id, status, message, customer_name, source, currency, reference = values
+        return JournalRecord(
+            kind=kind,
+            timestamp=timestamp,
+            amount=amount,
+            transaction_id=transaction_id,
+            status=status or "",
+            message=message,
+            customer_name=customer_name,
+            source=source,
+            currency=currency,
+            reference=reference,
+        )
@@ -0,0 +1,211 @@
+import mmap
+import os
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+_REFUND_HEADER = b"Refund processed for transaction "
+_PAID = b" paid "
+_PAYMENT_STATUS = b"Payment status: "
+_REFUND_STATUS = b"Refund status: "
+_TRANSACTION_ID = b"Transaction ID: "
+_MESSAGE = b"Message: "
+
+
+@dataclass(frozen=True)
+class LogRecord:
+    """
+    Registro leído del archivo de texto que produce TransactionLogger.
+    Para los reembolsos customer_name y amount son None y transaction_id es la transacción reembolsada.
+    """
+    kind: str
+    status: str
+    transaction_id: Optional[str] = None
+    message: Optional[str] = None
+    customer_name: Optional[str] = None
+    amount: Optional[int] = None
+    offset: int = 0
+
+
+class TransactionLogReader:
+    """
+    Lector del registro de texto de TransactionLogger basado en mmap.
+    El archivo nunca se carga completo: los registros se recorren sobre el mapa de memoria comparando bytes
+    en el lugar, y solo se decodifican a str los registros que cumplen los filtros.
+    """
+    def __init__(self, log_path: str = "transactions.log"):
+        """
+        :param log_path: Ruta del archivo de registro a leer.
+        :type log_path: str
+        """
+        self.log_path = log_path
+        self._file = open(log_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def records(self) -> Iterator[LogRecord]:
+        """
+        Recorre todos los registros del archivo de forma perezosa.
+        :return: Un generador de LogRecord en el orden del archivo.
+        :rtype: Iterator[LogRecord]
+        """
+        return self.query()
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        min_amount: Optional[int] = None,
+        max_amount: Optional[int] = None,
+        transaction_id: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> Iterator[LogRecord]:
+        """
+        Recorre el archivo y produce solo los registros que cumplen todos los filtros indicados.
+        :param status: Estado exacto del pago o del reembolso (por ejemplo "failed").
+        :type status: Optional[str]
+        :param customer_name: Nombre exacto del cliente; excluye los reembolsos.
+        :type customer_name: Optional[str]
+        :param min_amount: Monto mínimo inclusivo; excluye los reembolsos.
+        :type min_amount: Optional[int]
+        :param max_amount: Monto máximo inclusivo; excluye los reembolsos.
+        :type max_amount: Optional[int]
+        :param transaction_id: ID exacto de la transacción.
+        :type transaction_id: Optional[str]
+        :param kind: "charge" o "refund".
+        :type kind: Optional[str]
+        :return: Un generador de LogRecord.
+        :rtype: Iterator[LogRecord]
+        """
+        if self._map is None:
+            return
+        yield from scan_records(
+            self._map,
+            status=status,
+            customer_name=customer_name,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            transaction_id=transaction_id,
+            kind=kind,
+        )
+
+    def close(self):
+        """
+        Libera el mapa de memoria y cierra el archivo.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "TransactionLogReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def scan_records(
+    data: Union[bytes, mmap.mmap],
+    status: Optional[str] = None,
+    customer_name: Optional[str] = None,
+    min_amount: Optional[int] = None,
+    max_amount: Optional[int] = None,
+    transaction_id: Optional[str] = None,
+    kind: Optional[str] = None,
+) -> Iterator[LogRecord]:
+    """
+    Recorre un buffer con el formato de TransactionLogger y produce los registros que cumplen los filtros.
+    Los filtros comparan solo los tramos necesarios de cada línea, sin decodificar las que no coinciden. No se
+    crea ningún memoryview sobre el buffer, así que el mmap puede cerrarse aunque el generador quede a medias.
+    :param data: Contenido completo del registro, como bytes o como mmap.
+    :type data: Union[bytes, mmap.mmap]
+    :return: Un generador de LogRecord.
+    :rtype: Iterator[LogRecord]
+    """
+    wanted_status = status.encode() if status is not None else None
+    wanted_name = customer_name.encode() + _PAID if customer_name is not None else None
+    wanted_id = transaction_id.encode() if transaction_id is not None else None
+    filters_amount = min_amount is not None or max_amount is not None
+    skip_refunds = kind == "charge" or wanted_name is not None or filters_amount
+    skip_charges = kind == "refund"
+
+    obj = data
+    size = len(obj)
+    position = 0
+    while position < size:
+        start = position
+        header_end, position = _line(obj, position, size)
+        is_refund = _starts_with(obj, start, header_end, _REFUND_HEADER)
+        status_start = position
+        status_end, position = _line(obj, position, size)
+        status_prefix = _REFUND_STATUS if is_refund else _PAYMENT_STATUS
+        if not _starts_with(obj, status_start, status_end, status_prefix):
+            # Línea que no abre un registro reconocible: se resincroniza en la siguiente.
+            position = status_start
+            continue
+
+        id_span = None
+        if is_refund:
+            id_span = (start + len(_REFUND_HEADER), header_end)
+        else:
+            id_start = position
+            id_end, next_position = _line(obj, position, size)
+            if _starts_with(obj, id_start, id_end, _TRANSACTION_ID):
+                id_span = (id_start + len(_TRANSACTION_ID), id_end)
+                position = next_position
+        message_start = position
+        message_end, next_position = _line(obj, position, size)
+        message_span = None
+        if _starts_with(obj, message_start, message_end, _MESSAGE):
+            message_span = (message_start + len(_MESSAGE), message_end)
+            position = next_position
+
+        if (skip_refunds and is_refund) or (skip_charges and not is_refund):
+            continue
+        status_span = (status_start + len(status_prefix), status_end)
+        if wanted_status is not None and obj[status_span[0]:status_span[1]] != wanted_status:
+            continue
+        if wanted_id is not None and (id_span is None or obj[id_span[0]:id_span[1]] != wanted_id):
+            continue
+        if wanted_name is not None and not _starts_with(obj, start, header_end, wanted_name):
+            continue
+
+        name = amount = None
+        if not is_refund:
+            paid_at = obj.rfind(_PAID, start, header_end)
+            if paid_at == -1:
+                continue
+            try:
+                amount = int(obj[paid_at + len(_PAID):header_end])
+            except ValueError:
+                continue
+            if (min_amount is not None and amount < min_amount) or (max_amount is not None and amount > max_amount):
+                continue
+            name = obj[start:paid_at].decode()
+
+        yield LogRecord(
+            kind="refund" if is_refund else "charge",
+            status=obj[status_span[0]:status_span[1]].decode(),
+            transaction_id=_decode(obj, id_span),
+            message=_decode(obj, message_span),
+            customer_name=name,
+            amount=amount,
+            offset=start,
+        )
+
+
+def _line(obj, position: int, size: int) -> tuple[int, int]:
+    end = obj.find(b"\n", position, size)
+    if end == -1:
+        return size, size
+    return end, end + 1
+
+
+def _starts_with(obj, start: int, end: int, prefix: bytes) -> bool:
+    return end - start >= len(prefix) and obj[start:start + len(prefix)] == prefix
+
+
+def _decode(obj, span: Optional[tuple[int, int]]) -> Optional[str]:
+    if span is None:
+        return None
+    return obj[span[0]:span[1]].decode()
@@ -1,11 +1,23 @@
 from ..commons import CustomerData, PaymentData, PaymentResponse
 
+from typing import Any, Iterable, Optional
+
 
 class TransactionLogger:
     """
     Clase para registrar transacciones y reembolsos en un archivo de registro.
     Esta clase proporciona métodos para registrar transacciones y reembolsos en un archivo de texto.
+    Los registros que pueden buscar un cargo por su ID ponen supports_lookup a True e implementan find_transaction.
     """
+    supports_lookup = False
+
+    def __init__(self, log_path: str = "transactions.log"):
+        """
+        :param log_path: Ruta del archivo de registro.
+        :type log_path: str
+        """
+        self.log_path = log_path
+
     def log_transaction(self,customer_data: CustomerData,payment_data: PaymentData,payment_response: PaymentResponse,):
         """
         Registra una transacción en un archivo de registro.
@@ -16,16 +28,9 @@ class TransactionLogger:
         :param payment_response: Respuesta del procesamiento del pago que incluye estado, monto, ID de transacción y mensaje.
         :type payment_response: PaymentResponse
         """
-        with open("transactions.log", "a") as log_file:
-            log_file.write(
-                f"{customer_data.name} paid {payment_data.amount}\n"
-            )
-            log_file.write(f"Payment status: {payment_response.status}\n")
-            if payment_response.transaction_id:
-                log_file.write(
-                    f"Transaction ID: {payment_response.transaction_id}\n"
-                )
-            log_file.write(f"Message: {payment_response.message}\n")
+        self._write(
+            self._format_transaction(customer_data, payment_data, payment_response)
+        )
 
     def log_refund(self, transaction_id: str, refund_response: PaymentResponse):
         """
@@ -35,9 +40,80 @@ class TransactionLogger:
         :param refund_response: Respuesta del procesamiento del reembolso que incluye estado, monto y mensaje.
         :type refund_response: PaymentResponse
         """
-        with open("transactions.log", "a") as log_file:
-            log_file.write(
-                f"Refund processed for transaction {transaction_id}\n"
-            )
-            log_file.write(f"Refund status: {refund_response.status}\n")
-            log_file.write(f"Message: {refund_response.message}\n")
\ No newline at end of file
+        self._write(self._format_refund(transaction_id, refund_response))
+
+    def log_refunds(self, refunds: Iterable[tuple[str, PaymentResponse]]):
+        """
+        Registra varios reembolsos con una única escritura en el archivo de registro.
+        :param refunds: Pares (ID de la transacción, respuesta del reembolso).
+        :type refunds: Iterable[tuple[str, PaymentResponse]]
+        """
+        text = "".join(
+            self._format_refund(transaction_id, refund_response)
+            for transaction_id, refund_response in refunds
+        )
+        if text:
+            self._write(text)
+
+    def find_transaction(self, transaction_id: str) -> Optional[Any]:
+        """
+        Recupera el cargo original de una transacción si el registro admite búsquedas.
+        El archivo de texto no tiene índice, así que aquí no se busca y se devuelve None.
+        :param transaction_id: ID de la transacción.
+        :type transaction_id: str
+        :return: El registro del cargo o None.
+        :rtype: Optional[Any]
+        """
+        return None
+
+    def log_charges(self, charges: Iterable[tuple[str, int, str, str, PaymentResponse]]):
+        """
+        Registra varios cargos con una única escritura, a partir de sus campos y sin construir los modelos.
+        :param charges: Tuplas (nombre del cliente, monto, fuente de pago, moneda, respuesta del pago).
+        :type charges: Iterable[tuple[str, int, str, str, PaymentResponse]]
+        """
+        text = "".join(
+            self._format_charge(name, amount, payment_response)
+            for name, amount, _, _, payment_response in charges
+        )
+        if text:
+            self._write(text)
+
+    def _format_transaction(self, customer_data: CustomerData, payment_data: PaymentData, payment_response: PaymentResponse) -> str:
+        """
+        Construye el bloque de texto que representa una transacción en el registro.
+        :return: Las líneas del registro, cada una terminada en salto de línea.
+        :rtype: str
+        """
+        return self._format_charge(customer_data.name, payment_data.amount, payment_response)
+
+    def _format_charge(self, name: str, amount: int, payment_response: PaymentResponse) -> str:
+        lines = [
+            f"{name} paid {amount}\n",
+            f"Payment status: {payment_response.status}\n",
+        ]
+        if payment_response.transaction_id:
+            lines.append(f"Transaction ID: {payment_response.transaction_id}\n")
+        lines.append(f"Message: {payment_response.message}\n")
+        return "".join(lines)
+
+    def _format_refund(self, transaction_id: str, refund_response: PaymentResponse) -> str:
+        """
+        Construye el bloque de texto que representa un reembolso en el registro.
+        :return: Las líneas del registro, cada una terminada en salto de línea.
+        :rtype: str
+        """
+        return (
+            f"Refund processed for transaction {transaction_id}\n"
+            f"Refund status: {refund_response.status}\n"
+            f"Message: {refund_response.message}\n"
+        )
+
+    def _write(self, text: str):
+        """
+        Escribe un bloque ya formateado en el archivo de registro con una única llamada a write.
+        :param text: Bloque de texto a añadir al final del archivo.
+        :type text: str
+        """
+        with open(self.log_path, "a") as log_file:
+            log_file.write(text)
@@ -0,0 +1,11 @@
+from .exporter import MetricsExporter
+from .histogram import LatencyHistogram
+from .registry import Counter, DEFAULT_BUCKETS, MetricsRegistry
+
+__all__ = [
+    "Counter",
+    "DEFAULT_BUCKETS",
+    "LatencyHistogram",
+    "MetricsExporter",
+    "MetricsRegistry",
+]
@@ -0,0 +1,75 @@
+from .registry import MetricsRegistry
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MetricsExporter:
+    """
+    Servidor HTTP local en un hilo de fondo que expone un MetricsRegistry.
+    GET /metrics devuelve el formato de texto de Prometheus y GET /metrics.json el snapshot en JSON.
+    """
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        """
+        :param registry: Registro de métricas a exponer.
+        :type registry: MetricsRegistry
+        :param host: Dirección donde escuchar.
+        :type host: str
+        :param port: Puerto donde escuchar; 0 elige uno libre.
+        :type port: int
+        """
+        self.registry = registry
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-exporter", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """
+        :return: Dirección y puerto en los que escucha el servidor.
+        :rtype: tuple[str, int]
+        """
+        return self._server.server_address[:2]
+
+    def close(self):
+        """
+        Detiene el servidor y su hilo.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _handler_class(self):
+        registry = self.registry
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = registry.prometheus_text().encode()
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(registry.snapshot()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return _MetricsHandler
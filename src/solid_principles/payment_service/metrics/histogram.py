@@ -0,0 +1,175 @@
+import threading
+from bisect import bisect_left
+from typing import Optional, Sequence
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias al estilo HDR: cubetas log-lineales sobre nanosegundos enteros.
+    Con precision_bits=7 el error relativo de cualquier percentil es menor del 1%, la memoria es fija
+    (unos pocos miles de contadores) y registrar un valor cuesta un cálculo de bits y un incremento.
+    Los límites indicados en bounds se cuentan además de forma exacta, para exportarlos como cubetas de Prometheus.
+    """
+    def __init__(self, precision_bits: int = 7, bounds: Sequence[float] = ()):
+        """
+        :param precision_bits: Bits significativos conservados por valor; más bits, más precisión y más cubetas.
+        :type precision_bits: int
+        :param bounds: Límites en segundos cuyos contadores acumulados se llevan sin error de cubeta.
+        :type bounds: Sequence[float]
+        """
+        if not 1 <= precision_bits <= 16:
+            raise ValueError("precision_bits must be between 1 and 16")
+        self.precision_bits = precision_bits
+        self.bounds = tuple(sorted(bounds))
+        self._bound_counts = [0] * len(self.bounds)
+        self._sub_bucket_count = 1 << precision_bits
+        self._half = self._sub_bucket_count >> 1
+        self._counts = [0] * ((64 - precision_bits + 2) * self._half + self._half)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        """
+        Registra una latencia.
+        :param seconds: Duración en segundos; los valores negativos se cuentan como cero.
+        :type seconds: float
+        """
+        nanoseconds = max(0, int(seconds * 1e9))
+        index = self._index(nanoseconds)
+        position = bisect_left(self.bounds, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            if position < len(self._bound_counts):
+                self._bound_counts[position] += 1
+            self.count += 1
+            self.total += seconds
+            if self.min is None or seconds < self.min:
+                self.min = seconds
+            if self.max is None or seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """
+        :param percent: Percentil entre 0 y 100.
+        :type percent: float
+        :return: El mayor valor equivalente de la cubeta que contiene el percentil, en segundos (0.0 si está vacío).
+        :rtype: float
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = max(1, -(-self.count * percent // 100))
+            seen = 0
+            for index, bucket_count in enumerate(self._counts):
+                seen += bucket_count
+                if seen >= target:
+                    return min(self._highest_equivalent(index) / 1e9, self.max)
+        return self.max
+
+    def bucket_counts(self, bounds: list[float]) -> list[int]:
+        """
+        Cuenta acumulada de registros menores o iguales que cada límite, como en los histogramas de Prometheus.
+        Si bounds coincide con los límites del constructor la cuenta es exacta; con otros límites se suman solo
+        las cubetas que caen enteras por debajo de cada uno, así que nunca se cuenta un valor mayor que el límite.
+        :param bounds: Límites superiores en segundos, en orden creciente.
+        :type bounds: list[float]
+        :return: Un contador acumulado por límite.
+        :rtype: list[int]
+        """
+        if tuple(bounds) == self.bounds:
+            with self._lock:
+                seen = 0
+                result = []
+                for bucket_count in self._bound_counts:
+                    seen += bucket_count
+                    result.append(seen)
+            return result
+        limits = []
+        for bound in bounds:
+            nanoseconds = max(0, int(bound * 1e9))
+            limit = self._index(nanoseconds)
+            if self._highest_equivalent(limit) > nanoseconds:
+                limit -= 1
+            limits.append(limit)
+        result = []
+        with self._lock:
+            seen = 0
+            start = 0
+            for limit in limits:
+                seen += sum(self._counts[start:limit + 1])
+                start = max(start, limit + 1)
+                result.append(seen)
+        return result
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Suma en este histograma los registros de otro con la misma precisión.
+        :param other: Histograma a sumar.
+        :type other: LatencyHistogram
+        """
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different bounds")
+        with other._lock:
+            counts = list(other._counts)
+            bound_counts = list(other._bound_counts)
+            count, total, low, high = other.count, other.total, other.min, other.max
+        with self._lock:
+            for index, bucket_count in enumerate(counts):
+                if bucket_count:
+                    self._counts[index] += bucket_count
+            for position, bucket_count in enumerate(bound_counts):
+                self._bound_counts[position] += bucket_count
+            self.count += count
+            self.total += total
+            if low is not None and (self.min is None or low < self.min):
+                self.min = low
+            if high is not None and (self.max is None or high > self.max):
+                self.max = high
+
+    def reset(self):
+        """
+        Descarta todos los registros.
+        """
+        with self._lock:
+            self._counts = [0] * len(self._counts)
+            self._bound_counts = [0] * len(self._bound_counts)
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+
+    def snapshot(self) -> dict[str, float]:
+        """
+        :return: Número de registros, suma, media, mínimo, máximo y percentiles 50, 90, 99 y 99.9 en segundos.
+        :rtype: dict[str, float]
+        """
+        count = self.count
+        return {
+            "count": count,
+            "sum": self.total,
+            "mean": self.total / count if count else 0.0,
+            "min": self.min or 0.0,
+            "max": self.max or 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.precision_bits
+        return shift * self._half + (value >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self._sub_bucket_count:
+            return index
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        return ((mantissa + 1) << shift) - 1
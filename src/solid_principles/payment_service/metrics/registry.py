@@ -0,0 +1,165 @@
+from .histogram import LatencyHistogram
+
+import threading
+import time
+from typing import Optional
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_LabelKey = tuple[tuple[str, str], ...]
+
+
+class Counter:
+    """
+    Contador monótono seguro entre hilos.
+    """
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        """
+        :param amount: Cantidad a sumar.
+        :type amount: int
+        """
+        with self._lock:
+            self.value += amount
+
+
+class _Timer:
+    """
+    Context manager que registra en un histograma el tiempo transcurrido dentro del bloque.
+    """
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.record(time.perf_counter() - self.start)
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas en memoria: contadores e histogramas de latencia identificados por nombre y etiquetas.
+    Se consulta con snapshot() (API de lectura) o con prometheus_text() (formato de exposición de Prometheus).
+    """
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        :param buckets: Límites en segundos de las cubetas exportadas a Prometheus para los histogramas.
+        :type buckets: tuple[float, ...]
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counters: dict[tuple[str, _LabelKey], Counter] = {}
+        self._histograms: dict[tuple[str, _LabelKey], LatencyHistogram] = {}
+        self._help: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, text: str):
+        """
+        Asocia un texto de ayuda (línea HELP de Prometheus) a una métrica.
+        :param name: Nombre de la métrica.
+        :type name: str
+        :param text: Descripción.
+        :type text: str
+        """
+        self._help[name] = text
+
+    def counter(self, name: str, **labels: str) -> Counter:
+        """
+        :param name: Nombre de la métrica.
+        :type name: str
+        :return: El contador con ese nombre y etiquetas, creándolo si no existe.
+        :rtype: Counter
+        """
+        key = (name, tuple(sorted(labels.items())))
+        counter = self._counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(key, Counter())
+        return counter
+
+    def histogram(self, name: str, **labels: str) -> LatencyHistogram:
+        """
+        :param name: Nombre de la métrica.
+        :type name: str
+        :return: El histograma con ese nombre y etiquetas, creándolo si no existe.
+        :rtype: LatencyHistogram
+        """
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram(bounds=self.buckets))
+        return histogram
+
+    def timer(self, name: str, **labels: str) -> _Timer:
+        """
+        :param name: Nombre del histograma donde se registra la duración.
+        :type name: str
+        :return: Un context manager que mide el bloque que envuelve.
+        :rtype: _Timer
+        """
+        return _Timer(self.histogram(name, **labels))
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        """
+        :return: Por nombre de métrica, una entrada por combinación de etiquetas con su valor o el resumen del histograma.
+        :rtype: dict[str, list[dict]]
+        """
+        with self._lock:
+            counters = list(self._counters.items())
+            histograms = list(self._histograms.items())
+        result: dict[str, list[dict]] = {}
+        for (name, labels), counter in counters:
+            result.setdefault(name, []).append({"labels": dict(labels), "value": counter.value})
+        for (name, labels), histogram in histograms:
+            result.setdefault(name, []).append({"labels": dict(labels), **histogram.snapshot()})
+        return result
+
+    def prometheus_text(self) -> str:
+        """
+        :return: Todas las métricas en el formato de texto de exposición de Prometheus (versión 0.0.4).
+        :rtype: str
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda entry: entry[0])
+        lines: list[str] = []
+        last_name: Optional[str] = None
+        for (name, labels), counter in counters:
+            if name != last_name:
+                self._header(lines, name, "counter")
+                last_name = name
+            lines.append(f"{name}{_format_labels(labels)} {counter.value}")
+        for (name, labels), histogram in histograms:
+            if name != last_name:
+                self._header(lines, name, "histogram")
+                last_name = name
+            for bound, count in zip(self.buckets, histogram.bucket_counts(list(self.buckets))):
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {count}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: list[str], name: str, kind: str):
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _format_labels(labels: _LabelKey) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,9 +1,23 @@
+from .async_notifier import AsyncNotifierProtocol
 from .notifier import NotifierProtocol
 from .email import EmailNotifier
+from .notification_outbox import DeadLetter, NotificationOutbox, OutboxStats
 from .sms import SMSNotifier
+from .sms_scheduler import SMSDeadLetter, SMSGatewayConfig, SMSScheduler
+from .smtp_transport import SMTPTransport
+from .sync_to_async_notifier import SyncToAsyncNotifier
 
 __all__ = [
+    "AsyncNotifierProtocol",
+    "DeadLetter",
     "NotifierProtocol",
     "EmailNotifier",
+    "NotificationOutbox",
+    "OutboxStats",
+    "SMSDeadLetter",
+    "SMSGatewayConfig",
     "SMSNotifier",
+    "SMSScheduler",
+    "SMTPTransport",
+    "SyncToAsyncNotifier",
 ]
\ No newline at end of file
@@ -0,0 +1,18 @@
+from typing import Protocol
+from ..commons import CustomerData
+
+class AsyncNotifierProtocol(Protocol):
+    """
+    Protocolo asíncrono para notificar al cliente sobre el estado de la transacción.
+
+    Es la contraparte de NotifierProtocol para ser usada desde un event loop de asyncio.
+    La implementacion deberá proporcionar una corrutina 'send_confirmation' que no bloquee el loop.
+    """
+    async def send_confirmation(self, customer_data: CustomerData):
+        """
+        Envía una notificación de confirmación al cliente de forma asíncrona.
+
+        :param customer_data: Datos del cliente que incluyen información de contacto.
+        :type customer_data: CustomerData
+        """
+        ...
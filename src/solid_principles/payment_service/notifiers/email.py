@@ -1,9 +1,24 @@
 from ..commons import CustomerData
 from .notifier import NotifierProtocol
+from .smtp_transport import SMTPTransport
 
+from dataclasses import dataclass
+from email.mime.text import MIMEText
+from typing import Iterable, Optional
+
+
+@dataclass
 class EmailNotifier(NotifierProtocol):
+    transport: Optional[SMTPTransport] = None
+    sender: str = "no-reply@example.com"
+    """
+    Notificador de correo electrónico que envía confirmaciones de compra al cliente.
+    :param transport: Transporte SMTP persistente; si es None el mensaje solo se construye y se informa por consola.
+    :type transport: Optional[SMTPTransport]
+    :param sender: Dirección del remitente.
+    :type sender: str
+    """
     def send_confirmation(self, customer_data: CustomerData):
-        from email.mime.text import MIMEText
         """
         Envía una notificación de confirmación por correo electrónico al cliente.
         :param customer_data: Datos del cliente que incluyen información de contacto.
@@ -14,9 +29,39 @@ class EmailNotifier(NotifierProtocol):
         if not customer_data.contact_info.email:
             raise ValueError("Email address is requiered to send an email")
 
+        msg = self._build_message(customer_data.contact_info.email)
+        if self.transport is not None:
+            self.transport.send(msg)
+
+        print(f"Email enviado a {customer_data.contact_info.email}")
+
+    def send_batch(self, customers: Iterable[CustomerData]) -> list[Optional[str]]:
+        """
+        Envía las confirmaciones de un lote de clientes reutilizando una única sesión SMTP.
+        :param customers: Datos de los clientes a notificar.
+        :type customers: Iterable[CustomerData]
+        :return: Por cada cliente, None si se entregó o el texto del error.
+        :rtype: list[Optional[str]]
+        """
+        errors: list[Optional[str]] = []
+        messages = []
+        positions = []
+        for customer_data in customers:
+            if not customer_data.contact_info.email:
+                errors.append("Email address is requiered to send an email")
+                continue
+            positions.append(len(errors))
+            errors.append(None)
+            messages.append(self._build_message(customer_data.contact_info.email))
+        if self.transport is not None and messages:
+            for position, error in zip(positions, self.transport.send_many(messages)):
+                errors[position] = error
+        print(f"Lote de emails enviado: {errors.count(None)} de {len(errors)}")
+        return errors
+
+    def _build_message(self, recipient: str) -> MIMEText:
         msg = MIMEText("Gracias por su compra.")
         msg["Subject"] = "Confirmación de compra"
-        msg["From"] = "no-reply@example.com"
-        msg["To"] = customer_data.contact_info.email or ""
-
-        print(f"Email enviado a {customer_data.contact_info.email}")
\ No newline at end of file
+        msg["From"] = self.sender
+        msg["To"] = recipient
+        return msg
@@ -0,0 +1,238 @@
+from ..commons import CustomerData
+from .notifier import NotifierProtocol
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+CLOSED_BEFORE_DELIVERY = "Outbox closed before delivery"
+
+
+@dataclass
+class DeadLetter:
+    """
+    Notificación descartada tras agotar sus reintentos o fallar con un error permanente.
+    """
+    customer_data: CustomerData
+    error: str
+    attempts: int
+
+
+@dataclass(frozen=True)
+class OutboxStats:
+    """
+    Instantánea del estado de la bandeja de salida.
+    """
+    queue_depth: int
+    retry_depth: int
+    in_flight: int
+    sent: int
+    retried: int
+    dead_lettered: int
+    drain_rate: float
+
+
+class NotificationOutbox(NotifierProtocol):
+    """
+    Bandeja de salida de notificaciones que desacopla el envío del camino crítico del pago.
+    send_confirmation solo encola la confirmación y retorna; un pool de hilos la entrega al notificador real
+    (EmailNotifier, SMSNotifier...) con reintentos y backoff exponencial. Las que no se pueden entregar
+    terminan en la lista dead_letters. Como implementa NotifierProtocol, se inyecta en PaymentService sin cambios.
+    """
+    def __init__(
+        self,
+        notifier: NotifierProtocol,
+        workers: int = 4,
+        max_queue_size: int = 10_000,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        permanent_errors: tuple[type[BaseException], ...] = (ValueError,),
+    ):
+        """
+        :param notifier: Notificador que realmente envía las confirmaciones.
+        :type notifier: NotifierProtocol
+        :param workers: Número de hilos que vacían la cola.
+        :type workers: int
+        :param max_queue_size: Capacidad de la cola; si se llena, send_confirmation espera (contrapresión).
+        :type max_queue_size: int
+        :param max_attempts: Intentos máximos por notificación antes de moverla a dead_letters.
+        :type max_attempts: int
+        :param backoff_base: Espera en segundos antes del primer reintento; se duplica en cada intento.
+        :type backoff_base: float
+        :param backoff_max: Espera máxima entre reintentos.
+        :type backoff_max: float
+        :param permanent_errors: Excepciones que no tiene sentido reintentar (por ejemplo, falta el email).
+        :type permanent_errors: tuple[type[BaseException], ...]
+        """
+        self.notifier = notifier
+        self.max_queue_size = max_queue_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.permanent_errors = permanent_errors
+        self.dead_letters: list[DeadLetter] = []
+        self._pending: deque[tuple[CustomerData, int]] = deque()
+        self._retries: list[tuple[float, int, CustomerData, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._sent = 0
+        self._retried = 0
+        self._deliveries: deque[float] = deque(maxlen=1000)
+        self._closing = False
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f"notification-outbox-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def send_confirmation(self, customer_data: CustomerData):
+        """
+        Encola la confirmación para enviarla en segundo plano y retorna de inmediato.
+        :param customer_data: Datos del cliente que incluyen información de contacto.
+        :type customer_data: CustomerData
+        """
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("NotificationOutbox is closed")
+            while len(self._pending) >= self.max_queue_size:
+                self._condition.wait()
+            self._pending.append((customer_data, 0))
+            self._condition.notify_all()
+
+    def stats(self) -> OutboxStats:
+        """
+        Devuelve la profundidad de la cola y el ritmo de entrega (notificaciones por segundo recientes).
+        :return: Una instantánea del estado de la bandeja de salida.
+        :rtype: OutboxStats
+        """
+        with self._condition:
+            drain_rate = 0.0
+            if len(self._deliveries) > 1:
+                elapsed = self._deliveries[-1] - self._deliveries[0]
+                if elapsed > 0:
+                    drain_rate = (len(self._deliveries) - 1) / elapsed
+            return OutboxStats(
+                queue_depth=len(self._pending),
+                retry_depth=len(self._retries),
+                in_flight=self._in_flight,
+                sent=self._sent,
+                retried=self._retried,
+                dead_lettered=len(self.dead_letters),
+                drain_rate=drain_rate,
+            )
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que se vacíen la cola, los reintentos programados y los envíos en curso.
+        :param timeout: Segundos máximos de espera; None para esperar indefinidamente.
+        :type timeout: Optional[float]
+        :return: True si la bandeja quedó vacía antes del timeout.
+        :rtype: bool
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._retries and not self._in_flight, timeout
+            )
+
+    def close(self, timeout: Optional[float] = None) -> list[DeadLetter]:
+        """
+        Deja de aceptar confirmaciones, espera a que se entreguen las pendientes y detiene los hilos.
+        Si vence el timeout, las confirmaciones que siguen en la cola o esperando reintento pasan a dead_letters
+        y se devuelven; las que estaban enviándose terminan en dead_letters si fallan. La espera por los hilos
+        también se limita al tiempo que quede del timeout.
+        :param timeout: Segundos máximos de espera para vaciar la bandeja y detener los hilos.
+        :type timeout: Optional[float]
+        :return: Las confirmaciones que no se llegaron a entregar por el cierre.
+        :rtype: list[DeadLetter]
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._closing = True
+        self.join(timeout)
+        with self._condition:
+            abandoned = [
+                DeadLetter(customer_data, CLOSED_BEFORE_DELIVERY, attempts)
+                for customer_data, attempts in self._pending
+            ]
+            abandoned += [
+                DeadLetter(customer_data, CLOSED_BEFORE_DELIVERY, attempts)
+                for _, _, customer_data, attempts in sorted(self._retries)
+            ]
+            self.dead_letters.extend(abandoned)
+            self._pending.clear()
+            self._retries.clear()
+            self._closed = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return abandoned
+
+    def _work(self):
+        while True:
+            item = self._next_item()
+            if item is None:
+                return
+            customer_data, attempts = item
+            attempts += 1
+            try:
+                self.notifier.send_confirmation(customer_data)
+            except self.permanent_errors as e:
+                self._finish(dead_letter=DeadLetter(customer_data, str(e), attempts))
+            except Exception as e:
+                if attempts >= self.max_attempts:
+                    self._finish(dead_letter=DeadLetter(customer_data, str(e), attempts))
+                else:
+                    self._finish(retry=(customer_data, attempts))
+            else:
+                self._finish()
+
+    def _next_item(self) -> Optional[tuple[CustomerData, int]]:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._retries and self._retries[0][0] <= now:
+                    _, _, customer_data, attempts = heapq.heappop(self._retries)
+                    self._in_flight += 1
+                    return customer_data, attempts
+                if self._pending:
+                    item = self._pending.popleft()
+                    self._in_flight += 1
+                    self._condition.notify_all()
+                    return item
+                if self._closing and not self._retries and not self._in_flight:
+                    return None
+                timeout = self._retries[0][0] - now if self._retries else None
+                self._condition.wait(timeout)
+
+    def _finish(
+        self,
+        dead_letter: Optional[DeadLetter] = None,
+        retry: Optional[tuple[CustomerData, int]] = None,
+    ):
+        with self._condition:
+            self._in_flight -= 1
+            if dead_letter is None and retry is not None and self._closed:
+                customer_data, attempts = retry
+                dead_letter = DeadLetter(customer_data, CLOSED_BEFORE_DELIVERY, attempts)
+            if dead_letter is not None:
+                self.dead_letters.append(dead_letter)
+            elif retry is not None:
+                customer_data, attempts = retry
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+                heapq.heappush(
+                    self._retries,
+                    (time.monotonic() + delay, next(self._sequence), customer_data, attempts),
+                )
+                self._retried += 1
+            else:
+                self._sent += 1
+                self._deliveries.append(time.monotonic())
+            self._condition.notify_all()
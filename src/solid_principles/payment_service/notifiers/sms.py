@@ -24,4 +24,16 @@ class SMSNotifier(NotifierProtocol):
             return
         print(
             f"SMS enviado usando la puerta de enlace {self.gateway} al número {phone_number}: Gracias por su compra."
+        )
+
+    def send_bulk(self, phone_numbers: list[str]):
+        """
+        Envía la misma confirmación a varios números en una única petición a la puerta de enlace.
+        :param phone_numbers: Números de teléfono de destino.
+        :type phone_numbers: list[str]
+        """
+        if not phone_numbers:
+            return
+        print(
+            f"SMS masivo enviado usando la puerta de enlace {self.gateway} a {len(phone_numbers)} números: Gracias por su compra."
         )
\ No newline at end of file
@@ -0,0 +1,219 @@
+from ..commons import CustomerData
+from ..rate_limiter import TokenBucket
+from .notifier import NotifierProtocol
+from .sms import SMSNotifier
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class _SMSMessage:
+    phone_number: str
+    attempts: int = 0
+
+
+@dataclass(frozen=True)
+class SMSDeadLetter:
+    """
+    SMS descartado tras agotar sus reintentos o por cerrar el planificador antes de poder enviarlo.
+    """
+    phone_number: str
+    error: str
+    attempts: int
+
+
+@dataclass
+class SMSGatewayConfig:
+    notifier: SMSNotifier
+    rate_per_second: float
+    burst: int
+    max_batch_size: int = 100
+    """
+    Configuración de una puerta de enlace SMS dentro del planificador.
+    :param notifier: Notificador SMS que habla con la puerta de enlace.
+    :type notifier: SMSNotifier
+    :param rate_per_second: Mensajes por segundo que admite la puerta de enlace.
+    :type rate_per_second: float
+    :param burst: Mensajes que admite en ráfaga.
+    :type burst: int
+    :param max_batch_size: Máximo de mensajes por petición masiva.
+    :type max_batch_size: int
+    """
+    bucket: TokenBucket = field(init=False, repr=False)
+    sent: int = field(default=0, init=False)
+    failures: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self.bucket = TokenBucket(self.rate_per_second, self.burst)
+
+
+class SMSScheduler(NotifierProtocol):
+    """
+    Planificador de SMS consciente de los límites de cada puerta de enlace.
+    send_confirmation solo encola el número; un hilo de fondo agrupa los pendientes en peticiones masivas
+    y las reparte entre las puertas de enlace configuradas según los tokens que cada una tiene disponibles,
+    de modo que nunca se envía por encima del límite y las ráfagas se suavizan en lugar de rechazarse.
+    Un lote fallido no se reintenta de inmediato: cada mensaje espera con retroceso exponencial y, tras
+    max_attempts intentos, pasa a dead_letters.
+    """
+    def __init__(
+        self,
+        gateways: list[SMSGatewayConfig],
+        linger: float = 0.05,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        """
+        :param gateways: Puertas de enlace disponibles con sus límites.
+        :type gateways: list[SMSGatewayConfig]
+        :param linger: Segundos que se espera a acumular un lote completo antes de enviar uno parcial.
+        :type linger: float
+        :param max_attempts: Intentos de envío por mensaje antes de descartarlo.
+        :type max_attempts: int
+        :param backoff_base: Espera en segundos tras el primer fallo de un mensaje; se duplica en cada fallo.
+        :type backoff_base: float
+        :param backoff_max: Espera máxima en segundos entre intentos de un mensaje.
+        :type backoff_max: float
+        """
+        if not gateways:
+            raise ValueError("At least one SMS gateway is required")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.gateways = gateways
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.dead_letters: list[SMSDeadLetter] = []
+        self._pending: deque[_SMSMessage] = deque()
+        self._retries: list[tuple[float, int, _SMSMessage]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closing = False
+        self._abandoned = False
+        self._thread = threading.Thread(target=self._run, name="sms-scheduler", daemon=True)
+        self._thread.start()
+
+    def send_confirmation(self, customer_data: CustomerData):
+        """
+        Encola la confirmación por SMS del cliente.
+        :param customer_data: Datos del cliente que incluyen información de contacto.
+        :type customer_data: CustomerData
+        """
+        phone_number = customer_data.contact_info.phone
+        if not phone_number:
+            print("datos del cliente invalidos: falta información de contacto")
+            return
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("SMSScheduler is closed")
+            self._pending.append(_SMSMessage(phone_number))
+            self._condition.notify()
+
+    def pending(self) -> int:
+        """
+        :return: Número de SMS que esperan ser enviados, incluidos los que esperan un reintento.
+        :rtype: int
+        """
+        with self._condition:
+            return len(self._pending) + len(self._retries)
+
+    def close(self, timeout: Optional[float] = 30.0):
+        """
+        Envía los SMS pendientes respetando los límites y detiene el hilo de fondo.
+        Si no termina en 'timeout' segundos, los SMS que queden pasan a dead_letters sin enviarse.
+        :param timeout: Segundos máximos de vaciado; None espera sin límite.
+        :type timeout: Optional[float]
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            return
+        with self._condition:
+            self._abandoned = True
+            remaining = list(self._pending) + [message for _, _, message in self._retries]
+            self._pending.clear()
+            self._retries.clear()
+            for message in remaining:
+                self.dead_letters.append(
+                    SMSDeadLetter(message.phone_number, "SMSScheduler closed before delivery", message.attempts)
+                )
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    self._promote_due_retries()
+                    if self._abandoned or (self._closing and not self._pending and not self._retries):
+                        return
+                    if self._pending:
+                        break
+                    timeout = self._retries[0][0] - time.monotonic() if self._retries else None
+                    self._condition.wait(timeout)
+                largest_batch = max(gateway.max_batch_size for gateway in self.gateways)
+                if len(self._pending) < largest_batch and not self._closing:
+                    self._condition.wait(self.linger)
+                    self._promote_due_retries()
+            gateway, size, wait = self._pick_gateway()
+            if wait > 0:
+                time.sleep(wait)
+            self._dispatch(gateway, size)
+
+    def _promote_due_retries(self):
+        now = time.monotonic()
+        while self._retries and self._retries[0][0] <= now:
+            self._pending.append(heapq.heappop(self._retries)[2])
+
+    def _pick_gateway(self) -> tuple[SMSGatewayConfig, int, float]:
+        """
+        Elige la puerta de enlace que antes podrá aceptar un lote completo de los SMS pendientes.
+        Esperar a tener tokens para un lote completo evita gastar peticiones en lotes de un solo mensaje.
+        :return: La puerta de enlace, el tamaño del lote y los segundos que hay que esperar por sus tokens.
+        :rtype: tuple[SMSGatewayConfig, int, float]
+        """
+        with self._condition:
+            pending = max(1, len(self._pending))
+        choices = []
+        for gateway in self.gateways:
+            size = min(pending, gateway.max_batch_size, gateway.burst)
+            choices.append((gateway.bucket.wait_time(size), -size, gateway))
+        wait, negative_size, gateway = min(choices, key=lambda choice: choice[:2])
+        return gateway, -negative_size, wait
+
+    def _dispatch(self, gateway: SMSGatewayConfig, size: int):
+        if not gateway.bucket.try_acquire(size):
+            return
+        with self._condition:
+            batch = [self._pending.popleft() for _ in range(min(size, len(self._pending)))]
+        if not batch:
+            return
+        try:
+            gateway.notifier.send_bulk([message.phone_number for message in batch])
+        except Exception as e:
+            print(f"Error enviando SMS por la puerta de enlace {gateway.notifier.gateway}: {e}")
+            gateway.failures += 1
+            self._schedule_retries(batch, str(e))
+        else:
+            gateway.sent += len(batch)
+
+    def _schedule_retries(self, batch: list[_SMSMessage], error: str):
+        retry_at = time.monotonic()
+        with self._condition:
+            for message in batch:
+                message.attempts += 1
+                if message.attempts >= self.max_attempts or self._abandoned:
+                    self.dead_letters.append(SMSDeadLetter(message.phone_number, error, message.attempts))
+                    continue
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (message.attempts - 1))
+                heapq.heappush(self._retries, (retry_at + delay, next(self._sequence), message))
@@ -0,0 +1,120 @@
+import smtplib
+import threading
+from email.message import Message
+from typing import Iterable, Optional
+
+
+class SMTPTransport:
+    """
+    Transporte SMTP que mantiene abierta una sesión persistente y la reutiliza para muchos mensajes.
+    Si el servidor cierra la conexión se reconecta y reintenta el mensaje una vez; la sesión se renueva
+    cada 'max_messages_per_session' mensajes para respetar los límites habituales de los servidores.
+    """
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 25,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        timeout: float = 10.0,
+        max_messages_per_session: int = 1000,
+    ):
+        """
+        :param host: Servidor SMTP.
+        :type host: str
+        :param port: Puerto del servidor SMTP.
+        :type port: int
+        :param username: Usuario para autenticarse; None si el servidor no requiere autenticación.
+        :type username: Optional[str]
+        :param password: Contraseña del usuario.
+        :type password: Optional[str]
+        :param use_tls: Si es True se negocia STARTTLS al abrir la sesión.
+        :type use_tls: bool
+        :param timeout: Segundos máximos de espera por operación de red.
+        :type timeout: float
+        :param max_messages_per_session: Mensajes tras los que se cierra y reabre la sesión.
+        :type max_messages_per_session: int
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.max_messages_per_session = max_messages_per_session
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._sent_in_session = 0
+        self._lock = threading.Lock()
+
+    def send(self, message: Message):
+        """
+        Envía un mensaje usando la sesión persistente.
+        :param message: Mensaje con las cabeceras From y To ya establecidas.
+        :type message: Message
+        :raises smtplib.SMTPException: Si el servidor rechaza el mensaje.
+        """
+        with self._lock:
+            self._send(message)
+
+    def send_many(self, messages: Iterable[Message]) -> list[Optional[str]]:
+        """
+        Envía un lote de mensajes por la misma sesión sin detenerse ante fallos individuales.
+        :param messages: Mensajes con las cabeceras From y To ya establecidas.
+        :type messages: Iterable[Message]
+        :return: Por cada mensaje, None si se entregó o el texto del error.
+        :rtype: list[Optional[str]]
+        """
+        errors: list[Optional[str]] = []
+        with self._lock:
+            for message in messages:
+                try:
+                    self._send(message)
+                except (smtplib.SMTPException, OSError) as e:
+                    errors.append(str(e))
+                else:
+                    errors.append(None)
+        return errors
+
+    def close(self):
+        """
+        Cierra la sesión SMTP si está abierta.
+        """
+        with self._lock:
+            self._disconnect()
+
+    def __enter__(self) -> "SMTPTransport":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _send(self, message: Message):
+        if self._sent_in_session >= self.max_messages_per_session:
+            self._disconnect()
+        try:
+            self._session().send_message(message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self._disconnect()
+            self._session().send_message(message)
+        self._sent_in_session += 1
+
+    def _session(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            self._smtp = smtp
+            self._sent_in_session = 0
+        return self._smtp
+
+    def _disconnect(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
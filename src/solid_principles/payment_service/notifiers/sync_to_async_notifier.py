@@ -0,0 +1,23 @@
+from ..commons import CustomerData
+from .async_notifier import AsyncNotifierProtocol
+from .notifier import NotifierProtocol
+
+import asyncio
+from dataclasses import dataclass
+
+
+@dataclass
+class SyncToAsyncNotifier(AsyncNotifierProtocol):
+    notifier: NotifierProtocol
+    """
+    Puente que expone un notificador síncrono (EmailNotifier, SMSNotifier) como notificador asíncrono.
+    :param notifier: El notificador síncrono que realmente envía la confirmación.
+    :type notifier: NotifierProtocol
+    """
+    async def send_confirmation(self, customer_data: CustomerData):
+        """
+        Envía la confirmación en un hilo auxiliar para no bloquear el event loop.
+        :param customer_data: Datos del cliente que incluyen información de contacto.
+        :type customer_data: CustomerData
+        """
+        await asyncio.to_thread(self.notifier.send_confirmation, customer_data)
@@ -0,0 +1,222 @@
+from .commons import BatchItemResult, CustomerData, PaymentData, PaymentResponse
+from .metrics import LatencyHistogram
+from .services import PaymentService
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+_STOP = object()
+
+
+@dataclass
+class _PipelineItem:
+    sequence: int
+    customer_data: CustomerData
+    payment_data: PaymentData
+    future: Future = field(default_factory=Future)
+    response: Optional[PaymentResponse] = None
+    error: Optional[Exception] = None
+
+
+class _Stage:
+    """
+    Etapa del pipeline: una cola acotada y un grupo de hilos que aplican el mismo paso a cada elemento.
+    Cuando la cola está llena, put bloquea a la etapa anterior (contrapresión).
+    """
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[_PipelineItem], None],
+        workers: int,
+        queue_size: int,
+        next_stage: Optional["_Stage"],
+        skip_failed: bool = True,
+    ):
+        if workers < 1 or queue_size < 1:
+            raise ValueError(f"Stage {name} needs at least one worker and a queue of size >= 1")
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.next_stage = next_stage
+        self.skip_failed = skip_failed
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.histogram = LatencyHistogram()
+        self._alive = workers
+        self._alive_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"pipeline-{name}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, item):
+        self.queue.put(item)
+
+    def stop(self):
+        for _ in range(self.workers):
+            self.queue.put(_STOP)
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+            if item.error is None or not self.skip_failed:
+                start = time.perf_counter()
+                try:
+                    self.handler(item)
+                except Exception as e:
+                    item.error = e
+                self.histogram.record(time.perf_counter() - start)
+            if self.next_stage is not None:
+                self.next_stage.put(item)
+        with self._alive_lock:
+            self._alive -= 1
+            last = self._alive == 0
+        if last and self.next_stage is not None:
+            self.next_stage.stop()
+
+
+class PipelinedPaymentService:
+    """
+    Modo de ejecución en pipeline para PaymentService.
+    Cada pago pasa por las etapas validar → cobrar → notificar → registrar, y cada etapa tiene su propia cola
+    acotada y su propio grupo de hilos, de modo que el registro de un pago se solapa con el cobro de otro y la
+    validación de un tercero. El log se escribe siempre en el orden en que se enviaron los pagos gracias a un
+    buffer de reordenación en la última etapa.
+    """
+    def __init__(
+        self,
+        service: PaymentService,
+        validate_workers: int = 1,
+        charge_workers: int = 8,
+        notify_workers: int = 4,
+        queue_size: int = 256,
+    ):
+        """
+        :param service: Servicio cuyos validadores, procesador, notificador y logger se usan en cada etapa.
+        :type service: PaymentService
+        :param validate_workers: Hilos de la etapa de validación.
+        :type validate_workers: int
+        :param charge_workers: Hilos de la etapa de cobro (llamadas al procesador).
+        :type charge_workers: int
+        :param notify_workers: Hilos de la etapa de notificación.
+        :type notify_workers: int
+        :param queue_size: Capacidad de la cola de cada etapa; al llenarse, submit bloquea.
+        :type queue_size: int
+        """
+        self.service = service
+        self._sequence = 0
+        self._sequence_lock = threading.Lock()
+        self._reorder: dict[int, _PipelineItem] = {}
+        self._next_to_log = 0
+        self._closed = False
+        log = _Stage("log", self._log_in_order, 1, queue_size, None, skip_failed=False)
+        notify = _Stage("notify", self._notify, notify_workers, queue_size, log)
+        charge = _Stage("charge", self._charge, charge_workers, queue_size, notify)
+        validate = _Stage("validate", self._validate, validate_workers, queue_size, charge)
+        self._stages = [validate, charge, notify, log]
+
+    def submit(self, customer_data: CustomerData, payment_data: PaymentData) -> Future:
+        """
+        Envía un pago al pipeline; bloquea si la cola de validación está llena.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: Un Future que se resuelve con el PaymentResponse una vez registrado, o con la excepción de la etapa que falló.
+        :rtype: Future
+        """
+        with self._sequence_lock:
+            if self._closed:
+                raise RuntimeError("Pipeline is closed")
+            item = _PipelineItem(self._sequence, customer_data, payment_data)
+            self._sequence += 1
+            self._stages[0].put(item)
+        return item.future
+
+    def process_many(self, items: Iterable[tuple[CustomerData, PaymentData]]) -> list[BatchItemResult]:
+        """
+        Envía todos los pagos al pipeline y espera sus resultados.
+        :param items: Pares (CustomerData, PaymentData) a procesar.
+        :type items: Iterable[tuple[CustomerData, PaymentData]]
+        :return: Un BatchItemResult por pago, en el mismo orden de entrada.
+        :rtype: list[BatchItemResult]
+        """
+        futures = [self.submit(customer_data, payment_data) for customer_data, payment_data in items]
+        results = []
+        for index, future in enumerate(futures):
+            error = future.exception()
+            if error is None:
+                results.append(BatchItemResult(index=index, response=future.result()))
+            else:
+                results.append(BatchItemResult(index=index, error=str(error)))
+        return results
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        :return: Por etapa, la profundidad actual de su cola, sus hilos y el resumen de su histograma de latencias.
+        :rtype: dict[str, dict[str, float]]
+        """
+        return {
+            stage.name: {
+                "queue_depth": stage.queue.qsize(),
+                "workers": stage.workers,
+                **stage.histogram.snapshot(),
+            }
+            for stage in self._stages
+        }
+
+    def close(self):
+        """
+        Termina de procesar los pagos ya enviados y detiene todos los hilos.
+        """
+        with self._sequence_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._stages[0].stop()
+        for stage in self._stages:
+            stage.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _validate(self, item: _PipelineItem):
+        self.service.customer_validator.validate(item.customer_data)
+        self.service.payment_validator.validate(item.payment_data)
+
+    def _charge(self, item: _PipelineItem):
+        item.response = self.service.payment_processor.process_transaction(
+            item.customer_data, item.payment_data
+        )
+
+    def _notify(self, item: _PipelineItem):
+        self.service.notifier.send_confirmation(item.customer_data)
+
+    def _log_in_order(self, item: _PipelineItem):
+        self._reorder[item.sequence] = item
+        while self._next_to_log in self._reorder:
+            ready = self._reorder.pop(self._next_to_log)
+            self._next_to_log += 1
+            if ready.error is None:
+                try:
+                    self.service.logger.log_transaction(ready.customer_data, ready.payment_data, ready.response)
+                except Exception as e:
+                    ready.error = e
+            if ready.error is None:
+                ready.future.set_result(ready.response)
+            else:
+                ready.future.set_exception(ready.error)
@@ -1,13 +1,39 @@
+from .async_offline_processor import AsyncOfflinePaymentProcessor
+from .async_payment_processor_protocol import AsyncPaymentProcessorProtocol
+from .async_recurring_payment_protocol import AsyncRecurringPaymentProtocol
+from .async_refund_payment_protocol import AsyncRefundPaymentProtocol
+from .circuit_breaker import CircuitBreaker
+from .idempotent_payment_processor_protocol import IdempotentPaymentProcessorProtocol
 from .offline_processor import OfflinePaymentProcessor
+from .offline_queue import OfflinePaymentQueue, OfflineReplayWorker, QueuedPayment
 from .payment_processor_protocol import PaymentProcessorProtocol
 from .recurring_payment_protocol import RecurringPaymentProtocol
 from .refund_payment_protocol import RefundPaymentProtocol
+from .resilient_processor import ReconciliationItem, ResilientPaymentProcessor
+from .routing_processor import BackendStats, ProcessorBackend, RoutingPaymentProcessor, RoutingRule
 from .stripe_payment_processor import StripePaymentProcessor
+from .sync_to_async_processor import SyncToAsyncProcessor
 
 __all__ = [
+    "AsyncOfflinePaymentProcessor",
+    "AsyncPaymentProcessorProtocol",
+    "AsyncRecurringPaymentProtocol",
+    "AsyncRefundPaymentProtocol",
+    "BackendStats",
+    "CircuitBreaker",
+    "IdempotentPaymentProcessorProtocol",
     "OfflinePaymentProcessor",
+    "OfflinePaymentQueue",
+    "OfflineReplayWorker",
     "PaymentProcessorProtocol",
+    "ProcessorBackend",
+    "QueuedPayment",
     "RecurringPaymentProtocol",
     "RefundPaymentProtocol",
+    "ReconciliationItem",
+    "ResilientPaymentProcessor",
+    "RoutingPaymentProcessor",
+    "RoutingRule",
     "StripePaymentProcessor",
+    "SyncToAsyncProcessor",
 ]
\ No newline at end of file
@@ -0,0 +1,25 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse, trusted_payment_response
+from .async_payment_processor_protocol import AsyncPaymentProcessorProtocol
+import uuid
+
+
+class AsyncOfflinePaymentProcessor(AsyncPaymentProcessorProtocol):
+    async def process_transaction(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        """
+        Procesador de pagos offline asíncrono.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: Un objeto PaymentResponse que contiene el estado de la transacción, el monto, el ID de la transacción y un mensaje.
+        :rtype: PaymentResponse
+        """
+        print("Procesando pago offline para", customer_data.name)
+        return trusted_payment_response(
+            status="success",
+            amount=payment_data.amount,
+            transaction_id=str(uuid.uuid4()),
+            message="pago offline exitoso",
+        )
@@ -0,0 +1,23 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from typing import Protocol
+
+
+class AsyncPaymentProcessorProtocol(Protocol):
+    """
+    Protocolo asíncrono para procesar transacciones de pago.
+
+    Es la contraparte de PaymentProcessorProtocol para ser usada desde un event loop de asyncio.
+    La implementacion deberá proporcionar una corrutina 'process_transaction' que no bloquee el loop.
+    """
+
+    async def process_transaction(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        """
+        Procesa una transacción de pago de forma asíncrona y retorna un objeto PaymentResponse.
+        :param customer_data: Datos del cliente.
+        :param payment_data: Datos del pago.
+        :return: Un objeto PaymentResponse que contiene el estado de la transacción, el monto, el ID de la transacción y un mensaje.
+        :rtype: PaymentResponse
+        """
+        ...
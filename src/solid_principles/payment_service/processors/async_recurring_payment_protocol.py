@@ -0,0 +1,23 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from typing import Protocol
+
+
+class AsyncRecurringPaymentProtocol(Protocol):
+    """
+    Protocolo asíncrono para procesar pagos recurrentes.
+
+    Es la contraparte de RecurringPaymentProtocol para ser usada desde un event loop de asyncio.
+    La implementacion deberá proporcionar una corrutina 'setup_recurring_payment' que no bloquee el loop.
+    """
+
+    async def setup_recurring_payment(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        """
+        Configura un pago recurrente de forma asíncrona y retorna un objeto PaymentResponse.
+        :param customer_data: Datos del cliente.
+        :param payment_data: Datos del pago.
+        :return: Un objeto PaymentResponse que contiene el estado del pago recurrente, el monto, el ID de la transacción y un mensaje.
+        :rtype: PaymentResponse
+        """
+        ...
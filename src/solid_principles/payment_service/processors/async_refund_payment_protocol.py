@@ -0,0 +1,20 @@
+from typing import Protocol
+from ..commons import PaymentResponse
+
+
+class AsyncRefundPaymentProtocol(Protocol):
+    """
+    Protocolo asíncrono para procesar reembolsos de pagos.
+
+    Es la contraparte de RefundPaymentProtocol para ser usada desde un event loop de asyncio.
+    La implementacion deberá proporcionar una corrutina 'refund_payment' que no bloquee el loop.
+    """
+
+    async def refund_payment(self, transaction_id: str) -> PaymentResponse:
+        """
+        Procesa un reembolso de forma asíncrona y retorna un objeto PaymentResponse.
+        :param transaction_id: ID de la transacción a reembolsar.
+        :return: Un objeto PaymentResponse que contiene el estado del reembolso, el monto, el ID de la transacción y un mensaje.
+        :rtype: PaymentResponse
+        """
+        ...
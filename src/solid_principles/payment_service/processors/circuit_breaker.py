@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Callable
+
+
+class CircuitBreaker:
+    """
+    Cortocircuito de tres estados para llamadas a un proveedor externo.
+    - closed: las llamadas pasan; tras 'failure_threshold' fallos consecutivos se abre.
+    - open: las llamadas se rechazan de inmediato hasta que pasan 'recovery_timeout' segundos.
+    - half_open: se dejan pasar hasta 'half_open_max_calls' llamadas de prueba; un éxito lo cierra y un fallo lo reabre.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param failure_threshold: Fallos consecutivos que abren el circuito.
+        :type failure_threshold: int
+        :param recovery_timeout: Segundos que el circuito permanece abierto antes de probar de nuevo.
+        :type recovery_timeout: float
+        :param half_open_max_calls: Llamadas de prueba simultáneas permitidas en estado half_open.
+        :type half_open_max_calls: int
+        :param clock: Reloj monotónico.
+        :type clock: Callable[[], float]
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        :return: El estado actual: "closed", "open" o "half_open".
+        :rtype: str
+        """
+        with self._lock:
+            self._update()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Indica si una llamada puede pasar y, en half_open, la cuenta como llamada de prueba.
+        :return: True si la llamada puede intentarse.
+        :rtype: bool
+        """
+        with self._lock:
+            self._update()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Registra una llamada exitosa; cierra el circuito si estaba a prueba.
+        """
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_calls = 0
+
+    def record_failure(self):
+        """
+        Registra una llamada fallida; abre el circuito al alcanzar el umbral o si fallaba una prueba.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_calls = 0
+
+    def _update(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_calls = 0
@@ -0,0 +1,24 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from typing import Protocol
+
+
+class IdempotentPaymentProcessorProtocol(Protocol):
+    """
+    Protocolo para procesadores que aceptan una clave de idempotencia.
+
+    Dos llamadas con la misma clave deben producir un único cobro en el proveedor, de modo que un reintento
+    tras un fallo de red o una caída no cobre dos veces.
+    """
+
+    def process_transaction(
+        self, customer_data: CustomerData, payment_data: PaymentData, idempotency_key: str
+    ) -> PaymentResponse:
+        """
+        Procesa una transacción de pago identificada por una clave de idempotencia.
+        :param customer_data: Datos del cliente.
+        :param payment_data: Datos del pago.
+        :param idempotency_key: Clave que identifica el cobro ante el proveedor.
+        :return: Un objeto PaymentResponse que contiene el estado de la transacción, el monto, el ID de la transacción y un mensaje.
+        :rtype: PaymentResponse
+        """
+        ...
@@ -1,9 +1,20 @@
-from ..commons import CustomerData, PaymentData, PaymentResponse
-from ..processors import PaymentProcessorProtocol
+from ..commons import CustomerData, PaymentData, PaymentResponse, trusted_payment_response
+from .offline_queue import OfflinePaymentQueue
+from .payment_processor_protocol import PaymentProcessorProtocol
+from dataclasses import dataclass
+from typing import Optional
 import uuid
 
 
+@dataclass
 class OfflinePaymentProcessor(PaymentProcessorProtocol):
+    """
+    Procesador de pagos offline.
+    :param queue: Cola durable donde se guardan los pagos para reenviarlos más tarde; si es None el pago no se guarda.
+    :type queue: Optional[OfflinePaymentQueue]
+    """
+    queue: Optional[OfflinePaymentQueue] = None
+
     def process_transaction(
         self, customer_data: CustomerData, payment_data: PaymentData
     ) -> PaymentResponse:
@@ -17,10 +28,12 @@ class OfflinePaymentProcessor(PaymentProcessorProtocol):
         :rtype: PaymentResponse
         """
         print("Procesando pago offline para", customer_data.name)
-        return PaymentResponse(
+        transaction_id = str(uuid.uuid4())
+        if self.queue is not None:
+            self.queue.enqueue(transaction_id, customer_data, payment_data)
+        return trusted_payment_response(
             status="success",
             amount=payment_data.amount,
-            transaction_id=str(uuid.uuid4()),
+            transaction_id=transaction_id,
             message="pago offline exitoso",
         )
-   
\ No newline at end of file
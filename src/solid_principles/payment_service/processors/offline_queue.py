@@ -0,0 +1,316 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from .idempotent_payment_processor_protocol import IdempotentPaymentProcessorProtocol
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+PENDING = "pending"
+FORWARDED = "forwarded"
+DEAD = "dead"
+
+
+@dataclass(frozen=True)
+class QueuedPayment:
+    """
+    Pago aceptado offline y guardado en la cola a la espera de reenviarse al procesador real.
+    """
+    transaction_id: str
+    customer_data: CustomerData
+    payment_data: PaymentData
+    attempts: int
+
+
+class OfflinePaymentQueue:
+    """
+    Cola durable de pagos offline sobre SQLite en modo WAL.
+    Cada pago se identifica por el transaction_id generado al aceptarlo, de modo que encolar dos veces el mismo
+    pago no lo duplica y la cola puede reenviarse con semántica al-menos-una-vez.
+    Los pagos que fallan se reprograman (next_attempt_at) y los que agotan sus intentos pasan a estado "dead",
+    de modo que nunca bloquean a los pagos sanos que vienen detrás.
+    """
+    def __init__(self, path: str = "offline_payments.sqlite3"):
+        """
+        :param path: Ruta de la base de datos SQLite.
+        :type path: str
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS offline_payments ("
+                "transaction_id TEXT PRIMARY KEY, customer TEXT NOT NULL, payment TEXT NOT NULL, "
+                "created_at REAL NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+                "remote_transaction_id TEXT, last_error TEXT, next_attempt_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS offline_payments_due "
+                "ON offline_payments (status, next_attempt_at, created_at)"
+            )
+
+    def enqueue(self, transaction_id: str, customer_data: CustomerData, payment_data: PaymentData):
+        """
+        Guarda un pago pendiente; si el transaction_id ya existe no hace nada.
+        :param transaction_id: ID generado para el pago offline.
+        :type transaction_id: str
+        :param customer_data: Datos del cliente.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago.
+        :type payment_data: PaymentData
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO offline_payments "
+                "(transaction_id, customer, payment, created_at, status, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    transaction_id,
+                    customer_data.model_dump_json(),
+                    payment_data.model_dump_json(),
+                    now,
+                    PENDING,
+                    now,
+                ),
+            )
+
+    def pending(self, limit: int = 100, now: Optional[float] = None) -> list[QueuedPayment]:
+        """
+        Devuelve los pagos pendientes cuyo próximo intento ya venció; los reintentos programados para más
+        tarde no se devuelven.
+        :param limit: Número máximo de pagos a devolver.
+        :type limit: int
+        :param now: Momento de referencia; por defecto, la hora actual.
+        :type now: Optional[float]
+        :return: Los pagos pendientes, primero los que llevan más tiempo esperando su intento.
+        :rtype: list[QueuedPayment]
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT transaction_id, customer, payment, attempts FROM offline_payments "
+                "WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at, created_at LIMIT ?",
+                (PENDING, now, limit),
+            ).fetchall()
+        return self._to_payments(rows)
+
+    def dead_letters(self, limit: int = 100) -> list[QueuedPayment]:
+        """
+        :param limit: Número máximo de pagos a devolver.
+        :type limit: int
+        :return: Los pagos que agotaron sus intentos, en orden de llegada.
+        :rtype: list[QueuedPayment]
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT transaction_id, customer, payment, attempts FROM offline_payments "
+                "WHERE status = ? ORDER BY created_at LIMIT ?",
+                (DEAD, limit),
+            ).fetchall()
+        return self._to_payments(rows)
+
+    def requeue(self, transaction_id: str):
+        """
+        Devuelve a pendiente un pago muerto, con los intentos a cero, por ejemplo tras corregir su causa.
+        :param transaction_id: ID del pago offline.
+        :type transaction_id: str
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE offline_payments SET status = ?, attempts = 0, next_attempt_at = ? "
+                "WHERE transaction_id = ? AND status = ?",
+                (PENDING, time.time(), transaction_id, DEAD),
+            )
+
+    @staticmethod
+    def _to_payments(rows: list[tuple]) -> list[QueuedPayment]:
+        return [
+            QueuedPayment(
+                transaction_id=transaction_id,
+                customer_data=CustomerData.model_validate_json(customer),
+                payment_data=PaymentData.model_validate_json(payment),
+                attempts=attempts,
+            )
+            for transaction_id, customer, payment, attempts in rows
+        ]
+
+    def mark_forwarded(self, transaction_id: str, response: PaymentResponse):
+        """
+        Marca un pago como reenviado con éxito.
+        :param transaction_id: ID del pago offline.
+        :type transaction_id: str
+        :param response: Respuesta del procesador real.
+        :type response: PaymentResponse
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE offline_payments SET status = ?, attempts = attempts + 1, "
+                "remote_transaction_id = ?, last_error = NULL WHERE transaction_id = ?",
+                (FORWARDED, response.transaction_id, transaction_id),
+            )
+
+    def mark_failed_attempt(self, transaction_id: str, error: str, retry_at: Optional[float]):
+        """
+        Registra un intento fallido.
+        :param transaction_id: ID del pago offline.
+        :type transaction_id: str
+        :param error: Descripción del error.
+        :type error: str
+        :param retry_at: Momento del siguiente intento; None lo marca como muerto y no se reintenta más.
+        :type retry_at: Optional[float]
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE offline_payments SET attempts = attempts + 1, last_error = ?, status = ?, "
+                "next_attempt_at = ? WHERE transaction_id = ?",
+                (error, PENDING if retry_at is not None else DEAD, retry_at or 0, transaction_id),
+            )
+
+    def counts(self) -> dict[str, int]:
+        """
+        :return: Número de pagos por estado.
+        :rtype: dict[str, int]
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM offline_payments GROUP BY status"
+            ).fetchall()
+        return {PENDING: 0, FORWARDED: 0, DEAD: 0, **dict(rows)}
+
+    def close(self):
+        """
+        Cierra la conexión con la base de datos.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class OfflineReplayWorker:
+    """
+    Hilo que reenvía en lotes los pagos de una OfflinePaymentQueue al procesador real cuando está disponible.
+    Un pago solo se marca como reenviado después de que el procesador responde con éxito; si el proceso se
+    detiene entre ambos pasos el pago se reenviará de nuevo, pero con su transaction_id como clave de
+    idempotencia, así que el proveedor no lo cobra dos veces. Cada fallo reprograma el pago con espera
+    exponencial y, tras max_attempts intentos, el pago pasa a la lista de muertos (queue.dead_letters()).
+    """
+    def __init__(
+        self,
+        queue: OfflinePaymentQueue,
+        processor: IdempotentPaymentProcessorProtocol,
+        batch_size: int = 100,
+        max_workers: int = 8,
+        interval: float = 5.0,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        :param queue: Cola de pagos offline.
+        :type queue: OfflinePaymentQueue
+        :param processor: Procesador real al que se reenvían los pagos; debe aceptar una clave de idempotencia.
+        :type processor: IdempotentPaymentProcessorProtocol
+        :param batch_size: Pagos leídos de la cola en cada lote.
+        :type batch_size: int
+        :param max_workers: Reenvíos simultáneos dentro de un lote.
+        :type max_workers: int
+        :param interval: Segundos de espera cuando no hay pagos cuyo intento haya vencido.
+        :type interval: float
+        :param max_attempts: Intentos tras los cuales un pago pasa a muerto.
+        :type max_attempts: int
+        :param backoff_base: Espera en segundos tras el primer fallo; se duplica en cada fallo siguiente.
+        :type backoff_base: float
+        :param backoff_max: Espera máxima en segundos entre intentos.
+        :type backoff_max: float
+        :param clock: Reloj en segundos usado para programar los reintentos.
+        :type clock: Callable[[], float]
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.queue = queue
+        self.processor = processor
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def replay_once(self) -> tuple[int, int]:
+        """
+        Reenvía un lote de pagos pendientes cuyo intento ya venció.
+        :return: Número de pagos reenviados con éxito y número de intentos fallidos.
+        :rtype: tuple[int, int]
+        """
+        batch = self.queue.pending(self.batch_size, now=self.clock())
+        if not batch:
+            return 0, 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batch))) as executor:
+            outcomes = list(executor.map(self._forward, batch))
+        forwarded = sum(outcomes)
+        return forwarded, len(outcomes) - forwarded
+
+    def drain(self) -> int:
+        """
+        Reenvía lotes hasta que no quede ningún pago cuyo intento haya vencido; los que fallan quedan
+        reprogramados para más tarde o muertos.
+        :return: Número total de pagos reenviados.
+        :rtype: int
+        """
+        total = 0
+        while True:
+            forwarded, failed = self.replay_once()
+            total += forwarded
+            if forwarded + failed == 0:
+                return total
+
+    def start(self):
+        """
+        Arranca el hilo de reenvío en segundo plano.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="offline-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Detiene el hilo de reenvío tras terminar el lote en curso.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            forwarded, failed = self.replay_once()
+            if forwarded + failed == 0:
+                self._stop.wait(self.interval)
+
+    def _forward(self, queued: QueuedPayment) -> bool:
+        try:
+            response = self.processor.process_transaction(
+                queued.customer_data, queued.payment_data, idempotency_key=queued.transaction_id
+            )
+        except Exception as e:
+            self._fail(queued, str(e))
+            return False
+        if response.status == "failed":
+            self._fail(queued, response.message or "failed")
+            return False
+        self.queue.mark_forwarded(queued.transaction_id, response)
+        return True
+
+    def _fail(self, queued: QueuedPayment, error: str):
+        if queued.attempts + 1 >= self.max_attempts:
+            retry_at = None
+        else:
+            retry_at = self.clock() + min(self.backoff_max, self.backoff_base * 2 ** queued.attempts)
+        self.queue.mark_failed_attempt(queued.transaction_id, error, retry_at)
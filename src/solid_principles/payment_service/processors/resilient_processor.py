@@ -0,0 +1,227 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from .circuit_breaker import CircuitBreaker
+from .offline_processor import OfflinePaymentProcessor
+from .payment_processor_protocol import PaymentProcessorProtocol
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional
+
+
+@dataclass
+class ReconciliationItem:
+    """
+    Pago aceptado por el procesador de respaldo que debe conciliarse más tarde con el proveedor real.
+    Si después llega la respuesta tardía del proveedor, se guarda en settled_by y el pago ya no debe reenviarse.
+    """
+    customer_data: CustomerData
+    payment_data: PaymentData
+    response: PaymentResponse
+    reason: str
+    settled_by: Optional[PaymentResponse] = None
+
+
+class ResilientPaymentProcessor(PaymentProcessorProtocol):
+    """
+    Envoltorio de resiliencia para cualquier PaymentProcessorProtocol.
+    - Solo las excepciones y los timeouts cuentan como caída del proveedor. Una respuesta con estado "failed"
+      (por ejemplo una tarjeta rechazada) es una respuesta válida: se devuelve tal cual y no abre el circuito.
+    - Un CircuitBreaker sobre el procesador principal hace que, mientras el proveedor está caído, los pagos
+      fallen rápido hacia el respaldo en lugar de esperar al timeout.
+    - Si se configura 'hedge_after' y hay procesador secundario, cuando el principal tarda más de ese umbral se
+      lanza la misma petición al secundario y gana la primera respuesta.
+    - Si ningún procesador responde antes de 'timeout', el pago se acepta con el procesador de respaldo (por
+      defecto OfflinePaymentProcessor) y queda en la cola 'reconciliation'. Si luego llega la respuesta tardía
+      del proveedor, el ReconciliationItem se retira de la cola, se marca con settled_by y, si el respaldo guardó
+      el pago en una OfflinePaymentQueue, se marca allí como reenviado para que no se cobre otra vez.
+    Las peticiones cubiertas (hedged) pueden cobrar dos veces: si la perdedora también tiene éxito, su respuesta
+    se guarda en 'duplicate_charges' para reembolsarla.
+    """
+    def __init__(
+        self,
+        primary: PaymentProcessorProtocol,
+        secondary: Optional[PaymentProcessorProtocol] = None,
+        fallback: Optional[PaymentProcessorProtocol] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeout: float = 10.0,
+        hedge_after: Optional[float] = None,
+        max_workers: int = 32,
+    ):
+        """
+        :param primary: Procesador principal.
+        :type primary: PaymentProcessorProtocol
+        :param secondary: Procesador al que se envían las peticiones cubiertas.
+        :type secondary: Optional[PaymentProcessorProtocol]
+        :param fallback: Procesador de respaldo; por defecto OfflinePaymentProcessor.
+        :type fallback: Optional[PaymentProcessorProtocol]
+        :param breaker: Cortocircuito del procesador principal; por defecto uno con la configuración estándar.
+        :type breaker: Optional[CircuitBreaker]
+        :param timeout: Segundos máximos que espera el llamador antes de recurrir al respaldo.
+        :type timeout: float
+        :param hedge_after: Segundos tras los que se lanza la petición cubierta al secundario; None la desactiva.
+        :type hedge_after: Optional[float]
+        :param max_workers: Hilos disponibles para las llamadas a los procesadores.
+        :type max_workers: int
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.fallback = fallback if fallback is not None else OfflinePaymentProcessor()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+        self.reconciliation: deque[ReconciliationItem] = deque()
+        self.duplicate_charges: list[PaymentResponse] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resilient-processor")
+        self._lock = threading.Lock()
+
+    def process_transaction(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        """
+        Procesa una transacción con tiempo de respuesta acotado por 'timeout'.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: La primera respuesta de un procesador (exitosa o rechazada), o la del procesador de respaldo.
+        :rtype: PaymentResponse
+        """
+        if not self.breaker.allow_request():
+            return self._fall_back(customer_data, payment_data, "circuit open")[0]
+
+        deadline = time.monotonic() + self.timeout
+        outcome = _PrimaryOutcome(self.breaker)
+        primary = self._executor.submit(self.primary.process_transaction, customer_data, payment_data)
+        primary.add_done_callback(outcome.record)
+        pending: set[Future] = {primary}
+
+        if self.secondary is not None and self.hedge_after is not None:
+            done, _ = wait(pending, timeout=min(self.hedge_after, self.timeout))
+            winner = self._answered(done)
+            if winner is not None:
+                return winner
+            pending -= done
+            pending.add(self._executor.submit(self.secondary.process_transaction, customer_data, payment_data))
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            winner = self._answered(done)
+            if winner is not None:
+                for loser in pending:
+                    loser.add_done_callback(self._record_duplicate)
+                return winner
+        reason = "timeout" if pending else "all processors failed"
+        if not primary.done():
+            outcome.record_timeout()
+        response, item = self._fall_back(customer_data, payment_data, reason)
+        for late in pending:
+            late.add_done_callback(partial(self._settle, item))
+        return response
+
+    def drain_reconciliation(self) -> list[ReconciliationItem]:
+        """
+        Retira y devuelve los pagos pendientes de conciliar.
+        :return: Los pagos aceptados por el respaldo desde la última llamada.
+        :rtype: list[ReconciliationItem]
+        """
+        with self._lock:
+            items = list(self.reconciliation)
+            self.reconciliation.clear()
+        return items
+
+    def close(self):
+        """
+        Espera a que terminen las llamadas en curso y libera los hilos.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _fall_back(
+        self, customer_data: CustomerData, payment_data: PaymentData, reason: str
+    ) -> tuple[PaymentResponse, ReconciliationItem]:
+        response = self.fallback.process_transaction(customer_data, payment_data)
+        item = ReconciliationItem(customer_data, payment_data, response, reason)
+        with self._lock:
+            self.reconciliation.append(item)
+        return response, item
+
+    def _settle(self, item: ReconciliationItem, future: Future):
+        """
+        Aplica a un pago aceptado por el respaldo la respuesta tardía de un proveedor.
+        La primera respuesta resuelve el pago; un segundo cobro exitoso se guarda como duplicado.
+        """
+        if not _answered(future):
+            return
+        response = future.result()
+        with self._lock:
+            if item.settled_by is not None:
+                if _charged(future):
+                    self.duplicate_charges.append(response)
+                return
+            item.settled_by = response
+            try:
+                self.reconciliation.remove(item)
+            except ValueError:
+                pass
+        queue = getattr(self.fallback, "queue", None)
+        if queue is None or not item.response.transaction_id:
+            return
+        if response.status == "failed":
+            queue.mark_failed_attempt(item.response.transaction_id, response.message or "declined", retry_at=None)
+        else:
+            queue.mark_forwarded(item.response.transaction_id, response)
+
+    def _record_duplicate(self, future: Future):
+        if _charged(future):
+            with self._lock:
+                self.duplicate_charges.append(future.result())
+
+    @staticmethod
+    def _answered(done: set[Future]) -> Optional[PaymentResponse]:
+        for future in done:
+            if _answered(future):
+                return future.result()
+        return None
+
+
+def _answered(future: Future) -> bool:
+    return future.exception() is None
+
+
+def _charged(future: Future) -> bool:
+    return future.exception() is None and future.result().status != "failed"
+
+
+class _PrimaryOutcome:
+    """
+    Registra una sola vez en el cortocircuito el resultado de una llamada al procesador principal.
+    Si el llamador se rinde por timeout, se cuenta como fallo en ese momento y el resultado tardío se ignora,
+    de modo que un proveedor colgado también abre el circuito.
+    """
+    def __init__(self, breaker: CircuitBreaker):
+        self._breaker = breaker
+        self._recorded = False
+        self._lock = threading.Lock()
+
+    def record(self, future: Future):
+        with self._lock:
+            if self._recorded:
+                return
+            self._recorded = True
+        if _answered(future):
+            self._breaker.record_success()
+        else:
+            self._breaker.record_failure()
+
+    def record_timeout(self):
+        with self._lock:
+            if self._recorded:
+                return
+            self._recorded = True
+        self._breaker.record_failure()
@@ -0,0 +1,207 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from .payment_processor_protocol import PaymentProcessorProtocol
+
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Optional, Sequence
+
+
+@dataclass
+class BackendStats:
+    """
+    Estadísticas de un backend del enrutador.
+    """
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    ewma_latency: float = 0.0
+    last_selected: Optional[float] = None
+
+
+@dataclass
+class ProcessorBackend:
+    name: str
+    processor: PaymentProcessorProtocol
+    weight: float = 1.0
+    """
+    Procesador registrado en el enrutador.
+    :param name: Nombre único del backend (cuenta o proveedor).
+    :type name: str
+    :param processor: Procesador que atiende las peticiones.
+    :type processor: PaymentProcessorProtocol
+    :param weight: Peso relativo; un backend con peso 2 recibe aproximadamente el doble de carga.
+    :type weight: float
+    """
+    stats: BackendStats = field(default_factory=BackendStats, init=False)
+
+    def __post_init__(self):
+        if not self.weight > 0:
+            raise ValueError(f"Backend {self.name} weight must be positive, got {self.weight}")
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    backends: tuple[str, ...]
+    currency: Optional[str] = None
+    min_amount: Optional[int] = None
+    max_amount: Optional[int] = None
+    """
+    Regla que restringe a qué backends puede ir un pago según su moneda y su monto.
+    Las condiciones en None no se comprueban; se aplica la primera regla que coincide.
+    """
+
+    def matches(self, payment_data: PaymentData) -> bool:
+        """
+        :param payment_data: Datos del pago.
+        :type payment_data: PaymentData
+        :return: True si el pago cumple todas las condiciones de la regla.
+        :rtype: bool
+        """
+        if self.currency is not None and payment_data.currency != self.currency:
+            return False
+        if self.min_amount is not None and payment_data.amount < self.min_amount:
+            return False
+        if self.max_amount is not None and payment_data.amount > self.max_amount:
+            return False
+        return True
+
+
+class RoutingPaymentProcessor(PaymentProcessorProtocol):
+    """
+    Procesador que reparte las transacciones entre varios backends ponderados.
+    Cada backend tiene un peso efectivo: su peso dividido entre sus peticiones en curso ("least_outstanding") o,
+    con "ewma", además entre su latencia media móvil exponencial. El reparto entre pesos efectivos se hace con
+    round-robin ponderado suave, de modo que sin carga concurrente un backend con peso 2 recibe el doble de
+    peticiones que uno con peso 1. Un backend que no se elige durante probe_interval segundos recibe la siguiente
+    petición, para que una latencia alta puntual no lo deje sin tráfico para siempre. Las RoutingRule limitan
+    los candidatos por moneda o monto; el estado del round-robin se guarda por conjunto de candidatos, así que el
+    tráfico de una regla no altera el reparto de otra que comparte backends. Al implementar
+    PaymentProcessorProtocol se inyecta en PaymentService sin cambios.
+    """
+    LEAST_OUTSTANDING = "least_outstanding"
+    EWMA = "ewma"
+
+    def __init__(
+        self,
+        backends: Sequence[ProcessorBackend],
+        rules: Sequence[RoutingRule] = (),
+        strategy: str = LEAST_OUTSTANDING,
+        ewma_alpha: float = 0.2,
+        probe_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param backends: Backends disponibles.
+        :type backends: Sequence[ProcessorBackend]
+        :param rules: Reglas de enrutamiento por moneda o monto; sin coincidencias se usan todos los backends.
+        :type rules: Sequence[RoutingRule]
+        :param strategy: "least_outstanding" o "ewma".
+        :type strategy: str
+        :param ewma_alpha: Peso de la última medición en la latencia EWMA.
+        :type ewma_alpha: float
+        :param probe_interval: Segundos sin ser elegido tras los que un backend recibe una petición de sondeo.
+        :type probe_interval: float
+        :param clock: Reloj monotónico usado para detectar backends sin tráfico.
+        :type clock: Callable[[], float]
+        """
+        if not backends:
+            raise ValueError("At least one backend is required")
+        if strategy not in (self.LEAST_OUTSTANDING, self.EWMA):
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        self.backends = {backend.name: backend for backend in backends}
+        unknown = {name for rule in rules for name in rule.backends} - self.backends.keys()
+        if unknown:
+            raise ValueError(f"Routing rules reference unknown backends: {', '.join(sorted(unknown))}")
+        self.rules = tuple(rules)
+        self.strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self.probe_interval = probe_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._current_weights: dict[tuple[str, ...], dict[str, float]] = {}
+
+    def process_transaction(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        """
+        Procesa la transacción con el backend elegido por la estrategia de enrutamiento.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: La respuesta del backend elegido.
+        :rtype: PaymentResponse
+        """
+        backend = self._acquire(payment_data)
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = backend.processor.process_transaction(customer_data, payment_data)
+            failed = response.status == "failed"
+            return response
+        finally:
+            self._release(backend, time.perf_counter() - started, failed)
+
+    def stats(self) -> dict[str, BackendStats]:
+        """
+        :return: Una copia de las estadísticas de cada backend, indexadas por nombre.
+        :rtype: dict[str, BackendStats]
+        """
+        with self._lock:
+            return {name: replace(backend.stats) for name, backend in self.backends.items()}
+
+    def _candidates(self, payment_data: PaymentData) -> list[ProcessorBackend]:
+        for rule in self.rules:
+            if rule.matches(payment_data):
+                return [self.backends[name] for name in rule.backends]
+        return list(self.backends.values())
+
+    def _acquire(self, payment_data: PaymentData) -> ProcessorBackend:
+        candidates = self._candidates(payment_data)
+        with self._lock:
+            now = self.clock()
+            backend = self._starved(candidates, now) or self._next_weighted(candidates)
+            backend.stats.outstanding += 1
+            backend.stats.requests += 1
+            backend.stats.last_selected = now
+        return backend
+
+    def _starved(self, candidates: list[ProcessorBackend], now: float) -> Optional[ProcessorBackend]:
+        oldest = min(
+            candidates,
+            key=lambda candidate: float("-inf") if candidate.stats.last_selected is None else candidate.stats.last_selected,
+        )
+        last_selected = oldest.stats.last_selected
+        return oldest if last_selected is None or now - last_selected >= self.probe_interval else None
+
+    def _next_weighted(self, candidates: list[ProcessorBackend]) -> ProcessorBackend:
+        names = tuple(candidate.name for candidate in candidates)
+        current = self._current_weights.get(names)
+        if current is None:
+            current = self._current_weights[names] = dict.fromkeys(names, 0.0)
+        total = 0.0
+        for candidate in candidates:
+            effective = self._effective_weight(candidate)
+            current[candidate.name] += effective
+            total += effective
+        backend = max(candidates, key=lambda candidate: current[candidate.name])
+        current[backend.name] -= total
+        return backend
+
+    def _release(self, backend: ProcessorBackend, latency: float, failed: bool):
+        with self._lock:
+            stats = backend.stats
+            stats.outstanding -= 1
+            if failed:
+                stats.failures += 1
+            if stats.ewma_latency == 0.0:
+                stats.ewma_latency = latency
+            else:
+                stats.ewma_latency += self.ewma_alpha * (latency - stats.ewma_latency)
+
+    def _effective_weight(self, backend: ProcessorBackend) -> float:
+        effective = backend.weight / (backend.stats.outstanding + 1)
+        if self.strategy == self.EWMA and backend.stats.ewma_latency > 0.0:
+            return effective / backend.stats.ewma_latency
+        return effective
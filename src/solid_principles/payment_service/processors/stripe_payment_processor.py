@@ -1,17 +1,98 @@
-from ..commons import CustomerData, PaymentData, PaymentResponse
-from processors import PaymentProcessorProtocol, RefundPaymentProtocol, RecurringPaymentProtocol
+from ..caching import TTLCache
+from ..commons import CustomerData, PaymentData, PaymentResponse, trusted_payment_response
+from .payment_processor_protocol import PaymentProcessorProtocol
+from .recurring_payment_protocol import RecurringPaymentProtocol
+from .refund_payment_protocol import RefundPaymentProtocol
 
 import stripe, os
+from requests import Session
+from requests.adapters import HTTPAdapter
 from stripe.error import StripeError
+from typing import Optional
 
 class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, RecurringPaymentProtocol):
     """
     Procesador de pagos que utiliza la API de Stripe para manejar transacciones, reembolsos y pagos recurrentes.
     Esta clase implementa los protocolos PaymentProcessor, RefundPaymentProcessor y RecurringPaymentProcessor.
+    Los clientes y métodos de pago de Stripe se guardan en cachés LRU con TTL para que configurar pagos
+    recurrentes de clientes conocidos no repita las llamadas de consulta, adjunto y método predeterminado.
+    El procesador crea una única vez su propio StripeClient con un pool de conexiones HTTP persistentes.
+    Las respuestas con datos devueltos por Stripe se validan con PaymentResponse; trusted_payment_response solo
+    se usa para las de error, construidas con valores propios.
     """
-    
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: int = 20,
+        timeout: float = 30.0,
+        max_network_retries: int = 0,
+        http_client: Optional[stripe.HTTPClient] = None,
+        api_base: Optional[str] = None,
+        cache_size: int = 10_000,
+        cache_ttl: float = 300.0,
+    ):
+        """
+        :param api_key: Clave de la API de Stripe; por defecto se lee de la variable de entorno STRIPE_API_KEY.
+        :type api_key: Optional[str]
+        :param max_connections: Tamaño máximo del pool de conexiones keep-alive hacia Stripe.
+        :type max_connections: int
+        :param timeout: Segundos máximos por llamada a la API.
+        :type timeout: float
+        :param max_network_retries: Reintentos automáticos de Stripe ante errores de red.
+        :type max_network_retries: int
+        :param http_client: Cliente HTTP de Stripe a usar en lugar del pool creado por defecto.
+        :type http_client: Optional[stripe.HTTPClient]
+        :param api_base: URL base alternativa de la API (por ejemplo un servidor de pruebas local).
+        :type api_base: Optional[str]
+        :param cache_size: Número máximo de clientes y de métodos de pago en caché.
+        :type cache_size: int
+        :param cache_ttl: Segundos que un objeto de Stripe se considera vigente en caché.
+        :type cache_ttl: float
+        """
+        if http_client is None:
+            http_client = stripe.RequestsClient(
+                timeout=timeout, session=self._pooled_session(max_connections)
+            )
+        self.client = stripe.StripeClient(
+            api_key if api_key is not None else os.getenv("STRIPE_API_KEY", ""),
+            http_client=http_client,
+            max_network_retries=max_network_retries,
+            base_addresses={"api": api_base} if api_base else {},
+        )
+        self.customer_cache: TTLCache[str, stripe.Customer] = TTLCache(cache_size, cache_ttl)
+        self.customer_ids_by_email: TTLCache[str, str] = TTLCache(cache_size, cache_ttl)
+        self.payment_method_cache: TTLCache[str, stripe.PaymentMethod] = TTLCache(cache_size, cache_ttl)
+
+    def invalidate_customer(self, customer_id: str) -> None:
+        """
+        Descarta el cliente cacheado para que la próxima operación lo vuelva a consultar en Stripe.
+        :param customer_id: ID del cliente en Stripe.
+        :type customer_id: str
+        """
+        self.customer_cache.invalidate(customer_id)
+
+    def invalidate_payment_method(self, payment_method_id: str) -> None:
+        """
+        Descarta el método de pago cacheado para que la próxima operación lo vuelva a consultar en Stripe.
+        :param payment_method_id: ID del método de pago (o fuente de pago) en Stripe.
+        :type payment_method_id: str
+        """
+        self.payment_method_cache.invalidate(payment_method_id)
+
+    def clear_caches(self) -> None:
+        """
+        Vacía todas las cachés de objetos de Stripe.
+        """
+        self.customer_cache.clear()
+        self.customer_ids_by_email.clear()
+        self.payment_method_cache.clear()
+
     def process_transaction(
-        self, customer_data: CustomerData, payment_data: PaymentData
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
     ) -> PaymentResponse:
         """
         Procesa una transacción de pago utilizando la API de Stripe.
@@ -19,17 +100,18 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
         :type customer_data: CustomerData
         :param payment_data: Datos del pago que incluyen monto y fuente de pago.
         :type payment_data: PaymentData
+        :param idempotency_key: Clave de idempotencia enviada a Stripe; reintentos con la misma clave no cobran dos veces.
+        :type idempotency_key: Optional[str]
         :return: Un objeto PaymentResponse que contiene el estado de la transacción, el monto, el ID de la transacción y un mensaje.
         :rtype: PaymentResponse
         """
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
         try:
-            charge = stripe.Charge.create(
-                amount=payment_data.amount,
-                currency="usd",
-                source=payment_data.source,
-                description="Cargo por " + customer_data.name,
-            )
+            charge = self.client.charges.create(params={
+                "amount": payment_data.amount,
+                "currency": "usd",
+                "source": payment_data.source,
+                "description": "Cargo por " + customer_data.name,
+            }, options={"idempotency_key": idempotency_key} if idempotency_key else {})
             print("Transacción exitosa:")
             return PaymentResponse(
                 status=charge["status"],
@@ -39,7 +121,7 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
             )
         except StripeError as e:
             print("Error procesando la transacción:", e)
-            return PaymentResponse(
+            return trusted_payment_response(
                 status="failed",
                 amount=payment_data.amount,
                 transaction_id=None,
@@ -54,9 +136,8 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
         :return: Un objeto PaymentResponse que contiene el estado del reembolso, el monto, el ID de la transacción y un mensaje.
         :rtype: PaymentResponse
         """
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
         try:
-            refund = stripe.Refund.create(charge=transaction_id)
+            refund = self.client.refunds.create(params={"charge": transaction_id})
             print("Reembolso exitoso:")
             return PaymentResponse(
                 status=refund["status"],
@@ -66,7 +147,7 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
             )
         except StripeError as e:
             print("Error procesando el reembolso:", e)
-            return PaymentResponse(
+            return trusted_payment_response(
                 status="failed",
                 amount=0,
                 transaction_id=None,
@@ -85,8 +166,8 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
         :return: Un objeto PaymentResponse que contiene el estado del pago recurrente, el monto, el ID de la transacción y un mensaje.
         :rtype: PaymentResponse
         """
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
         price_id = os.getenv("STRIPE_PRICE_ID", "")
+        customer = None
         try:
             customer = self._get_or_create_customer(customer_data)
 
@@ -96,13 +177,13 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
 
             self._set_default_payment_method(customer.id, payment_method.id)
 
-            subscription = stripe.Subscription.create(
-                customer=customer.id,
-                items=[
+            subscription = self.client.subscriptions.create(params={
+                "customer": customer.id,
+                "items": [
                     {"price": price_id},
                 ],
-                expand=["latest_invoice.payment_intent"],
-            )
+                "expand": ["latest_invoice.payment_intent"],
+            })
 
             print("Configuración de pago recurrente exitosa:")
             amount = subscription["items"]["data"][0]["price"]["unit_amount"]
@@ -114,7 +195,11 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
             )
         except StripeError as e:
             print("Error configurando el pago recurrente:", e)
-            return PaymentResponse(
+            # El estado cacheado puede haber quedado obsoleto; se vuelve a consultar en el próximo intento.
+            if customer is not None:
+                self.invalidate_customer(customer.id)
+            self.invalidate_payment_method(payment_data.source)
+            return trusted_payment_response(
                 status="failed",
                 amount=0,
                 transaction_id=None,
@@ -125,22 +210,32 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
         self, customer_data: CustomerData
     ) -> stripe.Customer:
         """
-        Obtiene o crea un cliente en Stripe.
+        Obtiene o crea un cliente en Stripe, consultando primero la caché.
         :param customer_data: Datos del cliente que incluyen nombre y contacto.
         :type customer_data: CustomerData
         :return: Un objeto Customer de Stripe que representa al cliente.
         :rtype: stripe.Customer
         """
-        if customer_data.customer_id:
-            customer = stripe.Customer.retrieve(customer_data.customer_id)
+        email = customer_data.contact_info.email
+        customer_id = customer_data.customer_id
+        if not customer_id and email:
+            customer_id = self.customer_ids_by_email.get(email)
+        if customer_id:
+            customer = self.customer_cache.get(customer_id)
+            if customer is not None:
+                return customer
+            customer = self.client.customers.retrieve(customer_id)
             print(f"Cliente recuperado: {customer.id}")
         else:
-            if not customer_data.contact_info.email:
+            if not email:
                 raise ValueError("Email is required to create a customer")
-            customer = stripe.Customer.create(
-                name=customer_data.name, email=customer_data.contact_info.email
-            )
+            customer = self.client.customers.create(params={
+                "name": customer_data.name, "email": email
+            })
             print(f"Cliente creado: {customer.id}")
+        self.customer_cache.put(customer.id, customer)
+        if email:
+            self.customer_ids_by_email.put(email, customer.id)
         return customer
 
     def _attach_payment_method(
@@ -148,6 +243,7 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
     ) -> stripe.PaymentMethod:
         """
         Adjunta un método de pago a un cliente en Stripe.
+        Si el método de pago cacheado ya pertenece al cliente no se vuelve a adjuntar.
         :param customer_id: ID del cliente en Stripe.
         :type customer_id: str
         :param payment_source: Fuente de pago (como un token o ID de método de pago).
@@ -155,14 +251,18 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
         :return: Un objeto PaymentMethod de Stripe que representa el método de pago adjunto.
         :rtype: stripe.PaymentMethod
         """
-        payment_method = stripe.PaymentMethod.retrieve(payment_source)
-        stripe.PaymentMethod.attach(
-            payment_method.id,
-            customer=customer_id,
-        )
-        print(
-            f"Método de pago {payment_method.id} adjuntado al cliente {customer_id}"
-        )
+        payment_method = self.payment_method_cache.get(payment_source)
+        if payment_method is None:
+            payment_method = self.client.payment_methods.retrieve(payment_source)
+        if payment_method.get("customer") != customer_id:
+            payment_method = self.client.payment_methods.attach(
+                payment_method.id,
+                params={"customer": customer_id},
+            )
+            print(
+                f"Método de pago {payment_method.id} adjuntado al cliente {customer_id}"
+            )
+        self.payment_method_cache.put(payment_source, payment_method)
         return payment_method
 
     def _set_default_payment_method(
@@ -170,6 +270,7 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
     ) -> None:
         """
         Establece un método de pago predeterminado para un cliente en Stripe.
+        Si el cliente cacheado ya lo tiene como predeterminado no se llama a la API.
         :param customer_id: ID del cliente en Stripe.
         :type customer_id: str
         :param payment_method_id: ID del método de pago que se establecerá como predeterminado.
@@ -177,10 +278,35 @@ class StripePaymentProcessor(PaymentProcessorProtocol, RefundPaymentProtocol, Re
         :return: None
         :rtype: None
         """
-        stripe.Customer.modify(
+        cached_customer = self.customer_cache.get(customer_id)
+        if cached_customer is not None:
+            invoice_settings = cached_customer.get("invoice_settings") or {}
+            if invoice_settings.get("default_payment_method") == payment_method_id:
+                return
+        customer = self.client.customers.update(
             customer_id,
-            invoice_settings={
-                "default_payment_method": payment_method_id,
+            params={
+                "invoice_settings": {
+                    "default_payment_method": payment_method_id,
+                },
             },
         )
-        print(f"Método de pago predeterminado {payment_method_id} establecido para el cliente {customer_id}")
\ No newline at end of file
+        self.customer_cache.put(customer_id, customer)
+        print(f"Método de pago predeterminado {payment_method_id} establecido para el cliente {customer_id}")
+
+    @staticmethod
+    def _pooled_session(max_connections: int) -> Session:
+        """
+        Crea una sesión de requests cuyo pool mantiene hasta 'max_connections' conexiones keep-alive.
+        :param max_connections: Número máximo de conexiones abiertas hacia el mismo host.
+        :type max_connections: int
+        :return: La sesión configurada.
+        :rtype: Session
+        """
+        session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_connections, pool_block=True
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
\ No newline at end of file
@@ -0,0 +1,82 @@
+from ..commons import CustomerData, PaymentData, PaymentResponse
+from .async_payment_processor_protocol import AsyncPaymentProcessorProtocol
+from .async_recurring_payment_protocol import AsyncRecurringPaymentProtocol
+from .async_refund_payment_protocol import AsyncRefundPaymentProtocol
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class SyncToAsyncProcessor(
+    AsyncPaymentProcessorProtocol, AsyncRefundPaymentProtocol, AsyncRecurringPaymentProtocol
+):
+    """
+    Puente que expone un procesador síncrono (por ejemplo StripePaymentProcessor) como procesador asíncrono.
+    Cada llamada bloqueante se ejecuta en un pool de hilos propio y acotado, de modo que el event loop
+    nunca se bloquea y el número de hilos no crece con el número de pagos en curso.
+    """
+
+    def __init__(self, processor: Any, max_workers: int = 32):
+        """
+        :param processor: Procesador síncrono que implementa uno o varios de los protocolos de pago.
+        :type processor: Any
+        :param max_workers: Número máximo de llamadas bloqueantes simultáneas.
+        :type max_workers: int
+        """
+        self.processor = processor
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sync-processor"
+        )
+
+    async def process_transaction(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        """
+        Procesa una transacción con el procesador síncrono sin bloquear el event loop.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: La respuesta del procesador síncrono.
+        :rtype: PaymentResponse
+        """
+        return await self._run(
+            self.processor.process_transaction, customer_data, payment_data
+        )
+
+    async def refund_payment(self, transaction_id: str) -> PaymentResponse:
+        """
+        Procesa un reembolso con el procesador síncrono sin bloquear el event loop.
+        :param transaction_id: ID de la transacción a reembolsar.
+        :type transaction_id: str
+        :return: La respuesta del procesador síncrono.
+        :rtype: PaymentResponse
+        """
+        return await self._run(self.processor.refund_payment, transaction_id)
+
+    async def setup_recurring_payment(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        """
+        Configura un pago recurrente con el procesador síncrono sin bloquear el event loop.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: La respuesta del procesador síncrono.
+        :rtype: PaymentResponse
+        """
+        return await self._run(
+            self.processor.setup_recurring_payment, customer_data, payment_data
+        )
+
+    def close(self) -> None:
+        """
+        Libera el pool de hilos esperando a que terminen las llamadas en curso.
+        """
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., PaymentResponse], *args: Any) -> PaymentResponse:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
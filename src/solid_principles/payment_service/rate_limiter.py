@@ -0,0 +1,78 @@
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Limitador de ritmo de tipo token bucket, seguro entre hilos.
+    El cubo se rellena a 'rate' tokens por segundo hasta 'capacity'; cada operación consume tokens.
+    """
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        """
+        :param rate: Tokens añadidos por segundo.
+        :type rate: float
+        :param capacity: Máximo de tokens acumulables (tamaño de ráfaga permitido).
+        :type capacity: float
+        :param clock: Reloj monotónico usado para el relleno.
+        :type clock: Callable[[], float]
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def available(self) -> float:
+        """
+        :return: Tokens disponibles en este momento.
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Consume tokens si hay suficientes, sin esperar.
+        :param tokens: Tokens a consumir.
+        :type tokens: float
+        :return: True si se consumieron.
+        :rtype: bool
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """
+        :param tokens: Tokens que se quieren consumir.
+        :type tokens: float
+        :return: Segundos hasta que haya 'tokens' disponibles (0 si ya los hay).
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def acquire(self, tokens: float = 1):
+        """
+        Consume tokens esperando lo necesario hasta que estén disponibles.
+        :param tokens: Tokens a consumir; no puede superar la capacidad.
+        :type tokens: float
+        """
+        if tokens > self.capacity:
+            raise ValueError("Cannot acquire more tokens than the bucket capacity")
+        while not self.try_acquire(tokens):
+            time.sleep(self.wait_time(tokens))
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
@@ -0,0 +1,277 @@
+from .commons import CustomerData, PaymentData, PaymentResponse
+from .services import PaymentService
+
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+DAY = 86400.0
+CHARGED = "charged"
+RETRY = "retry"
+CANCELED = "canceled"
+
+
+@dataclass(slots=True)
+class Subscription:
+    """
+    Suscripción local: qué cobrar, cada cuánto y en qué punto del ciclo de cobro y de reintentos está.
+    """
+    subscription_id: str
+    customer_data: CustomerData
+    payment_data: PaymentData
+    interval: float
+    period_start: float
+    next_due: float
+    failures: int = 0
+    active: bool = True
+
+
+@dataclass(frozen=True)
+class BillingOutcome:
+    """
+    Resultado del cobro de una suscripción vencida.
+    :param status: "charged" si se cobró, "retry" si falló y se reprogramó, "canceled" si se agotaron los reintentos.
+    :type status: str
+    """
+    subscription_id: str
+    due: float
+    status: str
+    response: Optional[PaymentResponse] = None
+    error: Optional[str] = None
+
+
+class RecurringBillingScheduler:
+    """
+    Motor local de cobros recurrentes sobre PaymentService.
+    Es la única fuente de cobro de sus suscripciones: nunca llama a setup_recurring, porque una suscripción en el
+    proveedor (por ejemplo Stripe) cobraría por su cuenta y el cliente pagaría dos veces.
+    Los vencimientos se guardan en un montículo (O(log n) por alta, cobro o reprogramación); las bajas y
+    reprogramaciones dejan la entrada antigua en el montículo y se descartan al salir (borrado perezoso).
+    Los cobros vencidos se agrupan en lotes y se envían con process_batch. Un cobro fallido se reintenta según
+    retry_delays (dunning) y, agotados los reintentos, la suscripción se cancela.
+    Tras una parada, los periodos perdidos no se cobran en ráfaga: un cobro exitoso cubre el periodo en curso y
+    el siguiente vencimiento es el primer inicio de periodo posterior a 'now'.
+    """
+    def __init__(
+        self,
+        service: PaymentService,
+        batch_size: int = 500,
+        max_workers: int = 8,
+        retry_delays: tuple[float, ...] = (1 * DAY, 3 * DAY, 7 * DAY),
+        clock: Callable[[], float] = time.time,
+        on_outcome: Optional[Callable[[BillingOutcome], None]] = None,
+    ):
+        """
+        :param service: Servicio con el que se configuran y cobran las suscripciones.
+        :type service: PaymentService
+        :param batch_size: Máximo de cobros por llamada a process_batch.
+        :type batch_size: int
+        :param max_workers: Cobros simultáneos dentro de un lote.
+        :type max_workers: int
+        :param retry_delays: Segundos de espera antes de cada reintento tras un cobro fallido.
+        :type retry_delays: tuple[float, ...]
+        :param clock: Reloj en segundos usado para los vencimientos.
+        :type clock: Callable[[], float]
+        :param on_outcome: Función llamada con cada BillingOutcome cuando el planificador corre en segundo plano.
+        :type on_outcome: Optional[Callable[[BillingOutcome], None]]
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.service = service
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.retry_delays = retry_delays
+        self.clock = clock
+        self.on_outcome = on_outcome
+        self._subscriptions: dict[str, Subscription] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        interval: float,
+        start_at: Optional[float] = None,
+    ) -> Subscription:
+        """
+        Da de alta una suscripción local. No se crea ninguna suscripción en el proveedor (setup_recurring):
+        el planificador es la única fuente de cobro y cada vencimiento se cobra con process_transaction.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :param interval: Segundos entre cobros.
+        :type interval: float
+        :param start_at: Momento del primer cobro; por defecto, un intervalo después de ahora.
+        :type start_at: Optional[float]
+        :return: La suscripción creada.
+        :rtype: Subscription
+        :raises ValueError: Si el intervalo no es positivo.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        due = start_at if start_at is not None else self.clock() + interval
+        subscription = Subscription(
+            subscription_id=str(uuid.uuid4()),
+            customer_data=customer_data,
+            payment_data=payment_data,
+            interval=interval,
+            period_start=due,
+            next_due=due,
+        )
+        with self._condition:
+            self._subscriptions[subscription.subscription_id] = subscription
+            self._push(subscription)
+            self._condition.notify()
+        return subscription
+
+    def cancel(self, subscription_id: str) -> bool:
+        """
+        Da de baja una suscripción; su entrada en el montículo se descarta cuando venza.
+        :param subscription_id: ID de la suscripción.
+        :type subscription_id: str
+        :return: True si la suscripción existía.
+        :rtype: bool
+        """
+        with self._condition:
+            subscription = self._subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return False
+        subscription.active = False
+        return True
+
+    def get(self, subscription_id: str) -> Optional[Subscription]:
+        """
+        :param subscription_id: ID de la suscripción.
+        :type subscription_id: str
+        :return: La suscripción o None si no existe o fue cancelada.
+        :rtype: Optional[Subscription]
+        """
+        return self._subscriptions.get(subscription_id)
+
+    def next_due(self) -> Optional[float]:
+        """
+        :return: El vencimiento más próximo, o None si no hay suscripciones activas.
+        :rtype: Optional[float]
+        """
+        with self._condition:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now: Optional[float] = None) -> list[BillingOutcome]:
+        """
+        Cobra, en lotes, todas las suscripciones vencidas en 'now' y reprograma cada una según el resultado.
+        :param now: Momento de referencia; por defecto, el reloj del planificador.
+        :type now: Optional[float]
+        :return: Un BillingOutcome por suscripción cobrada o intentada.
+        :rtype: list[BillingOutcome]
+        """
+        now = self.clock() if now is None else now
+        outcomes: list[BillingOutcome] = []
+        while True:
+            due = self._pop_due(now)
+            if not due:
+                return outcomes
+            results = self.service.process_batch(
+                [(subscription.customer_data, subscription.payment_data) for subscription in due],
+                max_workers=self.max_workers,
+            )
+            with self._condition:
+                for subscription, result in zip(due, results):
+                    outcomes.append(self._reschedule(subscription, result.response, result.error, now))
+
+    def start(self):
+        """
+        Arranca un hilo que duerme hasta el siguiente vencimiento (o hasta un alta) y cobra lo vencido.
+        """
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="recurring-billing", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Detiene el hilo de cobro tras terminar el lote en curso.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    self._discard_stale()
+                    if self._heap and self._heap[0][0] <= self.clock():
+                        break
+                    timeout = self._heap[0][0] - self.clock() if self._heap else None
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+            for outcome in self.run_due():
+                if self.on_outcome is not None:
+                    self.on_outcome(outcome)
+
+    def _push(self, subscription: Subscription):
+        heapq.heappush(self._heap, (subscription.next_due, next(self._sequence), subscription.subscription_id))
+
+    def _discard_stale(self):
+        while self._heap:
+            due, _, subscription_id = self._heap[0]
+            subscription = self._subscriptions.get(subscription_id)
+            if subscription is not None and subscription.next_due == due:
+                return
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, now: float) -> list[Subscription]:
+        due: list[Subscription] = []
+        with self._condition:
+            while len(due) < self.batch_size:
+                self._discard_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, subscription_id = heapq.heappop(self._heap)
+                due.append(self._subscriptions[subscription_id])
+        return due
+
+    def _reschedule(
+        self,
+        subscription: Subscription,
+        response: Optional[PaymentResponse],
+        error: Optional[str],
+        now: float,
+    ) -> BillingOutcome:
+        due = subscription.next_due
+        if not subscription.active:
+            return BillingOutcome(subscription.subscription_id, due, CANCELED, response, error)
+        if response is not None and response.status != "failed":
+            subscription.failures = 0
+            elapsed = max(0, int((now - subscription.period_start) // subscription.interval))
+            subscription.period_start += (elapsed + 1) * subscription.interval
+            subscription.next_due = subscription.period_start
+            status = CHARGED
+        elif subscription.failures < len(self.retry_delays):
+            subscription.next_due = now + self.retry_delays[subscription.failures]
+            subscription.failures += 1
+            status = RETRY
+        else:
+            subscription.active = False
+            self._subscriptions.pop(subscription.subscription_id, None)
+            status = CANCELED
+        if subscription.active:
+            self._push(subscription)
+        if error is None and status != CHARGED and response is not None:
+            error = response.message
+        return BillingOutcome(subscription.subscription_id, due, status, response, error)
@@ -0,0 +1,83 @@
+from .commons import PaymentResponse
+
+import json
+import os
+
+
+class RefundCheckpoint:
+    """
+    Archivo de control (una línea JSON por evento) que permite reanudar un reembolso masivo interrumpido.
+    Cada reembolso respondido por el procesador se anota en cuanto termina; cuando el lote se escribe en el
+    log se anota una marca. Al reanudar, los reembolsos anotados no se repiten y los que quedaron después de
+    la última marca se devuelven para registrarlos en el log.
+    """
+    def __init__(self, path: str):
+        """
+        :param path: Ruta del archivo de control; se crea si no existe.
+        :type path: str
+        """
+        self.path = path
+        self.completed: dict[str, PaymentResponse] = {}
+        self.unlogged: list[str] = []
+        complete = True
+        if os.path.exists(path):
+            complete = self._load()
+        self._file = open(path, "a")
+        if not complete:
+            self._file.write("\n")
+
+    def record(self, transaction_id: str, response: PaymentResponse):
+        """
+        Anota un reembolso respondido por el procesador.
+        :param transaction_id: ID de la transacción reembolsada.
+        :type transaction_id: str
+        :param response: Respuesta del reembolso.
+        :type response: PaymentResponse
+        """
+        self.completed[transaction_id] = response
+        self.unlogged.append(transaction_id)
+        self._append({"transaction_id": transaction_id, "response": response.model_dump()})
+
+    def mark_logged(self):
+        """
+        Anota que todos los reembolsos registrados hasta ahora ya están en el log.
+        """
+        self.unlogged.clear()
+        self._append({"logged": True})
+
+    def pending_log(self) -> list[tuple[str, PaymentResponse]]:
+        """
+        :return: Reembolsos ya hechos que todavía no se han escrito en el log.
+        :rtype: list[tuple[str, PaymentResponse]]
+        """
+        return [(transaction_id, self.completed[transaction_id]) for transaction_id in self.unlogged]
+
+    def close(self):
+        """
+        Cierra el archivo de control.
+        """
+        self._file.close()
+
+    def _append(self, entry: dict):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def _load(self) -> bool:
+        """
+        Lee el archivo de control ignorando una última línea a medio escribir.
+        :return: False si el archivo no termina en salto de línea.
+        :rtype: bool
+        """
+        line = "\n"
+        with open(self.path) as checkpoint_file:
+            for line in checkpoint_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("logged"):
+                    self.unlogged.clear()
+                elif "transaction_id" in entry:
+                    self.completed[entry["transaction_id"]] = PaymentResponse(**entry["response"])
+                    self.unlogged.append(entry["transaction_id"])
+        return line.endswith("\n")
@@ -1,11 +1,22 @@
-from .commons import CustomerData, PaymentData, PaymentResponse
+from .caching import IdempotencyCache
+from .commons import BatchItemResult, CustomerData, PaymentBatch, PaymentData, PaymentResponse, RefundResult
 from .loggers import TransactionLogger
+from .metrics import MetricsRegistry
 from .notifiers import NotifierProtocol
 from .processors import PaymentProcessorProtocol, RefundPaymentProtocol, RecurringPaymentProtocol
-from .validators import CustomerValidator, PaymentDataValidator
+from .rate_limiter import TokenBucket
+from .refund_checkpoint import RefundCheckpoint
+from .validators import OK, CustomerValidator, PaymentDataValidator
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Optional
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+STAGE_SECONDS = "payment_stage_seconds"
+PROCESSOR_REQUESTS = "payment_processor_requests_total"
+_NOT_TIMED = nullcontext()
 
 
 @dataclass
@@ -13,6 +24,7 @@ class PaymentService:
     """
     Servicio de procesamiento de pagos que utiliza un procesador de pagos, un notificador y validadores de datos.
     Este servicio permite procesar transacciones de pago, reembolsos y pagos recurrentes.
+    Con un MetricsRegistry en metrics se mide la latencia de cada etapa y se cuentan los éxitos y fallos por procesador.
     """
     payment_processor: PaymentProcessorProtocol
     notifier: NotifierProtocol
@@ -21,29 +33,154 @@ class PaymentService:
     logger: TransactionLogger
     recurring_processor: Optional[RecurringPaymentProtocol] = None
     refund_processor: Optional[RefundPaymentProtocol] = None
+    idempotency_cache: Optional[IdempotencyCache] = None
+    metrics: Optional[MetricsRegistry] = None
 
+    def __post_init__(self):
+        if self.metrics is not None:
+            self.metrics.describe(STAGE_SECONDS, "Duración de cada etapa de una operación de pago en segundos.")
+            self.metrics.describe(PROCESSOR_REQUESTS, "Llamadas a procesadores de pago por resultado.")
 
-    def process_transaction(self, customer_data: CustomerData, payment_data: PaymentData) -> PaymentResponse:
+    def process_transaction(
+        self,
+        customer_data: CustomerData,
+        payment_data: PaymentData,
+        idempotency_key: Optional[str] = None,
+    ) -> PaymentResponse:
         """
         Procesa una transacción de pago utilizando el procesador de pagos.
+        Si el servicio tiene caché de idempotencia, un reintento con la misma clave devuelve la respuesta
+        guardada sin volver a llamar al procesador, al notificador ni al logger. Sin clave, el cargo solo se
+        deduplica si la caché se creó con derive_keys=True.
         :param customer_data: Datos del cliente que incluyen nombre y contacto.
         :type customer_data: CustomerData
         :param payment_data: Datos del pago que incluyen monto y fuente de pago.
         :type payment_data: PaymentData
+        :param idempotency_key: Clave enviada por el cliente para identificar el cargo entre reintentos.
+        :type idempotency_key: Optional[str]
         :return: Un objeto PaymentResponse que contiene el estado de la transacción, el monto, el ID de la transacción y un mensaje.
         :rtype: PaymentResponse
+        :raises IdempotencyKeyMismatchError: Si la clave ya se usó con otros datos de cliente o de pago.
         """
-        self.customer_validator.validate(customer_data)
-        self.payment_validator.validate(payment_data)
-        payment_response = self.payment_processor.process_transaction(
-            customer_data, payment_data
-        )
-        self.notifier.send_confirmation(customer_data)
-        self.logger.log_transaction(
-            customer_data, payment_data, payment_response
+        cache = self.idempotency_cache
+        if cache is None or (idempotency_key is None and not cache.derive_keys):
+            return self._process_transaction(customer_data, payment_data)
+        fingerprint = cache.make_key(customer_data, payment_data)
+        return cache.get_or_process(
+            idempotency_key or fingerprint,
+            lambda: self._process_transaction(customer_data, payment_data),
+            fingerprint=fingerprint,
+            ttl=None if idempotency_key else cache.derived_ttl,
         )
+
+    def _process_transaction(self, customer_data: CustomerData, payment_data: PaymentData) -> PaymentResponse:
+        with self._timed("transaction", "validate"):
+            self.customer_validator.validate(customer_data)
+            self.payment_validator.validate(payment_data)
+        with self._timed("transaction", "processor"):
+            payment_response = self._call_processor(
+                "transaction", self.payment_processor.process_transaction, customer_data, payment_data
+            )
+        with self._timed("transaction", "notify"):
+            self.notifier.send_confirmation(customer_data)
+        with self._timed("transaction", "log"):
+            self.logger.log_transaction(
+                customer_data, payment_data, payment_response
+            )
         return payment_response
 
+    def process_batch(
+        self,
+        items: Union[PaymentBatch, Iterable[tuple[CustomerData, PaymentData]]],
+        max_workers: int = 8,
+        log: bool = True,
+    ) -> list[BatchItemResult]:
+        """
+        Procesa un lote de transacciones despachando las llamadas al procesador de forma concurrente.
+        Primero se validan todos los elementos en bloque; los inválidos no llegan al procesador. Los válidos se
+        cobran y notifican en un pool de hilos acotado y, al final, se registran en el log en el orden original.
+        Con un PaymentBatch la validación se hace sobre las columnas y los modelos solo se crean para las filas válidas.
+        Los validadores sin validación en bloque (validate_many/validate_columns y message), o que redefinen
+        validate() en una subclase, se aplican elemento a elemento con validate(), y el mensaje de su ValueError se
+        guarda como error. En ese caso un PaymentBatch se materializa una sola vez y los mismos modelos se validan
+        y se cobran.
+        :param items: Un PaymentBatch o pares (CustomerData, PaymentData) a procesar.
+        :type items: Union[PaymentBatch, Iterable[tuple[CustomerData, PaymentData]]]
+        :param max_workers: Número máximo de llamadas simultáneas al procesador.
+        :type max_workers: int
+        :param log: Si es False no se escribe en el log; lo usa quien registra los resultados por su cuenta.
+        :type log: bool
+        :return: Un BatchItemResult por elemento, en el mismo orden de entrada, con la respuesta o el error.
+        :rtype: list[BatchItemResult]
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if isinstance(items, PaymentBatch) and all(
+            _has_bulk(validator, "validate_columns") for validator in (self.customer_validator, self.payment_validator)
+        ):
+            columns = items.columns()
+            customer_errors = _batch_errors(self.customer_validator, "validate_columns", columns, items, 0)
+            payment_errors = _batch_errors(self.payment_validator, "validate_columns", columns, items, 1)
+            row = items.row
+        else:
+            pending = list(items)
+            customer_errors = _batch_errors(
+                self.customer_validator, "validate_many", [customer for customer, _ in pending], pending, 0
+            )
+            payment_errors = _batch_errors(
+                self.payment_validator, "validate_many", [payment for _, payment in pending], pending, 1
+            )
+            row = pending.__getitem__
+        results = [BatchItemResult(index=index) for index in range(len(customer_errors))]
+
+        valid: dict[int, tuple[CustomerData, PaymentData]] = {}
+        for index, (customer_error, payment_error) in enumerate(zip(customer_errors, payment_errors)):
+            error = customer_error or payment_error
+            if error is not None:
+                results[index].error = error
+            else:
+                valid[index] = row(index)
+
+        if valid:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(valid))) as executor:
+                futures = {
+                    index: executor.submit(self._charge_and_notify, *pair)
+                    for index, pair in valid.items()
+                }
+                for index, future in futures.items():
+                    results[index].response, results[index].error = future.result()
+
+        if not log:
+            return results
+        for index, (customer_data, payment_data) in valid.items():
+            if results[index].response is not None:
+                self.logger.log_transaction(customer_data, payment_data, results[index].response)
+        return results
+
+    def _charge_and_notify(
+        self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> tuple[Optional[PaymentResponse], Optional[str]]:
+        """
+        Cobra y notifica un único elemento de un lote sin propagar excepciones.
+        :param customer_data: Datos del cliente que incluyen nombre y contacto.
+        :type customer_data: CustomerData
+        :param payment_data: Datos del pago que incluyen monto y fuente de pago.
+        :type payment_data: PaymentData
+        :return: La respuesta del procesador (si la hubo) y el mensaje de error (si lo hubo).
+        :rtype: tuple[Optional[PaymentResponse], Optional[str]]
+        """
+        try:
+            payment_response = self._call_processor(
+                "batch", self.payment_processor.process_transaction, customer_data, payment_data
+            )
+        except Exception as e:
+            return None, str(e)
+        try:
+            self.notifier.send_confirmation(customer_data)
+        except Exception as e:
+            return payment_response, f"Notification failed: {e}"
+        return payment_response, None
+
     def process_refund(self, transaction_id: str):
         """
         Procesa un reembolso utilizando el procesador de reembolsos.
@@ -51,13 +188,139 @@ class PaymentService:
         :type transaction_id: str
         :return: Un objeto PaymentResponse que contiene el estado del reembolso, el monto, el ID de la transacción y un mensaje.
         :rtype: PaymentResponse
+        :raises ValueError: Si el logger admite búsquedas y la transacción original no está registrada en él.
         """
         if not self.refund_processor:
             raise Exception("Este procesador no soporta reembolsos.")
-        refund_response = self.refund_processor.refund_payment(transaction_id)
-        self.logger.log_refund(transaction_id, refund_response)
+        with self._timed("refund", "validate"):
+            self._require_logged(transaction_id)
+        with self._timed("refund", "processor"):
+            refund_response = self._call_processor(
+                "refund", self.refund_processor.refund_payment, transaction_id
+            )
+        with self._timed("refund", "log"):
+            self.logger.log_refund(transaction_id, refund_response)
         return refund_response
 
+    def process_refunds(
+        self,
+        transaction_ids: Iterable[str],
+        max_workers: int = 8,
+        rate_per_second: Optional[float] = None,
+        checkpoint_path: Optional[str] = None,
+    ) -> Iterator[RefundResult]:
+        """
+        Reembolsa varias transacciones en paralelo y devuelve los resultados a medida que terminan.
+        Los IDs repetidos se reembolsan una sola vez. Todos los reembolsos respondidos por el procesador se
+        registran juntos, con una única escritura en el log, al agotar el iterador o al cerrarlo antes de tiempo.
+        Con checkpoint_path, un reembolso masivo interrumpido puede reanudarse con la misma lista de IDs: los ya
+        reembolsados no se repiten y se devuelven con su respuesta guardada.
+        :param transaction_ids: IDs de las transacciones a reembolsar.
+        :type transaction_ids: Iterable[str]
+        :param max_workers: Número máximo de reembolsos simultáneos.
+        :type max_workers: int
+        :param rate_per_second: Máximo de llamadas por segundo al procesador; None para no limitar.
+        :type rate_per_second: Optional[float]
+        :param checkpoint_path: Archivo de control para reanudar el reembolso masivo.
+        :type checkpoint_path: Optional[str]
+        :return: Un iterador de RefundResult en orden de finalización.
+        :rtype: Iterator[RefundResult]
+        """
+        if not self.refund_processor:
+            raise Exception("Este procesador no soporta reembolsos.")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        unique_ids = list(dict.fromkeys(transaction_ids))
+        bucket = TokenBucket(rate_per_second, max(1.0, rate_per_second)) if rate_per_second else None
+        return self._process_refunds(unique_ids, max_workers, bucket, checkpoint_path)
+
+    def _process_refunds(
+        self,
+        transaction_ids: list[str],
+        max_workers: int,
+        bucket: Optional[TokenBucket],
+        checkpoint_path: Optional[str],
+    ) -> Iterator[RefundResult]:
+        checkpoint = RefundCheckpoint(checkpoint_path) if checkpoint_path else None
+        to_log: list[tuple[str, PaymentResponse]] = []
+        pending_ids = transaction_ids
+        if checkpoint is not None:
+            to_log.extend(checkpoint.pending_log())
+            pending_ids = [
+                transaction_id for transaction_id in transaction_ids if transaction_id not in checkpoint.completed
+            ]
+        remaining = iter(pending_ids)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        in_flight: set[Future] = set()
+
+        def collect(result: RefundResult):
+            if result.response is not None:
+                to_log.append((result.transaction_id, result.response))
+                if checkpoint is not None:
+                    checkpoint.record(result.transaction_id, result.response)
+
+        try:
+            if checkpoint is not None:
+                for transaction_id in transaction_ids:
+                    if transaction_id in checkpoint.completed:
+                        yield RefundResult(transaction_id=transaction_id, response=checkpoint.completed[transaction_id])
+            in_flight.update(
+                executor.submit(self._refund_one, transaction_id, bucket)
+                for transaction_id in islice(remaining, max_workers * 2)
+            )
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                in_flight.update(
+                    executor.submit(self._refund_one, transaction_id, bucket)
+                    for transaction_id in islice(remaining, len(done))
+                )
+                results = [future.result() for future in done]
+                for result in results:
+                    collect(result)
+                yield from results
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for future in in_flight:
+                if not future.cancelled():
+                    collect(future.result())
+            if to_log:
+                self.logger.log_refunds(to_log)
+            if checkpoint is not None:
+                if to_log:
+                    checkpoint.mark_logged()
+                checkpoint.close()
+
+    def _refund_one(self, transaction_id: str, bucket: Optional[TokenBucket]) -> RefundResult:
+        """
+        Reembolsa una transacción de un reembolso masivo sin propagar excepciones ni escribir en el log.
+        :param transaction_id: ID de la transacción a reembolsar.
+        :type transaction_id: str
+        :param bucket: Limitador de ritmo compartido por el reembolso masivo, si lo hay.
+        :type bucket: Optional[TokenBucket]
+        :return: El resultado con la respuesta del procesador o el error.
+        :rtype: RefundResult
+        """
+        try:
+            self._require_logged(transaction_id)
+            if bucket is not None:
+                bucket.acquire()
+            response = self._call_processor("refund", self.refund_processor.refund_payment, transaction_id)
+        except Exception as e:
+            return RefundResult(transaction_id=transaction_id, error=str(e))
+        return RefundResult(transaction_id=transaction_id, response=response)
+
+    def _require_logged(self, transaction_id: str):
+        """
+        Comprueba que el cargo a reembolsar esté registrado, si el logger admite búsquedas.
+        :param transaction_id: ID de la transacción a reembolsar.
+        :type transaction_id: str
+        :raises ValueError: Si el logger admite búsquedas y no encuentra la transacción.
+        """
+        if self.logger.supports_lookup and self.logger.find_transaction(transaction_id) is None:
+            raise ValueError(f"Transaction {transaction_id} not found in the transaction log")
+
     def setup_recurring(self, customer_data: CustomerData, payment_data: PaymentData):
         """
         Configura un pago recurrente utilizando el procesador de pagos recurrentes.
@@ -70,10 +333,100 @@ class PaymentService:
         """
         if not self.recurring_processor:
             raise Exception("Este procesador no soporta pagos recurrentes.")
-        recurring_response = self.recurring_processor.setup_recurring_payment(
-            customer_data, payment_data
-        )
-        self.logger.log_transaction(
-            customer_data, payment_data, recurring_response
-        )
-        return recurring_response
\ No newline at end of file
+        with self._timed("recurring", "processor"):
+            recurring_response = self._call_processor(
+                "recurring", self.recurring_processor.setup_recurring_payment, customer_data, payment_data
+            )
+        with self._timed("recurring", "log"):
+            self.logger.log_transaction(
+                customer_data, payment_data, recurring_response
+            )
+        return recurring_response
+
+    def _timed(self, operation: str, stage: str):
+        """
+        :param operation: Operación instrumentada (transaction, refund, recurring).
+        :type operation: str
+        :param stage: Etapa dentro de la operación (validate, processor, notify, log).
+        :type stage: str
+        :return: Un context manager que mide la etapa, o uno vacío y compartido si no hay métricas.
+        """
+        if self.metrics is None:
+            return _NOT_TIMED
+        return self.metrics.timer(STAGE_SECONDS, operation=operation, stage=stage)
+
+    def _call_processor(self, operation: str, call: Callable[..., PaymentResponse], *args: Any) -> PaymentResponse:
+        """
+        Llama a un método de un procesador y, si hay métricas, cuenta el resultado por procesador.
+        Una excepción o una respuesta con estado "failed" cuentan como fallo.
+        :param operation: Operación instrumentada.
+        :type operation: str
+        :param call: Método del procesador a llamar.
+        :type call: Callable[..., PaymentResponse]
+        :return: La respuesta del procesador.
+        :rtype: PaymentResponse
+        """
+        if self.metrics is None:
+            return call(*args)
+        processor = type(getattr(call, "__self__", call)).__name__
+        try:
+            response = call(*args)
+        except Exception:
+            self.metrics.counter(PROCESSOR_REQUESTS, processor=processor, operation=operation, outcome="failure").inc()
+            raise
+        outcome = "failure" if response.status == "failed" else "success"
+        self.metrics.counter(PROCESSOR_REQUESTS, processor=processor, operation=operation, outcome=outcome).inc()
+        return response
+
+
+def _batch_errors(
+    validator: Any, bulk_method: str, bulk_input: Any, pairs: Iterable[tuple[CustomerData, PaymentData]], part: int
+) -> list[Optional[str]]:
+    """
+    Valida un lote con un validador y devuelve el mensaje de error de cada elemento (None si es válido).
+    Usa el método en bloque del validador y su message() si los tiene; si no, llama a validate() por elemento.
+    :param validator: Validador de clientes o de pagos.
+    :type validator: Any
+    :param bulk_method: "validate_many" o "validate_columns".
+    :type bulk_method: str
+    :param bulk_input: Entrada del método en bloque (los modelos o las columnas).
+    :type bulk_input: Any
+    :param pairs: Pares (CustomerData, PaymentData) del lote, para la validación elemento a elemento.
+    :type pairs: Iterable[tuple[CustomerData, PaymentData]]
+    :param part: 0 para validar el cliente de cada par y 1 para validar el pago.
+    :type part: int
+    :return: Un mensaje de error o None por elemento, en el orden del lote.
+    :rtype: list[Optional[str]]
+    """
+    if _has_bulk(validator, bulk_method):
+        message = validator.message
+        return [None if code == OK else message(code) for code in getattr(validator, bulk_method)(bulk_input)]
+    errors: list[Optional[str]] = []
+    for pair in pairs:
+        try:
+            validator.validate(pair[part])
+        except ValueError as e:
+            errors.append(str(e))
+        else:
+            errors.append(None)
+    return errors
+
+
+def _has_bulk(validator: Any, bulk_method: str) -> bool:
+    """
+    :param validator: Validador de clientes o de pagos.
+    :type validator: Any
+    :param bulk_method: "validate_many" o "validate_columns".
+    :type bulk_method: str
+    :return: True si el validador ofrece el método en bloque y message() y no redefine validate() en una
+        subclase más concreta que la que define el método en bloque (esa validate() prevalece).
+    :rtype: bool
+    """
+    if not (hasattr(validator, bulk_method) and hasattr(validator, "message")):
+        return False
+    mro = type(validator).__mro__
+
+    def owner(attribute: str) -> int:
+        return next((depth for depth, klass in enumerate(mro) if attribute in vars(klass)), len(mro))
+
+    return owner(bulk_method) <= owner("validate")
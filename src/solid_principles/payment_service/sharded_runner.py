@@ -0,0 +1,225 @@
+from .commons import (
+    BatchItemResult,
+    CustomerData,
+    PaymentBatch,
+    PaymentData,
+    PaymentResponse,
+    trusted_batch_item_result,
+    trusted_payment_response,
+)
+from .loggers import TransactionLogger
+from .services import PaymentService
+
+import os
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+_ShardResults = tuple[
+    list[int], list[Optional[str]], list[Optional[int]], list[Optional[str]], list[Optional[str]], list[Optional[str]]
+]
+
+_worker_service: Optional[PaymentService] = None
+
+
+def _init_worker(service_factory: Callable[[], PaymentService]):
+    global _worker_service
+    _worker_service = service_factory()
+
+
+def _shard_positions(batch: PaymentBatch, shard: int, shards: int) -> list[int]:
+    """
+    :return: Las filas del lote que corresponden al shard, según el crc32 de su cliente
+        (customer_id, email, teléfono o nombre).
+    :rtype: list[int]
+    """
+    if shards == 1:
+        return list(range(len(batch)))
+    crc32 = zlib.crc32
+    return [
+        position
+        for position, key in enumerate(zip(batch.customer_ids, batch.emails, batch.phones, batch.names))
+        if crc32((key[0] or key[1] or key[2] or key[3] or "").encode()) % shards == shard
+    ]
+
+
+def _process_shard(window: PaymentBatch, shard: int, shards: int, max_workers: int) -> _ShardResults:
+    """
+    Procesa en el proceso trabajador las filas de la ventana que corresponden a su shard, sin escribir en el log.
+    Todo el trabajo por fila (reparto, construcción de modelos y de respuestas) se hace aquí y no en el proceso principal.
+    :return: Por columnas: la posición de cada fila en la ventana, y el status, amount, transaction_id y message de
+        su respuesta (status None si no la hubo) y su error.
+    :rtype: _ShardResults
+    """
+    positions = _shard_positions(window, shard, shards)
+    part = window if len(positions) == len(window) else window.take(positions)
+    results = _worker_service.process_batch(part, max_workers=max_workers, log=False)
+    responses = [result.response for result in results]
+    return (
+        positions,
+        [None if response is None else response.status for response in responses],
+        [None if response is None else response.amount for response in responses],
+        [None if response is None else response.transaction_id for response in responses],
+        [None if response is None else response.message for response in responses],
+        [result.error for result in results],
+    )
+
+
+def _windows(
+    items: Union[PaymentBatch, Iterable[tuple[CustomerData, PaymentData]]], chunk_size: int
+) -> Iterator[PaymentBatch]:
+    if isinstance(items, PaymentBatch):
+        for start in range(0, len(items), chunk_size):
+            yield items.slice(start, start + chunk_size)
+        return
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield PaymentBatch.from_models(chunk)
+
+
+class ShardedPaymentRunner:
+    """
+    Ejecuta PaymentService repartido entre varios procesos para que la validación y la construcción de modelos
+    no queden limitadas por el GIL.
+    Cada pago se asigna a un shard según el crc32 de su cliente (customer_id, email, teléfono o nombre), así que
+    los pagos de un mismo cliente van siempre al mismo proceso, y cada proceso tiene su propio PaymentService
+    creado con service_factory. Cada ventana de la entrada se corta como un PaymentBatch columnar (unos pocos
+    buffers) y se envía entera a todos los shards: cada uno elige sus filas, las procesa y devuelve los resultados
+    por columnas. El proceso principal solo los coloca en el orden de entrada, los registra en el log con una
+    escritura por ventana y crea cada BatchItemResult cuando se consume.
+    Si un proceso trabajador muere (BrokenProcessPool), sus filas de la ventana se devuelven con el error y el
+    shard se vuelve a crear para las ventanas siguientes.
+    """
+    def __init__(
+        self,
+        service_factory: Callable[[], PaymentService],
+        logger: Optional[TransactionLogger] = None,
+        shards: Optional[int] = None,
+        chunk_size: int = 2000,
+        max_workers: int = 8,
+    ):
+        """
+        :param service_factory: Función a nivel de módulo (serializable con pickle) que crea el PaymentService de cada proceso.
+        :type service_factory: Callable[[], PaymentService]
+        :param logger: Logger del proceso principal; None para no registrar.
+        :type logger: Optional[TransactionLogger]
+        :param shards: Número de procesos trabajadores; por defecto, el número de CPUs.
+        :type shards: Optional[int]
+        :param chunk_size: Pagos leídos de la entrada por ventana antes de repartirlos entre los shards.
+        :type chunk_size: int
+        :param max_workers: Llamadas simultáneas al procesador dentro de cada proceso.
+        :type max_workers: int
+        """
+        self.shards = shards or os.cpu_count() or 1
+        if self.shards < 1 or chunk_size < 1:
+            raise ValueError("shards and chunk_size must be at least 1")
+        self.logger = logger
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self._service_factory = service_factory
+        self._executors = [self._new_executor() for _ in range(self.shards)]
+
+    def run(
+        self, items: Union[PaymentBatch, Iterable[tuple[CustomerData, PaymentData]]]
+    ) -> Iterator[BatchItemResult]:
+        """
+        Procesa los pagos por ventanas de chunk_size; mientras los shards procesan una ventana se reparte la siguiente.
+        :param items: Un PaymentBatch o pares (CustomerData, PaymentData), que pueden llegar como un flujo.
+        :type items: Union[PaymentBatch, Iterable[tuple[CustomerData, PaymentData]]]
+        :return: Un BatchItemResult por pago, en el orden de entrada y con índices globales.
+        :rtype: Iterator[BatchItemResult]
+        """
+        windows = _windows(items, self.chunk_size)
+        in_flight: deque = deque()
+        offset = 0
+        while True:
+            window = next(windows, None)
+            if window is not None:
+                in_flight.append((window, offset, self._submit(window)))
+                offset += len(window)
+            if in_flight and (window is None or len(in_flight) > 1):
+                yield from self._collect(*in_flight.popleft())
+            if window is None and not in_flight:
+                return
+
+    def close(self):
+        """
+        Detiene los procesos trabajadores.
+        """
+        for executor in self._executors:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(self._service_factory,))
+
+    def _submit(self, window: PaymentBatch) -> list[tuple[ProcessPoolExecutor, Future]]:
+        submitted = []
+        for shard, executor in enumerate(self._executors):
+            try:
+                future = executor.submit(_process_shard, window, shard, self.shards, self.max_workers)
+            except BrokenProcessPool as e:
+                future = Future()
+                future.set_exception(e)
+            submitted.append((executor, future))
+        return submitted
+
+    def _collect(
+        self, window: PaymentBatch, offset: int, submitted: list[tuple[ProcessPoolExecutor, Future]]
+    ) -> Iterator[BatchItemResult]:
+        size = len(window)
+        statuses: list[Optional[str]] = [None] * size
+        amounts: list[Optional[int]] = [None] * size
+        transaction_ids: list[Optional[str]] = [None] * size
+        messages: list[Optional[str]] = [None] * size
+        errors: list[Optional[str]] = [None] * size
+        for shard, (executor, future) in enumerate(submitted):
+            try:
+                positions, *columns = future.result()
+            except BrokenProcessPool as e:
+                if self._executors[shard] is executor:
+                    executor.shutdown(wait=False)
+                    self._executors[shard] = self._new_executor()
+                for position in _shard_positions(window, shard, self.shards):
+                    errors[position] = f"Shard {shard} failed: {e}"
+                continue
+            for target, values in zip((statuses, amounts, transaction_ids, messages, errors), columns):
+                for position, value in zip(positions, values):
+                    target[position] = value
+
+        def response(position: int) -> Optional[PaymentResponse]:
+            if statuses[position] is None:
+                return None
+            return trusted_payment_response(
+                status=statuses[position],
+                amount=amounts[position],
+                transaction_id=transaction_ids[position],
+                message=messages[position],
+            )
+
+        responses: dict[int, PaymentResponse] = {}
+        if self.logger is not None:
+            responses = {position: response(position) for position in range(size) if statuses[position] is not None}
+            names, amounts_in, sources = window.names, window.amounts, window.sources
+            currencies, codes = window.currencies, window.currency_codes
+            self.logger.log_charges(
+                (names[position], amounts_in[position], sources[position], currencies[codes[position]], charged)
+                for position, charged in responses.items()
+            )
+        for position in range(size):
+            yield trusted_batch_item_result(
+                index=offset + position,
+                response=responses[position] if position in responses else response(position),
+                error=errors[position],
+            )
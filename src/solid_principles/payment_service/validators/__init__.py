@@ -1,7 +1,13 @@
-from .customer_validator import CustomerValidator
-from .payment_data_validator import PaymentDataValidator
+from .customer_validator import CUSTOMER_RULES, CustomerValidator
+from .payment_data_validator import PAYMENT_RULES, PaymentDataValidator
+from .rule_engine import OK, Rule, RuleSet
 
 __all__ = [
+    "CUSTOMER_RULES",
     "CustomerValidator",
+    "OK",
+    "PAYMENT_RULES",
     "PaymentDataValidator",
+    "Rule",
+    "RuleSet",
 ]
\ No newline at end of file
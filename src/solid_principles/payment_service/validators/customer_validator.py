@@ -1,9 +1,25 @@
 from ..commons import CustomerData
+from .rule_engine import OK, Rule, RuleSet
+
+from array import array
+from typing import Iterable, Mapping, Optional, Sequence
+
+MISSING_NAME = 1
+MISSING_CONTACT = 2
+
+CUSTOMER_RULES = RuleSet([
+    Rule.required("name", MISSING_NAME, "Invalid customer data: missing name"),
+    Rule.any_of(
+        ("contact_info.email", "contact_info.phone"),
+        MISSING_CONTACT,
+        "Invalid customer data: missing email and phone",
+    ),
+])
 
 
 class CustomerValidator:
     """
-    Validador de datos del cliente.
+    Validador de datos del cliente. validate() y la validación en bloque evalúan las mismas reglas (CUSTOMER_RULES).
     """
     def validate(self, customer_data: CustomerData):
         """
@@ -12,12 +28,35 @@ class CustomerValidator:
         :type customer_data: CustomerData
         :raises ValueError: Si los datos del cliente son inválidos, como falta de nombre o información de contacto.
         """
-        if not customer_data.name:
-            print("datos del cliente invalidos: hay que enviar un nombre")
-            raise ValueError("Invalid customer data: missing name")
-        if not customer_data.contact_info:
-            print("datos del cliente invalidos: falta información de contacto")
-            raise ValueError("Invalid customer data: missing contact info")
-        if not (customer_data.contact_info.email or customer_data.contact_info.phone):
-            print("datos del cliente invalidos: hay que enviar un email o telefono")
-            raise ValueError("Invalid customer data: missing email and phone")
\ No newline at end of file
+        code = CUSTOMER_RULES.check_record(customer_data)
+        if code != OK:
+            raise ValueError(CUSTOMER_RULES.message(code))
+
+    def validate_many(self, customers: Iterable[CustomerData]) -> array:
+        """
+        Valida un lote de clientes sin imprimir ni lanzar excepciones por cada registro.
+        :param customers: Datos de los clientes a validar.
+        :type customers: Iterable[CustomerData]
+        :return: Un código de error por cliente (0 si es válido); message traduce cada código.
+        :rtype: array
+        """
+        return CUSTOMER_RULES.validate_many(customers)
+
+    def validate_columns(self, columns: Mapping[str, Sequence]) -> array:
+        """
+        Valida un lote columnar con las columnas "name", "contact_info.email" y "contact_info.phone".
+        :param columns: Columnas de valores indexadas por nombre de campo.
+        :type columns: Mapping[str, Sequence]
+        :return: Un código de error por fila (0 si es válida).
+        :rtype: array
+        """
+        return CUSTOMER_RULES.validate_columns(columns)
+
+    def message(self, code: int) -> Optional[str]:
+        """
+        :param code: Código devuelto por validate_many o validate_columns.
+        :type code: int
+        :return: El mensaje de error del código, o None si el cliente es válido.
+        :rtype: Optional[str]
+        """
+        return CUSTOMER_RULES.message(code)
@@ -1,9 +1,21 @@
 from ..commons import PaymentData
+from .rule_engine import OK, Rule, RuleSet
+
+from array import array
+from typing import Iterable, Mapping, Optional, Sequence
+
+MISSING_SOURCE = 1
+NON_POSITIVE_AMOUNT = 2
+
+PAYMENT_RULES = RuleSet([
+    Rule.required("source", MISSING_SOURCE, "Invalid payment data: missing source"),
+    Rule.positive("amount", NON_POSITIVE_AMOUNT, "Invalid payment data: amount must be positive"),
+])
 
 
 class PaymentDataValidator:
     """
-    Validador de datos de pago.
+    Validador de datos de pago. validate() y la validación en bloque evalúan las mismas reglas (PAYMENT_RULES).
     """
     def validate(self, payment_data: PaymentData):
         """
@@ -12,9 +24,35 @@ class PaymentDataValidator:
         :type payment_data: PaymentData
         :raises ValueError: Si los datos de pago son inválidos, como falta de fuente o monto no positivo.
         """
-        if not payment_data.source:
-            print("datos de pago invalidos, falta información de fuente")
-            raise ValueError("Invalid payment data: missing source")
-        if payment_data.amount <= 0:
-            print("datos de pago invalidos, el monto debe ser mayor a cero")
-            raise ValueError("Invalid payment data: amount must be positive")
\ No newline at end of file
+        code = PAYMENT_RULES.check_record(payment_data)
+        if code != OK:
+            raise ValueError(PAYMENT_RULES.message(code))
+
+    def validate_many(self, payments: Iterable[PaymentData]) -> array:
+        """
+        Valida un lote de pagos sin imprimir ni lanzar excepciones por cada registro.
+        :param payments: Datos de los pagos a validar.
+        :type payments: Iterable[PaymentData]
+        :return: Un código de error por pago (0 si es válido); message traduce cada código.
+        :rtype: array
+        """
+        return PAYMENT_RULES.validate_many(payments)
+
+    def validate_columns(self, columns: Mapping[str, Sequence]) -> array:
+        """
+        Valida un lote columnar con las columnas "source" y "amount".
+        :param columns: Columnas de valores indexadas por nombre de campo.
+        :type columns: Mapping[str, Sequence]
+        :return: Un código de error por fila (0 si es válida).
+        :rtype: array
+        """
+        return PAYMENT_RULES.validate_columns(columns)
+
+    def message(self, code: int) -> Optional[str]:
+        """
+        :param code: Código devuelto por validate_many o validate_columns.
+        :type code: int
+        :return: El mensaje de error del código, o None si el pago es válido.
+        :rtype: Optional[str]
+        """
+        return PAYMENT_RULES.message(code)
@@ -0,0 +1,131 @@
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
+
+OK = 0
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Regla de validación declarativa.
+    'kind' indica cómo se compila: "required" (el campo no puede ser vacío), "positive" (número mayor a cero),
+    "any_of" (al menos uno de los campos no vacío) o "predicate" (función propia que retorna True si es válido).
+    """
+    code: int
+    message: str
+    kind: str
+    fields: tuple[str, ...]
+    predicate: Optional[Callable[..., bool]] = None
+
+    @classmethod
+    def required(cls, field: str, code: int, message: str) -> "Rule":
+        return cls(code, message, "required", (field,))
+
+    @classmethod
+    def positive(cls, field: str, code: int, message: str) -> "Rule":
+        return cls(code, message, "positive", (field,))
+
+    @classmethod
+    def any_of(cls, fields: Sequence[str], code: int, message: str) -> "Rule":
+        return cls(code, message, "any_of", tuple(fields))
+
+    @classmethod
+    def custom(cls, fields: Sequence[str], predicate: Callable[..., bool], code: int, message: str) -> "Rule":
+        return cls(code, message, "predicate", tuple(fields), predicate)
+
+
+class RuleSet:
+    """
+    Conjunto de reglas compilado una sola vez en una función Python generada.
+    La función resultante extrae cada campo una sola vez y evalúa las reglas en orden, devolviendo el código
+    de la primera que falla (u OK) sin lanzar excepciones, lo que permite validar lotes completos a la vez.
+    Los campos anidados se indican con puntos (por ejemplo "contact_info.email"); un objeto intermedio None
+    produce el valor None.
+    """
+    def __init__(self, rules: Sequence[Rule]):
+        """
+        :param rules: Reglas en el orden en que deben evaluarse.
+        :type rules: Sequence[Rule]
+        """
+        if any(rule.code == OK for rule in rules):
+            raise ValueError(f"Rule codes must be different from OK ({OK})")
+        self.rules = tuple(rules)
+        self.fields: tuple[str, ...] = tuple(dict.fromkeys(
+            field for rule in self.rules for field in rule.fields
+        ))
+        self._messages = {rule.code: rule.message for rule in self.rules}
+        self.check_record, self.check_values = self._compile()
+
+    def message(self, code: int) -> Optional[str]:
+        """
+        :param code: Código devuelto por la validación.
+        :type code: int
+        :return: El mensaje de la regla correspondiente, o None para OK.
+        :rtype: Optional[str]
+        """
+        return self._messages.get(code)
+
+    def validate_many(self, records: Iterable[Any]) -> array:
+        """
+        Valida una secuencia de registros (modelos u objetos con los mismos atributos).
+        :param records: Registros a validar.
+        :type records: Iterable[Any]
+        :return: Un vector con un código por registro (OK si es válido).
+        :rtype: array
+        """
+        check_record = self.check_record
+        return array("H", [check_record(record) for record in records])
+
+    def validate_columns(self, columns: Mapping[str, Sequence[Any]]) -> array:
+        """
+        Valida un lote en formato columnar: un diccionario de nombre de campo a columna de valores.
+        Deben estar presentes todas las columnas de 'fields' y tener la misma longitud.
+        :param columns: Columnas de valores indexadas por el nombre (con puntos) del campo.
+        :type columns: Mapping[str, Sequence[Any]]
+        :return: Un vector con un código por fila (OK si es válida).
+        :rtype: array
+        """
+        missing = [field for field in self.fields if field not in columns]
+        if missing:
+            raise KeyError(f"Missing columns: {', '.join(missing)}")
+        check_values = self.check_values
+        return array("H", [
+            check_values(*row) for row in zip(*(columns[field] for field in self.fields))
+        ])
+
+    def _compile(self) -> tuple[Callable[[Any], int], Callable[..., int]]:
+        names = {field: f"v{index}" for index, field in enumerate(self.fields)}
+        namespace: dict[str, Any] = {}
+        checks = []
+        for index, rule in enumerate(self.rules):
+            values = [names[field] for field in rule.fields]
+            if rule.kind == "required":
+                condition = f"not {values[0]}"
+            elif rule.kind == "positive":
+                condition = f"{values[0]} is None or {values[0]} <= 0"
+            elif rule.kind == "any_of":
+                condition = f"not ({' or '.join(values)})"
+            elif rule.kind == "predicate":
+                namespace[f"p{index}"] = rule.predicate
+                condition = f"not p{index}({', '.join(values)})"
+            else:
+                raise ValueError(f"Unknown rule kind: {rule.kind}")
+            checks.append(f"    if {condition}:\n        return {rule.code}\n")
+        body = "".join(checks) + f"    return {OK}\n"
+
+        extraction = []
+        for field, name in names.items():
+            parts = field.split(".")
+            expression = "record"
+            for depth, part in enumerate(parts[:-1]):
+                extraction.append(f"    t{depth} = {expression}.{part} if {expression} is not None else None\n")
+                expression = f"t{depth}"
+            extraction.append(f"    {name} = {expression}.{parts[-1]} if {expression} is not None else None\n")
+
+        source = (
+            f"def check_values({', '.join(names.values())}):\n{body}\n"
+            f"def check_record(record):\n{''.join(extraction)}{body}"
+        )
+        exec(compile(source, "<rule_set>", "exec"), namespace)
+        return namespace["check_record"], namespace["check_values"]
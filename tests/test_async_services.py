@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import pytest
+
+from solid_principles.payment_service.async_services import AsyncPaymentService
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from solid_principles.payment_service.loggers import TransactionLogger
+from solid_principles.payment_service.notifiers import SyncToAsyncNotifier
+from solid_principles.payment_service.processors import SyncToAsyncProcessor
+from solid_principles.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class AsyncStubProcessor:
+    """
+    Procesador asíncrono que tarda más en los montos pequeños, de modo que los pagos terminan en orden inverso.
+    """
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def process_transaction(self, customer_data, payment_data):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.001 * (10 - payment_data.amount % 10))
+        finally:
+            self.in_flight -= 1
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id=f"ch_{payment_data.amount}")
+
+
+class AsyncSilentNotifier:
+    async def send_confirmation(self, customer_data):
+        pass
+
+
+class BarrierProcessor:
+    """
+    Procesador bloqueante que solo responde cuando 'parties' llamadas están en curso a la vez.
+    """
+    def __init__(self, parties):
+        self.barrier = threading.Barrier(parties, timeout=5)
+        self.threads = set()
+
+    def process_transaction(self, customer_data, payment_data):
+        self.threads.add(threading.current_thread().name)
+        self.barrier.wait()
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id="ch_1")
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.notified = []
+
+    def send_confirmation(self, customer_data):
+        self.notified.append(customer_data.name)
+
+
+def _customer(name="ana"):
+    return CustomerData(name=name, contact_info=ContactInfo(email=f"{name}@example.com"))
+
+
+def _service(tmp_path, processor, notifier=None, **kwargs):
+    return AsyncPaymentService(
+        payment_processor=processor,
+        notifier=notifier or AsyncSilentNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(str(tmp_path / "transactions.log")),
+        **kwargs,
+    )
+
+
+def test_process_many_keeps_input_order_and_reports_errors_per_item(tmp_path):
+    service = _service(tmp_path, AsyncStubProcessor())
+    items = [(_customer(), PaymentData(amount=100 + index, source="tok")) for index in range(5)]
+    items.insert(2, (_customer(), PaymentData(amount=100, source="")))
+
+    results = asyncio.run(service.process_many(items))
+
+    assert [result.index for result in results] == list(range(6))
+    assert [result.response.amount if result.response else None for result in results] == [100, 101, None, 102, 103, 104]
+    assert results[2].error and results[2].response is None
+    assert (tmp_path / "transactions.log").read_text().count("Transaction ID:") == 5
+
+
+def test_max_concurrency_bounds_payments_in_flight(tmp_path):
+    processor = AsyncStubProcessor()
+    service = _service(tmp_path, processor)
+    items = [(_customer(), PaymentData(amount=100 + index, source="tok")) for index in range(20)]
+
+    asyncio.run(service.process_many(items, max_concurrency=3))
+
+    assert processor.peak == 3
+
+
+def test_max_concurrency_must_be_positive(tmp_path):
+    service = _service(tmp_path, AsyncStubProcessor())
+
+    with pytest.raises(ValueError):
+        asyncio.run(service.process_many([], max_concurrency=0))
+
+
+def test_sync_adapters_run_blocking_calls_concurrently_off_the_event_loop(tmp_path):
+    blocking = BarrierProcessor(4)
+    processor = SyncToAsyncProcessor(blocking, max_workers=4)
+    notifier = RecordingNotifier()
+    service = _service(tmp_path, processor, notifier=SyncToAsyncNotifier(notifier))
+    items = [(_customer(f"c{index}"), PaymentData(amount=100, source="tok")) for index in range(4)]
+
+    results = asyncio.run(service.process_many(items))
+    processor.close()
+
+    assert all(result.response and result.response.status == "success" for result in results)
+    assert blocking.threads and all(name.startswith("sync-processor") for name in blocking.threads)
+    assert sorted(notifier.notified) == ["c0", "c1", "c2", "c3"]
+
+
+def test_refund_without_refund_processor_raises(tmp_path):
+    service = _service(tmp_path, AsyncStubProcessor())
+
+    with pytest.raises(Exception, match="reembolsos"):
+        asyncio.run(service.process_refund("ch_1"))
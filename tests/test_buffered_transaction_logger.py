@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from solid_principles.payment_service.commons import PaymentResponse
+from solid_principles.payment_service.loggers import BufferedTransactionLogger
+from solid_principles.payment_service.loggers import buffered_transaction_logger
+
+
+def _refund(index):
+    return f"ch_{index}", PaymentResponse(status="success", amount=index, message=f"refund {index}")
+
+
+def _expected(indices):
+    return "".join(
+        f"Refund processed for transaction ch_{index}\nRefund status: success\nMessage: refund {index}\n"
+        for index in indices
+    )
+
+
+def test_records_are_written_in_call_order_on_close(tmp_path):
+    path = tmp_path / "transactions.log"
+    logger = BufferedTransactionLogger(str(path), batch_size=3, flush_interval=60, max_buffered=6)
+
+    for index in range(10):
+        logger.log_refund(*_refund(index))
+    logger.close()
+
+    assert path.read_text() == _expected(range(10))
+
+
+def test_max_buffered_is_a_hard_cap(tmp_path, monkeypatch):
+    logger = BufferedTransactionLogger(str(tmp_path / "transactions.log"), batch_size=1, flush_interval=60, max_buffered=2)
+    release = threading.Event()
+    write_batch = logger._write_batch
+
+    def slow_write_batch(records):
+        release.wait()
+        write_batch(records)
+
+    monkeypatch.setattr(logger, "_write_batch", slow_write_batch)
+    producer = threading.Thread(target=lambda: [logger.log_refund(*_refund(index)) for index in range(10)])
+    producer.start()
+    time.sleep(0.2)
+
+    assert producer.is_alive()
+    assert len(logger._buffer) <= 2
+    release.set()
+    producer.join(timeout=5)
+    logger.close()
+    assert (tmp_path / "transactions.log").read_text() == _expected(range(10))
+
+
+def test_fsync_runs_after_each_batch_when_enabled(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(buffered_transaction_logger.os, "fsync", synced.append)
+    logger = BufferedTransactionLogger(str(tmp_path / "transactions.log"), flush_interval=60, fsync=True)
+
+    logger.log_refund(*_refund(1))
+    logger.flush()
+    logger.flush()
+
+    assert synced == [logger._file.fileno()]
+    logger.close()
+
+
+def test_close_is_idempotent_and_rejects_later_records(tmp_path):
+    path = tmp_path / "transactions.log"
+    logger = BufferedTransactionLogger(str(path), flush_interval=60)
+    logger.log_refund(*_refund(1))
+
+    logger.close()
+    logger.close()
+
+    assert path.read_text() == _expected([1])
+    with pytest.raises(ValueError):
+        logger.log_refund(*_refund(2))
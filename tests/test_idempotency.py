@@ -0,0 +1,81 @@
+import pytest
+
+from solid_principles.payment_service.caching import IdempotencyCache, IdempotencyKeyMismatchError, SqliteIdempotencyStore
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from solid_principles.payment_service.loggers import TransactionLogger
+from solid_principles.payment_service.services import PaymentService
+from solid_principles.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class CountingProcessor:
+    def __init__(self):
+        self.calls = 0
+
+    def process_transaction(self, customer_data, payment_data):
+        self.calls += 1
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id=f"ch_{self.calls}")
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+def _service(tmp_path, cache):
+    processor = CountingProcessor()
+    service = PaymentService(
+        payment_processor=processor,
+        notifier=SilentNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(str(tmp_path / "transactions.log")),
+        idempotency_cache=cache,
+    )
+    return service, processor
+
+
+def _payment(amount=100):
+    return CustomerData(name="ana", contact_info=ContactInfo(email="ana@example.com")), PaymentData(amount=amount, source="tok")
+
+
+def test_identical_purchases_without_key_are_both_charged(tmp_path):
+    service, processor = _service(tmp_path, IdempotencyCache())
+
+    first = service.process_transaction(*_payment())
+    second = service.process_transaction(*_payment())
+
+    assert processor.calls == 2
+    assert first.transaction_id != second.transaction_id
+
+
+def test_retry_with_same_key_is_not_charged_again(tmp_path):
+    service, processor = _service(tmp_path, IdempotencyCache())
+
+    first = service.process_transaction(*_payment(), idempotency_key="order-1")
+    second = service.process_transaction(*_payment(), idempotency_key="order-1")
+
+    assert processor.calls == 1
+    assert second.transaction_id == first.transaction_id
+
+
+def test_reused_key_with_different_payload_raises(tmp_path):
+    store = SqliteIdempotencyStore(str(tmp_path / "idempotency.sqlite3"))
+    service, processor = _service(tmp_path, IdempotencyCache(store=store))
+    service.process_transaction(*_payment(100), idempotency_key="order-1")
+
+    with pytest.raises(IdempotencyKeyMismatchError):
+        service.process_transaction(*_payment(250), idempotency_key="order-1")
+
+    restarted, _ = _service(tmp_path, IdempotencyCache(store=store))
+    with pytest.raises(IdempotencyKeyMismatchError):
+        restarted.process_transaction(*_payment(250), idempotency_key="order-1")
+    assert processor.calls == 1
+
+
+def test_derived_keys_are_opt_in_and_short_lived(tmp_path):
+    service, processor = _service(tmp_path, IdempotencyCache(derive_keys=True, derived_ttl=0.0))
+
+    service.process_transaction(*_payment())
+    service.process_transaction(*_payment())
+
+    assert processor.calls == 2
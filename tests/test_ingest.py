@@ -0,0 +1,97 @@
+import json
+
+from solid_principles.payment_service.commons import PaymentResponse
+from solid_principles.payment_service.ingest import PaymentFileIngestor
+from solid_principles.payment_service.loggers import TransactionLogger
+from solid_principles.payment_service.services import PaymentService
+from solid_principles.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class RecordingProcessor:
+    def __init__(self):
+        self.charged = []
+
+    def process_transaction(self, customer_data, payment_data):
+        self.charged.append((customer_data.name, customer_data.contact_info.phone, payment_data.amount))
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id=f"ch_{len(self.charged)}")
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+def _service(tmp_path, processor):
+    return PaymentService(
+        payment_processor=processor,
+        notifier=SilentNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(str(tmp_path / "transactions.log")),
+    )
+
+
+def _ingest(tmp_path, rows):
+    input_path = tmp_path / "payments.jsonl"
+    input_path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    processor = RecordingProcessor()
+    service = _service(tmp_path, processor)
+    results_path = tmp_path / "results.jsonl"
+    summary = PaymentFileIngestor(service).ingest(str(input_path), str(results_path))
+    results = [json.loads(line) for line in results_path.read_text().splitlines()]
+    return processor, summary, results
+
+
+def test_fractional_amounts_are_rejected_not_truncated(tmp_path):
+    processor, summary, results = _ingest(tmp_path, [
+        {"name": "ana", "email": "a@example.com", "source": "tok", "amount": 12.99},
+        {"name": "bob", "email": "b@example.com", "source": "tok", "amount": "7.5"},
+        {"name": "eva", "email": "e@example.com", "source": "tok", "amount": 1200.0},
+    ])
+
+    assert processor.charged == [("eva", None, 1200)]
+    assert [result["error"] for result in results] == ["Invalid amount: 12.99", "Invalid amount: 7.5", None]
+    assert (summary.succeeded, summary.failed) == (1, 2)
+
+
+def test_non_string_fields_are_converted_or_reported_per_row(tmp_path):
+    processor, summary, results = _ingest(tmp_path, [
+        {"name": "ana", "phone": 5551234, "source": "tok", "amount": 100},
+        {"name": "bob", "email": {"x": 1}, "source": "tok", "amount": 100},
+        {"name": "eva", "email": "e@example.com", "source": "tok", "amount": 100},
+    ])
+
+    assert processor.charged == [("ana", "5551234", 100), ("eva", None, 100)]
+    assert results[1]["status"] == "error" and results[1]["error"].startswith("Invalid email")
+    assert summary.rows == 3
+
+
+def test_csv_with_byte_order_mark_keeps_its_header(tmp_path):
+    input_path = tmp_path / "payments.csv"
+    input_path.write_bytes("\ufeffname,email,source,amount\nana,a@example.com,tok,100\n".encode("utf-8"))
+    processor = RecordingProcessor()
+    service = _service(tmp_path, processor)
+
+    summary = PaymentFileIngestor(service).ingest(str(input_path), str(tmp_path / "results.jsonl"))
+
+    assert processor.charged == [("ana", None, 100)]
+    assert summary.succeeded == 1
+
+
+def test_resume_skips_rows_that_already_have_a_result(tmp_path):
+    rows = [{"name": f"c{index}", "email": "c@example.com", "source": "tok", "amount": 100 + index} for index in range(5)]
+    input_path = tmp_path / "payments.jsonl"
+    input_path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    results_path = tmp_path / "results.jsonl"
+    results_path.write_text(
+        json.dumps({"line": 1, "status": "success"}) + "\n"
+        + json.dumps({"line": 2, "status": "success"}) + "\n"
+        + '{"line": 3, "sta'
+    )
+    processor = RecordingProcessor()
+
+    summary = PaymentFileIngestor(_service(tmp_path, processor)).ingest(str(input_path), str(results_path), resume=True)
+
+    assert [amount for _, _, amount in processor.charged] == [102, 103, 104]
+    assert (summary.skipped, summary.rows) == (2, 3)
+    assert [json.loads(line)["line"] for line in results_path.read_text().splitlines()] == [1, 2, 3, 4, 5]
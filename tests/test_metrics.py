@@ -0,0 +1,101 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from solid_principles.payment_service.metrics import LatencyHistogram, MetricsExporter, MetricsRegistry
+
+
+def _uniform_histogram(count=10000):
+    histogram = LatencyHistogram()
+    for index in range(1, count + 1):
+        histogram.record(index / 1e6)
+    return histogram
+
+
+def test_percentiles_are_within_one_percent():
+    histogram = _uniform_histogram()
+
+    for percent in (50, 90, 99, 99.9):
+        expected = percent * 10000 / 100 / 1e6
+        assert abs(histogram.percentile(percent) - expected) / expected < 0.01
+    assert histogram.percentile(100) == histogram.max == 0.01
+
+
+def test_empty_histogram_reports_zero():
+    histogram = LatencyHistogram()
+
+    assert histogram.percentile(99) == 0.0
+    assert histogram.snapshot()["count"] == 0
+
+
+def test_bucket_counts_never_include_values_above_the_bound():
+    exact = LatencyHistogram(bounds=[0.001, 0.0025])
+    approximate = LatencyHistogram()
+    for value in (0.00099, 0.001, 0.001004, 0.003):
+        exact.record(value)
+        approximate.record(value)
+
+    assert exact.bucket_counts([0.001, 0.0025]) == [2, 3]
+    low, high = approximate.bucket_counts([0.001, 0.0025])
+    assert low <= 2 and high == 3
+
+
+def test_merge_adds_counts_and_rejects_incompatible_histograms():
+    first = _uniform_histogram(100)
+    second = LatencyHistogram()
+    second.record(1.0)
+
+    first.merge(second)
+
+    assert (first.count, first.max) == (101, 1.0)
+    assert first.percentile(100) == 1.0
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(precision_bits=8))
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(bounds=[0.001]))
+
+
+def test_prometheus_text_has_headers_cumulative_buckets_and_escaped_labels():
+    registry = MetricsRegistry(buckets=(0.001, 0.01))
+    registry.describe("payments_total", "Pagos procesados")
+    registry.counter("payments_total", status="success").inc(3)
+    latency = registry.histogram("charge_seconds", backend='a"b\\c')
+    for value in (0.0005, 0.001, 0.005, 0.5):
+        latency.record(value)
+
+    lines = registry.prometheus_text().splitlines()
+
+    labels = 'backend="a\\"b\\\\c"'
+    assert lines == [
+        "# HELP payments_total Pagos procesados",
+        "# TYPE payments_total counter",
+        'payments_total{status="success"} 3',
+        "# TYPE charge_seconds histogram",
+        f'charge_seconds_bucket{{{labels},le="0.001"}} 2',
+        f'charge_seconds_bucket{{{labels},le="0.01"}} 3',
+        f'charge_seconds_bucket{{{labels},le="+Inf"}} 4',
+        f"charge_seconds_sum{{{labels}}} {0.0005 + 0.001 + 0.005 + 0.5}",
+        f"charge_seconds_count{{{labels}}} 4",
+    ]
+
+
+def test_exporter_serves_text_and_json_and_rejects_other_paths():
+    registry = MetricsRegistry()
+    registry.counter("payments_total").inc()
+
+    with MetricsExporter(registry, port=0) as exporter:
+        host, port = exporter.address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            content_type = response.headers["Content-Type"]
+            text = response.read().decode()
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics.json", timeout=5) as response:
+            snapshot = json.load(response)
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://{host}:{port}/other", timeout=5)
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "payments_total 1" in text.splitlines()
+    assert snapshot == {"payments_total": [{"labels": {}, "value": 1}]}
+    assert error.value.code == 404
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData
+from solid_principles.payment_service.notifiers import NotificationOutbox
+
+
+def _customer(name):
+    return CustomerData(name=name, contact_info=ContactInfo(email=f"{name}@example.com"))
+
+
+class FlakyNotifier:
+    """
+    Falla las primeras 'failures' llamadas por cliente y luego entrega.
+    """
+    def __init__(self, failures=0, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls: dict[str, int] = {}
+        self.sent: list[str] = []
+
+    def send_confirmation(self, customer_data):
+        calls = self.calls[customer_data.name] = self.calls.get(customer_data.name, 0) + 1
+        if calls <= self.failures:
+            raise self.error(f"attempt {calls} failed")
+        self.sent.append(customer_data.name)
+
+
+class BlockingNotifier:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def send_confirmation(self, customer_data):
+        self.release.wait()
+        raise ConnectionError("gateway down")
+
+
+def test_transient_failures_are_retried_until_delivered():
+    notifier = FlakyNotifier(failures=2)
+    outbox = NotificationOutbox(notifier, workers=2, backoff_base=0.01)
+
+    outbox.send_confirmation(_customer("ana"))
+
+    assert outbox.join(timeout=5)
+    assert notifier.sent == ["ana"]
+    assert notifier.calls == {"ana": 3}
+    assert outbox.stats().retried == 2
+    assert outbox.close(timeout=5) == []
+
+
+def test_exhausted_and_permanent_failures_are_dead_lettered():
+    outbox = NotificationOutbox(FlakyNotifier(failures=10), workers=1, max_attempts=3, backoff_base=0.01)
+    permanent = NotificationOutbox(FlakyNotifier(failures=10, error=ValueError), workers=1, backoff_base=0.01)
+
+    outbox.send_confirmation(_customer("ana"))
+    permanent.send_confirmation(_customer("luis"))
+
+    assert outbox.join(timeout=5) and permanent.join(timeout=5)
+    assert [(letter.customer_data.name, letter.attempts) for letter in outbox.dead_letters] == [("ana", 3)]
+    assert [(letter.customer_data.name, letter.attempts) for letter in permanent.dead_letters] == [("luis", 1)]
+    outbox.close()
+    permanent.close()
+
+
+def test_close_with_timeout_dead_letters_leftovers_and_bounds_the_join():
+    notifier = BlockingNotifier()
+    outbox = NotificationOutbox(notifier, workers=1)
+    for name in ("ana", "luis", "eva"):
+        outbox.send_confirmation(_customer(name))
+
+    start = time.monotonic()
+    abandoned = outbox.close(timeout=0.2)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 2
+    assert [letter.customer_data.name for letter in abandoned] == ["luis", "eva"]
+    assert outbox.dead_letters == abandoned
+
+    notifier.release.set()
+    outbox._workers[0].join(timeout=5)
+    assert [letter.customer_data.name for letter in outbox.dead_letters] == ["luis", "eva", "ana"]
@@ -0,0 +1,70 @@
+import time
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from solid_principles.payment_service.processors import OfflinePaymentProcessor, OfflinePaymentQueue, OfflineReplayWorker
+
+
+class DecliningProcessor:
+    def __init__(self, declined):
+        self.declined = set(declined)
+        self.keys = []
+
+    def process_transaction(self, customer_data, payment_data, idempotency_key):
+        self.keys.append(idempotency_key)
+        if customer_data.name in self.declined:
+            return PaymentResponse(status="failed", amount=payment_data.amount, message="declined")
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id=f"ch_{idempotency_key}")
+
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+def _enqueue(queue, names):
+    processor = OfflinePaymentProcessor(queue=queue)
+    return [
+        processor.process_transaction(
+            CustomerData(name=name, contact_info=ContactInfo(email=f"{name}@example.com")),
+            PaymentData(amount=100, source="tok"),
+        ).transaction_id
+        for name in names
+    ]
+
+
+def test_declines_do_not_block_healthy_payments(tmp_path):
+    queue = OfflinePaymentQueue(str(tmp_path / "offline.sqlite3"))
+    _enqueue(queue, ["bad1", "bad2", "bad3", "ok1", "ok2", "ok3", "ok4", "ok5"])
+    clock = Clock()
+    worker = OfflineReplayWorker(
+        queue, DecliningProcessor({"bad1", "bad2", "bad3"}), batch_size=3, max_attempts=2, clock=clock
+    )
+
+    assert worker.drain() == 5
+    assert queue.counts() == {"pending": 3, "forwarded": 5, "dead": 0}
+
+    clock.now += 10
+    worker.drain()
+    assert queue.counts() == {"pending": 0, "forwarded": 5, "dead": 3}
+    assert sorted(payment.customer_data.name for payment in queue.dead_letters()) == ["bad1", "bad2", "bad3"]
+
+
+def test_retry_waits_for_backoff_and_reuses_idempotency_key(tmp_path):
+    queue = OfflinePaymentQueue(str(tmp_path / "offline.sqlite3"))
+    [transaction_id] = _enqueue(queue, ["flaky"])
+    processor = DecliningProcessor({"flaky"})
+    clock = Clock()
+    worker = OfflineReplayWorker(queue, processor, max_attempts=5, backoff_base=4.0, clock=clock)
+
+    worker.drain()
+    clock.now += 3
+    worker.drain()
+    assert processor.keys == [transaction_id]
+
+    processor.declined.clear()
+    clock.now += 1
+    assert worker.drain() == 1
+    assert processor.keys == [transaction_id, transaction_id]
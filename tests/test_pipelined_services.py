@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from solid_principles.payment_service.loggers import TransactionLogger
+from solid_principles.payment_service.pipelined_services import PipelinedPaymentService
+from solid_principles.payment_service.services import PaymentService
+from solid_principles.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class ReverseDelayProcessor:
+    """
+    Procesador que tarda más en los primeros pagos, de modo que los cobros terminan en orden inverso.
+    """
+    def __init__(self, payments):
+        self.payments = payments
+        self.charged = []
+        self._lock = threading.Lock()
+
+    def process_transaction(self, customer_data, payment_data):
+        time.sleep(0.002 * (self.payments - int(customer_data.name[1:])))
+        with self._lock:
+            self.charged.append(customer_data.name)
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id=f"ch_{customer_data.name}")
+
+
+class GatedProcessor:
+    """
+    Procesador que no responde hasta que se abre 'release'.
+    """
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def process_transaction(self, customer_data, payment_data):
+        self.started.set()
+        self.release.wait(5)
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id="ch_1")
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+def _service(tmp_path, processor):
+    return PaymentService(
+        payment_processor=processor,
+        notifier=SilentNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(str(tmp_path / "transactions.log")),
+    )
+
+
+def _items(count):
+    return [
+        (CustomerData(name=f"c{index}", contact_info=ContactInfo(email="c@example.com")), PaymentData(amount=100, source="tok"))
+        for index in range(count)
+    ]
+
+
+def _logged_names(tmp_path):
+    lines = (tmp_path / "transactions.log").read_text().splitlines()
+    return [line.split(" paid ")[0] for line in lines if " paid " in line]
+
+
+def test_log_follows_submit_order_when_charges_finish_out_of_order(tmp_path):
+    processor = ReverseDelayProcessor(8)
+
+    with PipelinedPaymentService(_service(tmp_path, processor), charge_workers=8) as pipeline:
+        results = pipeline.process_many(_items(8))
+
+    names = [f"c{index}" for index in range(8)]
+    assert processor.charged != names
+    assert _logged_names(tmp_path) == names
+    assert [result.response.transaction_id for result in results] == [f"ch_{name}" for name in names]
+
+
+def test_validation_errors_are_reported_per_item_and_skip_the_charge(tmp_path):
+    processor = ReverseDelayProcessor(3)
+    items = _items(3)
+    items[1] = (items[1][0], PaymentData(amount=100, source=""))
+
+    with PipelinedPaymentService(_service(tmp_path, processor)) as pipeline:
+        results = pipeline.process_many(items)
+
+    assert results[0].response is not None and results[2].response is not None
+    assert results[1].response is None and results[1].error
+    assert sorted(processor.charged) == ["c0", "c2"]
+    assert _logged_names(tmp_path) == ["c0", "c2"]
+
+
+def test_submit_blocks_while_the_stage_queues_are_full(tmp_path):
+    processor = GatedProcessor()
+    pipeline = PipelinedPaymentService(
+        _service(tmp_path, processor), charge_workers=1, notify_workers=1, queue_size=1
+    )
+    futures = []
+
+    def submit_all():
+        for customer_data, payment_data in _items(10):
+            futures.append(pipeline.submit(customer_data, payment_data))
+
+    submitter = threading.Thread(target=submit_all)
+    submitter.start()
+    assert processor.started.wait(5)
+    time.sleep(0.2)
+
+    assert submitter.is_alive()
+    assert len(futures) < 10
+
+    processor.release.set()
+    submitter.join(5)
+    pipeline.close()
+
+    assert [future.result().status for future in futures] == ["success"] * 10
+
+
+def test_submit_after_close_is_rejected(tmp_path):
+    pipeline = PipelinedPaymentService(_service(tmp_path, ReverseDelayProcessor(1)))
+    pipeline.close()
+
+    with pytest.raises(RuntimeError):
+        pipeline.submit(*_items(1)[0])
@@ -0,0 +1,136 @@
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentBatch, PaymentData, PaymentResponse
+from solid_principles.payment_service.loggers import TransactionLogger
+from solid_principles.payment_service.services import PaymentService
+from solid_principles.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class StubProcessor:
+    def process_transaction(self, customer_data, payment_data):
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id="ch_1")
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+class MaxAmountValidator:
+    """
+    Validador inyectado que solo implementa validate().
+    """
+    def validate(self, payment_data):
+        if payment_data.amount > 1000:
+            raise ValueError("Amount above limit")
+
+
+class SpanishCustomerValidator(CustomerValidator):
+    def message(self, code):
+        return "Cliente inválido" if code else None
+
+
+def _service(tmp_path, customer_validator=None, payment_validator=None):
+    return PaymentService(
+        payment_processor=StubProcessor(),
+        notifier=SilentNotifier(),
+        customer_validator=customer_validator or CustomerValidator(),
+        payment_validator=payment_validator or PaymentDataValidator(),
+        logger=TransactionLogger(str(tmp_path / "transactions.log")),
+    )
+
+
+def _items():
+    return [
+        (CustomerData(name="ana", contact_info=ContactInfo(email="ana@example.com")), PaymentData(amount=500, source="tok")),
+        (CustomerData(name="luis", contact_info=ContactInfo(email="luis@example.com")), PaymentData(amount=5000, source="tok")),
+        (CustomerData(name="", contact_info=ContactInfo(email="x@example.com")), PaymentData(amount=100, source="tok")),
+    ]
+
+
+def test_validator_without_bulk_methods_is_applied_per_item(tmp_path):
+    service = _service(tmp_path, payment_validator=MaxAmountValidator())
+
+    for items in (_items(), PaymentBatch.from_models(_items())):
+        results = service.process_batch(items)
+
+        assert results[0].response is not None and results[0].error is None
+        assert results[1].response is None and results[1].error == "Amount above limit"
+        assert results[2].error == "Invalid customer data: missing name"
+
+
+def test_error_messages_come_from_the_validator(tmp_path):
+    service = _service(tmp_path, customer_validator=SpanishCustomerValidator())
+
+    results = service.process_batch(PaymentBatch.from_models(_items()))
+
+    assert [result.error for result in results] == [None, None, "Cliente inválido"]
+
+
+class CountingBatch(PaymentBatch):
+    def __init__(self):
+        super().__init__()
+        self.rows_built = 0
+
+    def row(self, index):
+        self.rows_built += 1
+        return super().row(index)
+
+
+def test_batch_rows_are_built_once_with_per_item_validator(tmp_path):
+    batch = CountingBatch()
+    batch.extend(
+        names=["ana", "luis", ""],
+        amounts=[500, 5000, 100],
+        sources=["tok"] * 3,
+        emails=["ana@example.com", "luis@example.com", "x@example.com"],
+    )
+
+    _service(tmp_path, payment_validator=MaxAmountValidator()).process_batch(batch)
+
+    assert batch.rows_built == 3
+
+
+def test_extend_matches_append():
+    appended = PaymentBatch.from_models(_items())
+    extended = PaymentBatch()
+    extended.extend(
+        names=["ana", "luis", ""],
+        amounts=[500, 5000, 100],
+        sources=["tok"] * 3,
+        emails=["ana@example.com", "luis@example.com", "x@example.com"],
+    )
+
+    assert extended.to_models() == appended.to_models()
+    assert extended.nbytes == appended.nbytes
+
+
+class NoGmailCustomerValidator(CustomerValidator):
+    """
+    Subclase que solo redefine validate(): process_batch debe aplicarla aunque herede la validación en bloque.
+    """
+    def validate(self, customer_data):
+        super().validate(customer_data)
+        if customer_data.contact_info.email.endswith("@gmail.com"):
+            raise ValueError("Gmail not allowed")
+
+
+def test_subclass_overriding_only_validate_is_applied(tmp_path):
+    items = _items()[:1] + [
+        (CustomerData(name="eva", contact_info=ContactInfo(email="eva@gmail.com")), PaymentData(amount=100, source="tok")),
+    ]
+    service = _service(tmp_path, customer_validator=NoGmailCustomerValidator())
+
+    for batch in (items, PaymentBatch.from_models(items)):
+        assert [result.error for result in service.process_batch(batch)] == [None, "Gmail not allowed"]
+
+
+def test_validate_uses_the_rule_set_messages(capsys):
+    customer_validator, payment_validator = CustomerValidator(), PaymentDataValidator()
+
+    for validator, data in ((customer_validator, _items()[2][0]), (payment_validator, PaymentData(amount=0, source="tok"))):
+        try:
+            validator.validate(data)
+        except ValueError as e:
+            assert str(e) == validator.message(validator.validate_many([data])[0])
+        else:
+            raise AssertionError("validate() should have raised")
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,94 @@
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from solid_principles.payment_service.loggers import TransactionLogger
+from solid_principles.payment_service.recurring_scheduler import CANCELED, CHARGED, RETRY, RecurringBillingScheduler
+from solid_principles.payment_service.services import PaymentService
+from solid_principles.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class CountingProcessor:
+    def __init__(self, declined=()):
+        self.charges = []
+        self.subscriptions = []
+        self.declined = set(declined)
+
+    def process_transaction(self, customer_data, payment_data):
+        self.charges.append(customer_data.name)
+        if customer_data.name in self.declined:
+            return PaymentResponse(status="failed", amount=payment_data.amount, message="declined")
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id=f"ch_{len(self.charges)}")
+
+    def setup_recurring_payment(self, customer_data, payment_data):
+        self.subscriptions.append(customer_data.name)
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id="sub_1")
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+def _scheduler(tmp_path, processor, **kwargs):
+    service = PaymentService(
+        payment_processor=processor,
+        notifier=SilentNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(str(tmp_path / "transactions.log")),
+        recurring_processor=processor,
+    )
+    return RecurringBillingScheduler(service, clock=lambda: 0.0, **kwargs)
+
+
+def _customer(name):
+    return CustomerData(name=name, contact_info=ContactInfo(email=f"{name}@example.com"))
+
+
+def test_each_period_is_charged_exactly_once(tmp_path):
+    processor = CountingProcessor()
+    scheduler = _scheduler(tmp_path, processor)
+    scheduler.subscribe(_customer("ana"), PaymentData(amount=500, source="tok"), interval=100, start_at=100)
+
+    for now in (50, 100, 150, 199, 200, 250, 300):
+        scheduler.run_due(now)
+
+    assert processor.subscriptions == []
+    assert processor.charges == ["ana", "ana", "ana"]
+    assert scheduler.next_due() == 400
+
+
+def test_declined_charge_is_retried_then_canceled(tmp_path):
+    processor = CountingProcessor(declined={"bob"})
+    scheduler = _scheduler(tmp_path, processor, retry_delays=(10, 20))
+    subscription = scheduler.subscribe(_customer("bob"), PaymentData(amount=500, source="tok"), interval=100, start_at=100)
+
+    statuses = [outcome.status for now in (100, 110, 130) for outcome in scheduler.run_due(now)]
+
+    assert statuses == [RETRY, RETRY, CANCELED]
+    assert scheduler.get(subscription.subscription_id) is None
+    assert len(processor.charges) == 3
+
+
+def test_canceled_subscription_is_not_charged(tmp_path):
+    processor = CountingProcessor()
+    scheduler = _scheduler(tmp_path, processor)
+    keep = scheduler.subscribe(_customer("eva"), PaymentData(amount=500, source="tok"), interval=100, start_at=100)
+    drop = scheduler.subscribe(_customer("leo"), PaymentData(amount=500, source="tok"), interval=100, start_at=100)
+    scheduler.cancel(drop.subscription_id)
+
+    outcomes = scheduler.run_due(100)
+
+    assert [(outcome.subscription_id, outcome.status) for outcome in outcomes] == [(keep.subscription_id, CHARGED)]
+    assert processor.charges == ["eva"]
+
+
+def test_missed_periods_after_downtime_are_charged_once(tmp_path):
+    processor = CountingProcessor()
+    scheduler = _scheduler(tmp_path, processor)
+    subscription = scheduler.subscribe(_customer("ana"), PaymentData(amount=500, source="tok"), interval=100, start_at=100)
+
+    outcomes = scheduler.run_due(3050)
+
+    assert [outcome.status for outcome in outcomes] == [CHARGED]
+    assert processor.charges == ["ana"]
+    assert scheduler.next_due() == 3100
+    assert scheduler.get(subscription.subscription_id).period_start == 3100
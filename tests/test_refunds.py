@@ -0,0 +1,91 @@
+import pytest
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from solid_principles.payment_service.loggers import JournalTransactionLogger, TransactionJournal, TransactionLogger
+from solid_principles.payment_service.services import PaymentService
+from solid_principles.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class StubProcessor:
+    def __init__(self):
+        self.refunded = []
+
+    def process_transaction(self, customer_data, payment_data):
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id="ch_1")
+
+    def refund_payment(self, transaction_id):
+        self.refunded.append(transaction_id)
+        return PaymentResponse(status="success", amount=100, transaction_id=f"re_{transaction_id}")
+
+
+class SilentNotifier:
+    def send_confirmation(self, customer_data):
+        pass
+
+
+class InMemoryLogger(TransactionLogger):
+    """
+    Logger ajeno a los del paquete que admite búsquedas.
+    """
+    supports_lookup = True
+
+    def __init__(self):
+        super().__init__("memory")
+        self.charges = {}
+
+    def log_transaction(self, customer_data, payment_data, payment_response):
+        self.charges[payment_response.transaction_id] = payment_response
+
+    def log_refund(self, transaction_id, refund_response):
+        pass
+
+    def log_refunds(self, refunds):
+        pass
+
+    def find_transaction(self, transaction_id):
+        return self.charges.get(transaction_id)
+
+
+def _service(logger):
+    processor = StubProcessor()
+    return PaymentService(
+        payment_processor=processor,
+        notifier=SilentNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=logger,
+        refund_processor=processor,
+    ), processor
+
+
+def _charge(service):
+    customer = CustomerData(name="ana", contact_info=ContactInfo(email="ana@example.com"))
+    return service.process_transaction(customer, PaymentData(amount=100, source="tok")).transaction_id
+
+
+def test_any_logger_with_lookup_rejects_unknown_transactions():
+    service, processor = _service(InMemoryLogger())
+    transaction_id = _charge(service)
+
+    assert service.process_refund(transaction_id).status == "success"
+    with pytest.raises(ValueError):
+        service.process_refund("ch_unknown")
+    assert [result.error is not None for result in service.process_refunds(["ch_unknown", transaction_id])] == [True, False]
+    assert processor.refunded == ["ch_1", "ch_1"]
+
+
+def test_journal_logger_supports_lookup(tmp_path):
+    with TransactionJournal(str(tmp_path / "transactions.journal")) as journal:
+        service, _ = _service(JournalTransactionLogger(journal))
+        transaction_id = _charge(service)
+
+        assert service.process_refund(transaction_id).status == "success"
+        with pytest.raises(ValueError):
+            service.process_refund("ch_unknown")
+
+
+def test_text_logger_does_not_check(tmp_path):
+    service, processor = _service(TransactionLogger(str(tmp_path / "transactions.log")))
+
+    assert service.process_refund("ch_unknown").status == "success"
+    assert processor.refunded == ["ch_unknown"]
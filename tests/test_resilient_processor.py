@@ -0,0 +1,97 @@
+import threading
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from solid_principles.payment_service.processors import (
+    CircuitBreaker,
+    OfflinePaymentProcessor,
+    ResilientPaymentProcessor,
+)
+from solid_principles.payment_service.processors.offline_queue import OfflinePaymentQueue
+
+
+class ScriptedProcessor:
+    """
+    Procesador que responde según 'mode': "decline", "raise", "success" o "block" (espera a 'release').
+    """
+    def __init__(self, mode):
+        self.mode = mode
+        self.calls = 0
+        self.release = threading.Event()
+
+    def process_transaction(self, customer_data, payment_data):
+        self.calls += 1
+        if self.mode == "raise":
+            raise ConnectionError("provider down")
+        if self.mode == "decline":
+            return PaymentResponse(status="failed", amount=payment_data.amount, message="card_declined")
+        if self.mode == "block":
+            self.release.wait(5)
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id=f"ch_{self.calls}")
+
+
+def _payment():
+    return CustomerData(name="ana", contact_info=ContactInfo(email="ana@example.com")), PaymentData(amount=100, source="tok")
+
+
+def test_declines_are_returned_and_do_not_open_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=3)
+    processor = ResilientPaymentProcessor(ScriptedProcessor("decline"), breaker=breaker, timeout=1.0)
+
+    responses = [processor.process_transaction(*_payment()) for _ in range(5)]
+    processor.close()
+
+    assert [response.message for response in responses] == ["card_declined"] * 5
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert processor.drain_reconciliation() == []
+
+
+def test_exceptions_open_the_circuit_and_fall_back():
+    primary = ScriptedProcessor("raise")
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    processor = ResilientPaymentProcessor(primary, breaker=breaker, timeout=1.0)
+
+    responses = [processor.process_transaction(*_payment()) for _ in range(5)]
+    processor.close()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert primary.calls == 3
+    assert {response.message for response in responses} == {"pago offline exitoso"}
+    assert [item.reason for item in processor.drain_reconciliation()] == ["all processors failed"] * 3 + ["circuit open"] * 2
+
+
+def test_late_success_after_timeout_settles_the_reconciliation_item(tmp_path):
+    primary = ScriptedProcessor("block")
+    queue = OfflinePaymentQueue(str(tmp_path / "offline.sqlite3"))
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    processor = ResilientPaymentProcessor(
+        primary, fallback=OfflinePaymentProcessor(queue=queue), breaker=breaker, timeout=0.05
+    )
+
+    response = processor.process_transaction(*_payment())
+    item, = list(processor.reconciliation)
+    assert item.reason == "timeout" and response.message == "pago offline exitoso"
+    assert breaker.state == CircuitBreaker.OPEN
+
+    primary.release.set()
+    processor.close()
+
+    assert item.settled_by is not None and item.settled_by.transaction_id == "ch_1"
+    assert processor.drain_reconciliation() == []
+    assert processor.duplicate_charges == []
+    assert queue.pending(now=float("inf")) == []
+    queue.close()
+
+
+def test_breaker_half_opens_after_recovery_timeout_and_closes_on_success():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow_request()
+
+    now[0] = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() and not breaker.allow_request()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
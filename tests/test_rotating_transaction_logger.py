@@ -0,0 +1,63 @@
+import gzip
+import json
+import time
+
+from solid_principles.payment_service.commons import PaymentResponse
+from solid_principles.payment_service.loggers import RotatingTransactionLogger
+
+
+def _refund(logger, index):
+    logger.log_refund(f"ch_{index:03d}", PaymentResponse(status="success", amount=index, message="ok"))
+
+
+def test_size_rotation_archives_segments_with_gzip_and_a_manifest(tmp_path):
+    logger = RotatingTransactionLogger(str(tmp_path), max_bytes=150)
+    for index in range(6):
+        _refund(logger, index)
+    logger.close()
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert len(manifest) >= 2
+    assert all(entry["compressed"] and entry["path"].endswith(".gz") for entry in manifest)
+    assert manifest[0]["min_transaction_id"] == "ch_000"
+    archived = b"".join(gzip.open(entry["path"]).read() for entry in manifest)
+    active_path = tmp_path / "transactions.log"
+    active = active_path.read_bytes() if active_path.exists() else b""
+    assert (archived + active).count(b"Refund processed") == 6
+    assert sum(entry["records"] for entry in manifest) + active.count(b"Refund processed") == 6
+
+
+def test_age_rotation_happens_without_new_writes(tmp_path):
+    logger = RotatingTransactionLogger(str(tmp_path), max_age=0.2, compress=False)
+    _refund(logger, 1)
+
+    deadline = time.monotonic() + 5
+    while not logger.segments and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert [segment.records for segment in logger.segments] == [1]
+    assert [record.transaction_id for record in logger.query()] == ["ch_001"]
+    logger.close()
+
+
+def test_close_seals_a_segment_that_is_due_for_rotation(tmp_path):
+    logger = RotatingTransactionLogger(str(tmp_path), max_age=3600, compress=False)
+    _refund(logger, 1)
+    logger._opened_at -= 7200
+
+    logger.close()
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert [entry["records"] for entry in manifest] == [1]
+    assert not (tmp_path / "transactions.log").exists()
+
+
+def test_segments_for_prunes_by_transaction_id(tmp_path):
+    logger = RotatingTransactionLogger(str(tmp_path), compress=False)
+    _refund(logger, 1)
+    logger.rotate()
+    _refund(logger, 9)
+
+    assert [segment.max_transaction_id for segment in logger.segments_for(transaction_id="ch_009")] == ["ch_009"]
+    assert [record.transaction_id for record in logger.query(transaction_id="ch_001")] == ["ch_001"]
+    logger.close()
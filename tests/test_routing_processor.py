@@ -0,0 +1,89 @@
+import pytest
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData, PaymentResponse
+from solid_principles.payment_service.processors import ProcessorBackend, RoutingPaymentProcessor, RoutingRule
+
+
+class StubProcessor:
+    def process_transaction(self, customer_data, payment_data):
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id="ch_1")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _route(router, times):
+    customer = CustomerData(name="ana", contact_info=ContactInfo(email="ana@example.com"))
+    for _ in range(times):
+        router.process_transaction(customer, PaymentData(amount=100, source="tok"))
+    return {name: stats.requests for name, stats in router.stats().items()}
+
+
+def test_requests_are_split_by_weight():
+    router = RoutingPaymentProcessor(
+        [ProcessorBackend("a", StubProcessor(), weight=1.0), ProcessorBackend("b", StubProcessor(), weight=2.0)],
+        clock=Clock(),
+    )
+
+    assert _route(router, 300) == {"a": 100, "b": 200}
+
+
+def test_non_positive_weight_is_rejected():
+    with pytest.raises(ValueError):
+        ProcessorBackend("a", StubProcessor(), weight=0.0)
+
+
+def test_slow_backend_is_probed_again_after_interval():
+    clock = Clock()
+    router = RoutingPaymentProcessor(
+        [ProcessorBackend("slow", StubProcessor()), ProcessorBackend("fast", StubProcessor())],
+        strategy=RoutingPaymentProcessor.EWMA,
+        probe_interval=5.0,
+        clock=clock,
+    )
+    router.backends["slow"].stats.ewma_latency = 1e9
+    router.backends["slow"].stats.last_selected = 0.0
+    router.backends["fast"].stats.ewma_latency = 1e-3
+    router.backends["fast"].stats.last_selected = 0.0
+
+    clock.now = 1.0
+    assert _route(router, 50)["slow"] == 0
+    clock.now = 5.0
+    assert _route(router, 1)["slow"] == 1
+
+
+class CurrencyRecorder:
+    def __init__(self, seen):
+        self.seen = seen
+
+    def process_transaction(self, customer_data, payment_data):
+        self.seen.append(payment_data.currency)
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id="ch_1")
+
+
+def test_weighted_round_robin_state_is_kept_per_rule():
+    seen = {"a": [], "b": [], "c": []}
+    router = RoutingPaymentProcessor(
+        [
+            ProcessorBackend("a", CurrencyRecorder(seen["a"])),
+            ProcessorBackend("b", CurrencyRecorder(seen["b"])),
+            ProcessorBackend("c", CurrencyRecorder(seen["c"]), weight=2.0),
+        ],
+        rules=[RoutingRule(backends=("a", "b"), currency="USD")],
+        clock=Clock(),
+    )
+    for backend in router.backends.values():
+        backend.stats.last_selected = 0.0
+    customer = CustomerData(name="ana", contact_info=ContactInfo(email="ana@example.com"))
+
+    for _ in range(200):
+        router.process_transaction(customer, PaymentData(amount=100, source="tok", currency="USD"))
+        router.process_transaction(customer, PaymentData(amount=100, source="tok", currency="EUR"))
+
+    assert {name: currencies.count("USD") for name, currencies in seen.items()} == {"a": 100, "b": 100, "c": 0}
+    assert {name: currencies.count("EUR") for name, currencies in seen.items()} == {"a": 50, "b": 50, "c": 100}
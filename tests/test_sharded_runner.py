@@ -0,0 +1,86 @@
+import os
+
+from solid_principles.payment_service.benchmarks.load_generator import generate_batch
+from solid_principles.payment_service.benchmarks.sharded_throughput import build_service
+from solid_principles.payment_service.commons import PaymentResponse, StringColumn
+from solid_principles.payment_service.loggers import JournalTransactionLogger, TransactionJournal, TransactionLogger
+from solid_principles.payment_service.sharded_runner import ShardedPaymentRunner
+
+
+def _expected_log(batch, results):
+    logger = TransactionLogger()
+    return "".join(
+        logger._format_transaction(*batch.row(result.index), result.response)
+        for result in results
+        if result.response is not None
+    )
+
+
+def test_results_are_logged_in_input_order(tmp_path):
+    batch = generate_batch(500)
+    log_path = tmp_path / "transactions.log"
+
+    with ShardedPaymentRunner(build_service, TransactionLogger(str(log_path)), shards=3, chunk_size=128) as runner:
+        results = list(runner.run(batch))
+
+    assert [result.index for result in results] == list(range(500))
+    assert log_path.read_text() == _expected_log(batch, results)
+
+
+def test_log_charges_writes_journal_records(tmp_path):
+    batch = generate_batch(20)
+    service = build_service()
+    results = service.process_batch(batch, log=False)
+    with TransactionJournal(str(tmp_path / "transactions.journal")) as journal:
+        JournalTransactionLogger(journal).log_charges(
+            (batch.names[i], batch.amounts[i], batch.sources[i], "usd", result.response)
+            for i, result in enumerate(results)
+            if result.response is not None
+        )
+        records = list(journal)
+
+    logged = [result for result in results if result.response is not None]
+    assert [(record.customer_name, record.amount) for record in records] == [
+        (batch.names[result.index], batch.amounts[result.index]) for result in logged
+    ]
+
+
+class CrashingProcessor:
+    """
+    Procesador que mata su proceso trabajador al recibir la fuente "tok_crash".
+    """
+    def process_transaction(self, customer_data, payment_data):
+        if payment_data.source == "tok_crash":
+            os._exit(1)
+        return PaymentResponse(status="success", amount=payment_data.amount, transaction_id="ch_1")
+
+
+def build_crashing_service():
+    service = build_service()
+    service.payment_processor = CrashingProcessor()
+    return service
+
+
+def test_broken_worker_is_reported_per_item_and_replaced():
+    batch = generate_batch(40)
+    batch.sources = StringColumn()
+    batch.sources.extend(["tok_crash" if index == 3 else "tok_ok" for index in range(40)])
+
+    with ShardedPaymentRunner(build_crashing_service, shards=2, chunk_size=10) as runner:
+        results = list(runner.run(batch))
+
+    assert [result.index for result in results] == list(range(40))
+    crashed = [result for result in results if result.error and result.error.startswith("Shard")]
+    assert 3 in [result.index for result in crashed]
+    assert all(result.index < 20 for result in crashed)
+    assert all(result.ok for result in results[20:])
+
+
+def test_model_input_gives_the_same_results_as_a_batch():
+    batch = generate_batch(60)
+
+    with ShardedPaymentRunner(build_service, shards=2, chunk_size=25) as runner:
+        from_batch = [(result.index, result.error, result.response.amount) for result in runner.run(batch)]
+        from_models = [(result.index, result.error, result.response.amount) for result in runner.run(batch.to_models())]
+
+    assert from_models == from_batch
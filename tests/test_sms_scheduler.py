@@ -0,0 +1,74 @@
+import time
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData
+from solid_principles.payment_service.notifiers import SMSGatewayConfig, SMSNotifier, SMSScheduler
+
+
+class BrokenGateway(SMSNotifier):
+    def __init__(self):
+        super().__init__(gateway="broken")
+        self.calls = 0
+
+    def send_bulk(self, phone_numbers):
+        self.calls += 1
+        raise ConnectionError("gateway down")
+
+
+class RecordingGateway(SMSNotifier):
+    def __init__(self):
+        super().__init__(gateway="ok")
+        self.sent = []
+
+    def send_bulk(self, phone_numbers):
+        self.sent.extend(phone_numbers)
+
+
+def _customer(phone):
+    return CustomerData(name="ana", contact_info=ContactInfo(phone=phone))
+
+
+def test_failing_gateway_dead_letters_after_max_attempts():
+    gateway = BrokenGateway()
+    scheduler = SMSScheduler(
+        [SMSGatewayConfig(gateway, rate_per_second=1000, burst=100)],
+        linger=0.0,
+        max_attempts=3,
+        backoff_base=0.01,
+    )
+    scheduler.send_confirmation(_customer("555-0001"))
+
+    start = time.monotonic()
+    scheduler.close(timeout=5.0)
+
+    assert time.monotonic() - start < 5.0
+    assert gateway.calls == 3
+    assert [(letter.phone_number, letter.attempts) for letter in scheduler.dead_letters] == [("555-0001", 3)]
+
+
+def test_close_timeout_bounds_the_drain():
+    gateway = BrokenGateway()
+    scheduler = SMSScheduler(
+        [SMSGatewayConfig(gateway, rate_per_second=1000, burst=100)],
+        linger=0.0,
+        max_attempts=100,
+        backoff_base=10.0,
+    )
+    scheduler.send_confirmation(_customer("555-0002"))
+
+    start = time.monotonic()
+    scheduler.close(timeout=0.2)
+
+    assert time.monotonic() - start < 2.0
+    assert gateway.calls == 1
+    assert [letter.error for letter in scheduler.dead_letters] == ["SMSScheduler closed before delivery"]
+
+
+def test_messages_are_delivered_in_batches():
+    gateway = RecordingGateway()
+    scheduler = SMSScheduler([SMSGatewayConfig(gateway, rate_per_second=1000, burst=100, max_batch_size=10)])
+    for index in range(25):
+        scheduler.send_confirmation(_customer(f"555-{index:04d}"))
+    scheduler.close()
+
+    assert sorted(gateway.sent) == sorted(f"555-{index:04d}" for index in range(25))
+    assert scheduler.dead_letters == []
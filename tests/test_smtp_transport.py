@@ -0,0 +1,119 @@
+import socketserver
+import threading
+
+import pytest
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData
+from solid_principles.payment_service.notifiers import EmailNotifier, SMTPTransport
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Servidor SMTP mínimo: acepta cualquier sobre salvo los destinatarios rechazados y corta la conexión
+    tras 'drop_after' mensajes para simular un servidor que cierra la sesión.
+    """
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        mail_from, rcpt_tos, delivered = None, [], 0
+        self._reply("220 localhost ESMTP stand-in")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self._reply("250 localhost")
+            elif verb == "MAIL":
+                mail_from, rcpt_tos = command.split(":", 1)[1].strip().strip("<>"), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipient = command.split(":", 1)[1].strip().strip("<>")
+                if recipient in server.rejected:
+                    self._reply("550 No such user")
+                else:
+                    rcpt_tos.append(recipient)
+                    self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while (data_line := self.rfile.readline()) not in (b".\r\n", b""):
+                    lines.append(data_line)
+                server.envelopes.append((mail_from, rcpt_tos, b"".join(lines).decode()))
+                self._reply("250 OK")
+                delivered += 1
+                if server.drop_after is not None and delivered >= server.drop_after:
+                    return
+            elif verb == "RSET":
+                mail_from, rcpt_tos = None, []
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+    def _reply(self, text):
+        self.wfile.write(f"{text}\r\n".encode())
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.envelopes, server.rejected, server.connections, server.drop_after = [], set(), 0, None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _customer(email):
+    return CustomerData(name="ana", contact_info=ContactInfo(email=email))
+
+
+def _transport(server):
+    return SMTPTransport(host="127.0.0.1", port=server.server_address[1], timeout=5.0)
+
+
+def test_envelope_uses_sender_and_recipient(smtp_server):
+    with _transport(smtp_server) as transport:
+        EmailNotifier(transport=transport, sender="billing@example.com").send_confirmation(_customer("ana@example.com"))
+
+    (mail_from, rcpt_tos, data), = smtp_server.envelopes
+    assert mail_from == "billing@example.com"
+    assert rcpt_tos == ["ana@example.com"]
+    assert "To: ana@example.com" in data
+    assert "Gracias por su compra." in data
+
+
+def test_batch_reuses_one_session_and_reports_each_failure(smtp_server):
+    smtp_server.rejected.add("gone@example.com")
+    customers = [
+        _customer("a@example.com"),
+        _customer("gone@example.com"),
+        CustomerData(name="luis", contact_info=ContactInfo(phone="+34600000000")),
+        _customer("b@example.com"),
+    ]
+
+    with _transport(smtp_server) as transport:
+        errors = EmailNotifier(transport=transport).send_batch(customers)
+
+    assert errors[0] is None and errors[3] is None
+    assert "gone@example.com" in errors[1]
+    assert errors[2] == "Email address is requiered to send an email"
+    assert [rcpt_tos for _, rcpt_tos, _ in smtp_server.envelopes] == [["a@example.com"], ["b@example.com"]]
+    assert smtp_server.connections == 1
+
+
+def test_reconnects_when_server_drops_the_session(smtp_server):
+    smtp_server.drop_after = 1
+
+    with _transport(smtp_server) as transport:
+        errors = EmailNotifier(transport=transport).send_batch([_customer(f"c{i}@example.com") for i in range(3)])
+
+    assert errors == [None, None, None]
+    assert [rcpt_tos for _, rcpt_tos, _ in smtp_server.envelopes] == [[f"c{i}@example.com"] for i in range(3)]
+    assert smtp_server.connections == 3
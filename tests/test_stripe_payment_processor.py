@@ -0,0 +1,123 @@
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+import stripe
+from pydantic import ValidationError
+
+from solid_principles.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from solid_principles.payment_service.processors import StripePaymentProcessor
+
+
+def _stripe_object(cls, values):
+    return cls.construct_from(values, "sk_test")
+
+
+class FakeStripeClient:
+    """
+    StripeClient en memoria que cuenta las llamadas a cada endpoint.
+    """
+    def __init__(self):
+        self.calls = Counter()
+        self.customers_by_id = {}
+        self.payment_methods_by_id = {"pm_card": {"id": "pm_card", "customer": None}}
+        self.fail_subscriptions = 0
+        self.customers = SimpleNamespace(create=self._create_customer, retrieve=self._retrieve_customer, update=self._update_customer)
+        self.payment_methods = SimpleNamespace(retrieve=self._retrieve_payment_method, attach=self._attach_payment_method)
+        self.subscriptions = SimpleNamespace(create=self._create_subscription)
+
+    def _create_customer(self, params):
+        self.calls["customers.create"] += 1
+        customer_id = f"cus_{len(self.customers_by_id) + 1}"
+        self.customers_by_id[customer_id] = {"id": customer_id, "email": params["email"], "invoice_settings": {}}
+        return _stripe_object(stripe.Customer, self.customers_by_id[customer_id])
+
+    def _retrieve_customer(self, customer_id):
+        self.calls["customers.retrieve"] += 1
+        return _stripe_object(stripe.Customer, self.customers_by_id[customer_id])
+
+    def _update_customer(self, customer_id, params):
+        self.calls["customers.update"] += 1
+        self.customers_by_id[customer_id]["invoice_settings"] = params["invoice_settings"]
+        return _stripe_object(stripe.Customer, self.customers_by_id[customer_id])
+
+    def _retrieve_payment_method(self, payment_method_id):
+        self.calls["payment_methods.retrieve"] += 1
+        return _stripe_object(stripe.PaymentMethod, self.payment_methods_by_id[payment_method_id])
+
+    def _attach_payment_method(self, payment_method_id, params):
+        self.calls["payment_methods.attach"] += 1
+        self.payment_methods_by_id[payment_method_id]["customer"] = params["customer"]
+        return _stripe_object(stripe.PaymentMethod, self.payment_methods_by_id[payment_method_id])
+
+    def _create_subscription(self, params):
+        self.calls["subscriptions.create"] += 1
+        if self.fail_subscriptions:
+            self.fail_subscriptions -= 1
+            raise stripe.CardError("Your card was declined.", None, "card_declined")
+        return {"id": "sub_1", "status": "active", "items": {"data": [{"price": {"unit_amount": 1000}}]}}
+
+
+def _processor():
+    processor = StripePaymentProcessor(api_key="sk_test")
+    processor.client = FakeStripeClient()
+    return processor, processor.client
+
+
+def _subscribe(processor, customer_id=None):
+    customer = CustomerData(name="ana", contact_info=ContactInfo(email="ana@example.com"), customer_id=customer_id)
+    return processor.setup_recurring_payment(customer, PaymentData(amount=1000, source="pm_card"))
+
+
+def test_known_customer_is_served_from_cache():
+    processor, client = _processor()
+
+    assert _subscribe(processor).status == "active"
+    assert _subscribe(processor).status == "active"
+
+    assert client.calls == Counter({
+        "customers.create": 1,
+        "payment_methods.retrieve": 1,
+        "payment_methods.attach": 1,
+        "customers.update": 1,
+        "subscriptions.create": 2,
+    })
+
+
+def test_email_reuses_existing_customer_instead_of_creating_one():
+    # Antes de las cachés cada configuración creaba un cliente nuevo; ahora el email resuelve el ID ya conocido.
+    processor, client = _processor()
+    _subscribe(processor)
+    processor.invalidate_customer("cus_1")
+
+    _subscribe(processor)
+
+    assert client.calls["customers.create"] == 1
+    assert client.calls["customers.retrieve"] == 1
+    assert list(client.customers_by_id) == ["cus_1"]
+
+
+def test_stripe_error_invalidates_cached_objects():
+    processor, client = _processor()
+    _subscribe(processor)
+    client.fail_subscriptions = 1
+
+    assert _subscribe(processor).status == "failed"
+    assert processor.customer_cache.get("cus_1") is None
+    assert processor.payment_method_cache.get("pm_card") is None
+
+    assert _subscribe(processor).status == "active"
+    assert client.calls["customers.retrieve"] == 1
+    assert client.calls["payment_methods.retrieve"] == 2
+    assert client.calls["payment_methods.attach"] == 1
+
+
+def test_null_amount_from_stripe_is_not_accepted_unvalidated():
+    processor, client = _processor()
+    client._create_subscription = lambda params: {
+        "id": "sub_1", "status": "active", "items": {"data": [{"price": {"unit_amount": None}}]},
+    }
+    client.subscriptions.create = client._create_subscription
+
+    with pytest.raises(ValidationError):
+        _subscribe(processor)
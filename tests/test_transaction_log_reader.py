@@ -0,0 +1,26 @@
+from solid_principles.payment_service.loggers.transaction_log_reader import TransactionLogReader, scan_records
+
+LOG = (
+    b"ana paid 100\nPayment status: success\nTransaction ID: ch_1\nMessage: ok\n"
+    b"luis paid 250\nPayment status: failed\nMessage: declined\n"
+    b"Refund processed for transaction ch_1\nRefund status: success\nMessage: refunded\n"
+)
+
+
+def test_scan_records_filters_by_status_and_kind():
+    failed = list(scan_records(LOG, status="failed"))
+    refunds = list(scan_records(LOG, kind="refund"))
+
+    assert [(record.customer_name, record.amount) for record in failed] == [("luis", 250)]
+    assert [(record.transaction_id, record.message) for record in refunds] == [("ch_1", "refunded")]
+
+
+def test_close_after_partial_iteration(tmp_path):
+    path = tmp_path / "transactions.log"
+    path.write_bytes(LOG)
+
+    with TransactionLogReader(str(path)) as reader:
+        records = reader.records()
+        first = next(records)
+
+    assert first.transaction_id == "ch_1"
@@ -0,0 +1,38 @@
+from solid_principles.payment_service.commons import (
+    BatchItemResult,
+    ContactInfo,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+    trusted_batch_item_result,
+    trusted_contact_info,
+    trusted_customer_data,
+    trusted_payment_data,
+    trusted_payment_response,
+)
+
+
+def test_trusted_models_match_validated_models_including_unset_fields():
+    pairs = [
+        (trusted_payment_response(status="success", amount=100), PaymentResponse(status="success", amount=100)),
+        (
+            trusted_payment_response("failed", 0, transaction_id=None, message="declined"),
+            PaymentResponse(status="failed", amount=0, transaction_id=None, message="declined"),
+        ),
+        (trusted_payment_data(amount=5, source="tok"), PaymentData(amount=5, source="tok")),
+        (trusted_contact_info(email="ana@example.com"), ContactInfo(email="ana@example.com")),
+        (
+            trusted_customer_data(name="ana", contact_info=trusted_contact_info(phone="+34600000000")),
+            CustomerData(name="ana", contact_info=ContactInfo(phone="+34600000000")),
+        ),
+        (trusted_batch_item_result(index=3, error="boom"), BatchItemResult(index=3, error="boom")),
+        (
+            trusted_batch_item_result(1, response=trusted_payment_response("success", 5), error=None),
+            BatchItemResult(index=1, response=PaymentResponse(status="success", amount=5), error=None),
+        ),
+    ]
+    for trusted, validated in pairs:
+        assert trusted == validated
+        assert trusted.model_fields_set == validated.model_fields_set
+        assert trusted.model_dump(exclude_unset=True) == validated.model_dump(exclude_unset=True)
+        assert trusted.model_dump() == validated.model_dump()